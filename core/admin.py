@@ -1,6 +1,20 @@
 from django.contrib import admin
-from .models import User, Teacher,StudentExam
+from .models import User, Teacher, Student, StudentExam
+from .deletion import delete_teachers, delete_students
+
+
+class TeacherAdmin(admin.ModelAdmin):
+    def delete_queryset(self, request, queryset):
+        # "Delete selected" must remove the teachers' users too.
+        delete_teachers(queryset)
+
+
+class StudentAdmin(admin.ModelAdmin):
+    def delete_queryset(self, request, queryset):
+        delete_students(queryset)
+
 
 admin.site.register(User)
-admin.site.register(Teacher)
+admin.site.register(Teacher, TeacherAdmin)
+admin.site.register(Student, StudentAdmin)
 admin.site.register(StudentExam)
@@ -4,3 +4,46 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
+        from .models import User, Teacher, Student, Exam, Question, StudentExam
+        from . import dashboard, metrics, performance, search, slowlog, tenancy, versioning
+
+        connection_created.connect(metrics.install_db_instrumentation, dispatch_uid='core.db_metrics')
+        connection_created.connect(slowlog.install_slow_query_log, dispatch_uid='core.slow_query_log')
+
+        post_save.connect(tenancy.replicate_user_on_save, sender=User, dispatch_uid='core.replicate_user')
+        post_delete.connect(tenancy.delete_user_replica, sender=User, dispatch_uid='core.delete_user_replica')
+
+        # After replication, so a rename has reached the shard before reindexing.
+        post_save.connect(search.reindex_user_on_save, sender=User, dispatch_uid='core.search_user')
+        for model in (Student, Teacher):
+            post_save.connect(search.index_profile_on_save, sender=model, dispatch_uid=f'core.search_{model.__name__}')
+            post_delete.connect(search.unindex_profile_on_delete, sender=model,
+                                dispatch_uid=f'core.unsearch_{model.__name__}')
+
+        pre_delete.connect(performance.students_of_exam, sender=Exam, dispatch_uid='core.performance_exam')
+        post_delete.connect(performance.rebuild_after_exam_delete, sender=Exam,
+                            dispatch_uid='core.performance_exam_deleted')
+        post_delete.connect(performance.rebuild_after_result_delete, sender=StudentExam,
+                            dispatch_uid='core.performance_result_deleted')
+        pre_save.connect(performance.subject_before_save, sender=Exam, dispatch_uid='core.performance_subject')
+        post_save.connect(performance.rebuild_after_subject_change, sender=Exam,
+                          dispatch_uid='core.performance_subject_changed')
+
+        for model in (Student, Teacher):
+            post_save.connect(dashboard.roster_changed, sender=model, dispatch_uid=f'core.roster_{model.__name__}')
+            post_delete.connect(dashboard.roster_changed, sender=model,
+                                dispatch_uid=f'core.roster_deleted_{model.__name__}')
+        post_save.connect(dashboard.exam_changed, sender=Exam, dispatch_uid='core.dashboard_exam')
+        post_delete.connect(dashboard.exam_changed, sender=Exam, dispatch_uid='core.dashboard_exam_deleted')
+
+        post_save.connect(versioning.bump_on_user_write, sender=User, dispatch_uid='core.version_user')
+        post_delete.connect(versioning.bump_on_user_write, sender=User, dispatch_uid='core.version_user_deleted')
+        for model in (Student, Teacher, Exam, Question, StudentExam):
+            post_save.connect(versioning.bump_on_write, sender=model, dispatch_uid=f'core.version_{model.__name__}')
+        for model in (Student, Teacher, Exam, Question, StudentExam):
+            post_delete.connect(versioning.bump_on_write, sender=model,
+                                dispatch_uid=f'core.version_{model.__name__}_deleted')
@@ -0,0 +1,75 @@
+"""Spread students over teachers so that every teacher ends up with a similar load."""
+import heapq
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .dashboard import invalidate_school
+from .models import Teacher, Student
+from .tenancy import current_db
+from .versioning import bump
+
+
+UPDATE_BATCH = 1000
+
+
+def candidate_teachers(teacher_ids=None, subject=None):
+    teachers = Teacher.objects.filter(status=Teacher.ACTIVE)
+    if teacher_ids is not None:
+        teachers = teachers.filter(pk__in=teacher_ids)
+    if subject:
+        teachers = teachers.filter(subject_specialization__iexact=subject)
+    return teachers
+
+
+def balance(student_ids, loads):
+    """Assign each student to the least loaded teacher.
+
+    ``loads`` maps teacher id to the number of students they keep. Ties go to
+    the lower teacher id, so the result is deterministic. Returns
+    ``{student_id: teacher_id}``.
+    """
+    heap = [(load, teacher_id) for teacher_id, load in loads.items()]
+    heapq.heapify(heap)
+    assignments = {}
+    for student_id in student_ids:
+        load, teacher_id = heap[0]
+        assignments[student_id] = teacher_id
+        heapq.heapreplace(heap, (load + 1, teacher_id))
+    return assignments
+
+
+def reassign_students(students, teachers):
+    """Redistribute ``students`` over ``teachers`` with a single ``bulk_update``.
+
+    Current load counts every enrolled student a teacher keeps, i.e. all
+    their enrolled students except those being moved. Returns ``{"reassigned", "teachers"}`` where
+    teachers lists each candidate's new assignments and resulting load.
+    """
+    students = list(students.select_related(None).only('id', 'assigned_teacher_id', 'status').order_by('id'))
+    enrolled = Count('student', filter=Q(student__status=Student.ENROLLED))
+    loads = dict(teachers.annotate(students=enrolled).values_list('id', 'students'))
+    for student in students:
+        if student.assigned_teacher_id in loads and student.status == Student.ENROLLED:
+            loads[student.assigned_teacher_id] -= 1
+
+    assignments = balance([student.id for student in students], loads)
+    for student in students:
+        student.assigned_teacher_id = assignments[student.id]
+    with transaction.atomic(using=current_db()):
+        Student.objects.bulk_update(students, ['assigned_teacher'], batch_size=UPDATE_BATCH)
+        bump(['student'])
+    invalidate_school()
+
+    assigned = {}
+    for teacher_id in assignments.values():
+        assigned[teacher_id] = assigned.get(teacher_id, 0) + 1
+    return {
+        "reassigned": len(students),
+        "teachers": [
+            {"teacher": teacher_id, "assigned": assigned.get(teacher_id, 0),
+             "load": load + assigned.get(teacher_id, 0)}
+            for teacher_id, load in sorted(loads.items())
+        ],
+    }
+
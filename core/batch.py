@@ -0,0 +1,198 @@
+"""Several API calls in one round trip.
+
+``POST /batch`` takes ``{"requests": [{"method", "path", "body"?, "headers"?}]}``
+and runs each sub-request in-process against the ``core`` API views, as the
+caller: the batch is authenticated once and every sub-request is forced to
+that user, so neither middleware nor token checks run again. Consecutive
+reads (GET/HEAD) run in parallel threads; a write waits for everything
+before it and runs alone, so the batch behaves like the same calls made in
+order. Inside a transaction (e.g. ATOMIC_REQUESTS, tests) everything runs
+on the calling thread, since other threads would not see its uncommitted
+rows.
+
+Skipping ``MIDDLEWARE`` means, per sub-request:
+
+* ``TenantMiddleware`` does not bind it; it runs against the batch's shard,
+  which is the caller's, through the copied context.
+* ``PerformanceMiddleware`` and ``ProfilingMiddleware`` see only the batch:
+  one timing, one metrics entry and at most one profile for all of it.
+* ``CompressionMiddleware`` applies to the whole batch response instead.
+* CSRF, sessions, messages, CORS and the security and clickjacking
+  headers come from the batch request and response alone.
+
+View-level behaviour still applies: permissions, filters and
+``ConditionalGetMixin``'s ETag/304 handling. JSON bodies are embedded as
+data with the Content-Type they would have been rendered with; output of
+other renderers (e.g. the browsable API's HTML) is rendered and returned
+as a string.
+"""
+import contextvars
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connections
+from django.test.client import RequestFactory
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = ('GET', 'HEAD')
+METHODS = READ_METHODS + ('POST', 'PUT', 'PATCH', 'DELETE')
+
+# Carried over from the batch request so links and host checks match it.
+_INHERITED_META = ('SERVER_NAME', 'SERVER_PORT', 'REMOTE_ADDR', 'HTTP_HOST', 'wsgi.url_scheme')
+# Response headers worth returning to the client.
+_RESPONSE_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Location')
+
+
+class BatchError(ValueError):
+    pass
+
+
+def _resolve(path):
+    try:
+        match = resolve(urlsplit(path).path)
+    except Resolver404:
+        raise BatchError(f"{path}: no such route.")
+    view_class = getattr(match.func, 'cls', None)
+    if not match.func.__module__.startswith('core.') or not (view_class and issubclass(view_class, APIView)):
+        raise BatchError(f"{path}: only core API routes can be batched.")
+    if match.url_name == 'batch':
+        raise BatchError(f"{path}: batches cannot be nested.")
+    return match
+
+
+def parse(items):
+    """Validate the sub-requests; returns ``[(method, path, body, headers, match)]``."""
+    if not isinstance(items, list) or not items:
+        raise BatchError("Send a non-empty list of requests.")
+    if len(items) > settings.BATCH_MAX_REQUESTS:
+        raise BatchError(f"At most {settings.BATCH_MAX_REQUESTS} requests can be batched.")
+    parsed = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            raise BatchError(f"Request {index}: give at least a path.")
+        method = str(item.get('method', 'GET')).upper()
+        if method not in METHODS:
+            raise BatchError(f"Request {index}: method must be one of {', '.join(METHODS)}.")
+        headers = item.get('headers') or {}
+        if not isinstance(headers, dict):
+            raise BatchError(f"Request {index}: headers must be an object.")
+        parsed.append((method, item['path'], item.get('body'), headers, _resolve(item['path'])))
+    return parsed
+
+
+def groups(methods):
+    """Split positions into runs that may execute together: reads batch up, writes stand alone."""
+    runs = []
+    for index, method in enumerate(methods):
+        if method in READ_METHODS and runs and runs[-1][1]:
+            runs[-1][0].append(index)
+        else:
+            runs.append(([index], method in READ_METHODS))
+    return [indexes for indexes, _ in runs]
+
+
+def _sub_request(request, method, path, body, headers):
+    meta = {key: request.META[key] for key in _INHERITED_META if key in request.META}
+    meta.update({f"HTTP_{name.upper().replace('-', '_')}": str(value) for name, value in headers.items()})
+    meta.setdefault('HTTP_ACCEPT', 'application/json')
+    factory = RequestFactory(**meta)
+    data = json.dumps(body) if body is not None else ''
+    return factory.generic(method, path, data, content_type='application/json')
+
+
+def _content_type(response):
+    # What render() would set, without serialising the payload twice.
+    renderer = response.accepted_renderer
+    if renderer.charset:
+        return f'{response.accepted_media_type}; charset={renderer.charset}'
+    return response.accepted_media_type
+
+
+def _body(response):
+    if isinstance(response, Response) and not response.is_rendered:
+        renderer = getattr(response, 'accepted_renderer', None)
+        if renderer is None or renderer.format == 'json':
+            # JSON payloads are embedded as data in the batch's own JSON. Until
+            # rendered, the header still holds HttpResponse's text/html default.
+            if renderer is None or response.data is None:
+                del response['Content-Type']
+            else:
+                response['Content-Type'] = _content_type(response)
+            return response.data
+        response.render()
+    content = b''.join(response) if response.streaming else response.content
+    return content.decode(response.charset or 'utf-8', errors='replace')
+
+
+def _run(request, user, method, path, body, headers, match):
+    sub = _sub_request(request, method, path, body, headers)
+    sub.user = user
+    sub._force_auth_user = user
+    sub.resolver_match = match
+    try:
+        response = match.func(sub, *match.args, **match.kwargs)
+    except Exception:
+        # One broken call should not take the rest of the batch with it.
+        logger.exception(f"Batched {method} {path} failed")
+        return {"status": status.HTTP_500_INTERNAL_SERVER_ERROR, "headers": {}, "body": {"error": "Server error."}}
+    body = _body(response)
+    return {
+        "status": response.status_code,
+        "headers": {name: response[name] for name in _RESPONSE_HEADERS if response.has_header(name)},
+        "body": body,
+    }
+
+
+def _run_in_thread(*args):
+    try:
+        return _run(*args)
+    finally:
+        # Worker threads open their own connections; do not leave them behind.
+        connections.close_all()
+
+
+def _in_transaction():
+    return any(connection.in_atomic_block for connection in connections.all(initialized_only=True))
+
+
+def run(request, user, parsed):
+    """Execute parsed sub-requests as ``user``; results come back in request order."""
+    results = [None] * len(parsed)
+    parallel = not _in_transaction() and settings.BATCH_WORKERS > 1
+    with ThreadPoolExecutor(max_workers=settings.BATCH_WORKERS) as executor:
+        for indexes in groups([method for method, *_ in parsed]):
+            if not parallel or len(indexes) == 1:
+                for index in indexes:
+                    results[index] = _run(request, user, *parsed[index])
+                continue
+            # Each task gets its own copy of the context: tenancy and metrics live there.
+            futures = {
+                index: executor.submit(contextvars.copy_context().run, _run_in_thread, request, user, *parsed[index])
+                for index in indexes
+            }
+            for index, future in futures.items():
+                results[index] = future.result()
+    return results
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def batch_view(request):
+    """``POST /batch``: run the listed core API calls; answers ``{"responses": [...]}`` in order."""
+    items = request.data.get('requests') if isinstance(request.data, dict) else request.data
+    try:
+        parsed = parse(items)
+    except BatchError as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({"responses": run(request._request, request.user, parsed)})
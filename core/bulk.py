@@ -0,0 +1,162 @@
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .dashboard import invalidate_school
+from .models import User, Teacher, Student, class_key
+from .search import index_students
+from .serializers import BulkStudentSerializer, StudentSerializer
+from .tenancy import DIRECTORY_DB, current_db, current_school, replicate_users
+from .versioning import bump
+
+
+def _unique_message(model, field_name):
+    # Same wording as the UniqueValidator DRF builds for the model field.
+    field = model._meta.get_field(field_name)
+    return field.error_messages['unique'] % {
+        'model_name': model._meta.verbose_name,
+        'field_label': field.verbose_name,
+    }
+
+
+def _add_error(errors, index, path, message):
+    node = errors.setdefault(index, {})
+    for key in path[:-1]:
+        node = node.setdefault(key, {})
+    node.setdefault(path[-1], []).append(message)
+
+
+def _check_unique(errors, items, model, field_name, path):
+    """Flag values repeated within the batch or already stored, in one query."""
+    positions = {}
+    for index, value in items:
+        positions.setdefault(value, []).append(index)
+
+    taken = set(model.objects.filter(**{f'{field_name}__in': list(positions)})
+                .values_list(field_name, flat=True))
+    message = _unique_message(model, field_name)
+    for value, indexes in positions.items():
+        if value in taken:
+            for index in indexes:
+                _add_error(errors, index, path, message)
+        else:
+            for index in indexes[1:]:
+                _add_error(errors, index, path, f"Repeated in this request (item {indexes[0]}).")
+
+
+def create_students(items, context):
+    """Validate and insert a batch of students with their user accounts.
+
+    Valid items are saved even when others fail. Returns one result per item,
+    in request order: ``{"index", "status": "created", "data"}`` or
+    ``{"index", "status": "error", "errors"}``.
+    """
+    request_user = context['request'].user
+    serializers, errors = [], {}
+    for index, item in enumerate(items):
+        serializer = BulkStudentSerializer(data=item, context=context)
+        if serializer.is_valid():
+            serializers.append((index, serializer))
+        else:
+            errors[index] = serializer.errors
+
+    _check_unique(errors, [(i, s.validated_data['user']['username']) for i, s in serializers],
+                  User, 'username', ('user', 'username'))
+    _check_unique(errors, [(i, s.validated_data['roll_number']) for i, s in serializers],
+                  Student, 'roll_number', ('roll_number',))
+
+    default_teacher = None
+    if request_user.role == 'teacher':
+        default_teacher = Teacher.objects.filter(user=request_user).values_list('pk', flat=True).first()
+        if default_teacher is None:
+            raise ValidationError("Teacher profile not found for the current user.")
+
+    requested = {s.validated_data.get('assigned_teacher') for _, s in serializers} - {None}
+    teachers = set(Teacher.objects.filter(pk__in=requested).values_list('pk', flat=True)) if requested else set()
+    for index, serializer in serializers:
+        teacher_id = serializer.validated_data.get('assigned_teacher')
+        if teacher_id is not None and teacher_id not in teachers:
+            _add_error(errors, index, ('assigned_teacher',),
+                       f'Invalid pk "{teacher_id}" - object does not exist.')
+
+    valid = [(i, s.validated_data) for i, s in serializers if i not in errors]
+
+    # Every account gets its own salt, even when the class shares a starting
+    # password. BULK_PASSWORD_HASHER can name a cheaper hasher from
+    # PASSWORD_HASHERS; users are re-hashed with the default one on login.
+    # Hashing is the slow part (see BULK_CREATE_MAX_ITEMS), so it is done
+    # before the transaction opens.
+    hasher = settings.BULK_PASSWORD_HASHER
+    school = current_school()
+    users, students = [], []
+    for _, data in valid:
+        user_data = dict(data['user'], role='student', school=school)
+        user_data['password'] = make_password(user_data['password'], hasher=hasher)
+        users.append(User(**user_data))
+
+    with transaction.atomic(using=DIRECTORY_DB), transaction.atomic(using=current_db()):
+        users = User.objects.bulk_create(users)
+        replicate_users(users)
+        for user, (_, data) in zip(users, valid):
+            student_data = {key: value for key, value in data.items() if key not in ('user', 'assigned_teacher')}
+            if 'assigned_teacher' in data:
+                student_data['assigned_teacher_id'] = data['assigned_teacher']
+            elif default_teacher is not None:
+                student_data['assigned_teacher_id'] = default_teacher
+            students.append(Student(user=user, class_key=class_key(student_data.get('class_name', '1')), **student_data))
+        students = Student.objects.bulk_create(students)
+        index_students([student.pk for student in students], current_db())
+        bump(['student', 'user'])
+    invalidate_school()
+
+    created = {
+        student.pk: student for student in
+        Student.objects.select_related('user', 'assigned_teacher__user').filter(pk__in=[s.pk for s in students])
+    }
+    data = iter(StudentSerializer([created[s.pk] for s in students], many=True, context=context).data)
+
+    results = []
+    for index in range(len(items)):
+        if index in errors:
+            results.append({"index": index, "status": "error", "errors": errors[index]})
+        else:
+            results.append({"index": index, "status": "created", "data": next(data)})
+    return results
+
+
+class BulkStudentCreateMixin:
+    """Let ``create`` take a JSON array of students as well as a single object."""
+
+    def bulk_create(self, request):
+        items = request.data
+        if not items:
+            return Response({"error": "Send at least one student."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.BULK_CREATE_MAX_ITEMS:
+            return Response({
+                "error": f"At most {settings.BULK_CREATE_MAX_ITEMS} students can be created per request."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        results = create_students(items, self.get_serializer_context())
+        created_count = sum(result['status'] == 'created' for result in results)
+        failed_count = len(results) - created_count
+
+        if not created_count:
+            return Response({
+                "message": f"No students created; {failed_count} items have errors.",
+                "created": 0,
+                "results": results
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if failed_count:
+            return Response({
+                "message": f"Created {created_count} students with {failed_count} errors.",
+                "created": created_count,
+                "results": results
+            }, status=status.HTTP_206_PARTIAL_CONTENT)
+        return Response({
+            "message": f"Successfully created {created_count} students.",
+            "created": created_count,
+            "results": results
+        }, status=status.HTTP_201_CREATED)
@@ -0,0 +1,121 @@
+"""The teacher dashboard: roster and exam statistics in a few aggregate queries.
+
+Results are cached per teacher for ``TEACHER_DASHBOARD_TTL`` seconds.
+Submissions clear the cache of the exam's teacher. Roster changes (students
+or teachers added, edited, moved or removed) can change any teacher's
+figures, so they start a new cache generation for the whole school instead.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count
+
+from .models import Student, Exam, ExamTarget, class_base, targeted_students
+from .tenancy import current_db
+
+
+def _generation_key(using):
+    return f'dashboard:{using}:generation'
+
+
+def _cache_key(teacher_id, using, generation):
+    return f'dashboard:{using}:{generation}:teacher:{teacher_id}'
+
+
+def _generation(using):
+    generation = cache.get(_generation_key(using))
+    if generation is None:
+        generation = _new_generation(using)
+    return generation
+
+
+def _new_generation(using):
+    # A timestamp rather than a counter: an evicted counter could restart at
+    # a number whose entries are still cached.
+    generation = time.time_ns()
+    cache.set(_generation_key(using), generation, None)
+    return generation
+
+
+def invalidate_teachers(teacher_ids, using=None):
+    using = using or current_db()
+    generation = _generation(using)
+    cache.delete_many([_cache_key(teacher_id, using, generation) for teacher_id in set(teacher_ids) - {None}])
+
+
+def invalidate_school(using=None):
+    _new_generation(using or current_db())
+
+
+def compute(teacher):
+    """Dashboard figures for ``teacher``, in four queries whatever the school size.
+
+    An exam's submission rate is its submissions over the enrolled students
+    of every class it targets.
+    """
+    students_by_class = list(
+        Student.objects.filter(assigned_teacher=teacher).values('class_name')
+        .annotate(students=Count('id')).order_by('class_name')
+    )
+    exams = list(
+        Exam.objects.filter(teacher=teacher)
+        .annotate(submissions=Count('studentexam'), average_marks=Avg('studentexam__marks'))
+        .values('id', 'title', 'subject', 'target_class', 'created_at', 'submissions', 'average_marks')
+        .order_by('-created_at', '-id')
+    )
+    targets = {}
+    for exam_id, key in ExamTarget.objects.filter(exam__teacher=teacher).values_list('exam_id', 'class_key'):
+        targets.setdefault(exam_id, set()).add(key)
+    enrolled = (
+        Student.objects.filter(targeted_students(set().union(*targets.values())), status=Student.ENROLLED)
+        .values_list('class_key').annotate(students=Count('id')).order_by()
+    )
+
+    # A student counts once per exam, even when both their section and
+    # their whole class are targeted.
+    eligible = {}
+    for key, students in enrolled:
+        for exam_id, keys in targets.items():
+            if key in keys or class_base(key) in keys:
+                eligible[exam_id] = eligible.get(exam_id, 0) + students
+
+    submissions = marks = 0
+    for exam in exams:
+        exam['eligible'] = eligible.get(exam['id'], 0)
+        exam['submission_rate'] = round(exam['submissions'] / exam['eligible'], 4) if exam['eligible'] else None
+        if exam['average_marks'] is not None:
+            marks += exam['average_marks'] * exam['submissions']
+            exam['average_marks'] = round(exam['average_marks'], 2)
+        submissions += exam['submissions']
+
+    return {
+        "teacher": teacher.pk,
+        "students": sum(row['students'] for row in students_by_class),
+        "students_by_class": students_by_class,
+        "exams_created": len(exams),
+        "submissions": submissions,
+        "average_marks": round(marks / submissions, 2) if submissions else None,
+        "exams": exams,
+    }
+
+
+def teacher_dashboard(teacher):
+    """``compute(teacher)``, served from the cache while it is fresh."""
+    using = current_db()
+    key = _cache_key(teacher.pk, using, _generation(using))
+    data = cache.get(key)
+    if data is None:
+        data = compute(teacher)
+        cache.set(key, data, settings.TEACHER_DASHBOARD_TTL)
+    return data
+
+
+def roster_changed(sender, instance, using, raw=False, **kwargs):
+    if not raw:
+        invalidate_school(using)
+
+
+def exam_changed(sender, instance, using, raw=False, **kwargs):
+    if not raw:
+        invalidate_teachers([instance.teacher_id], using)
@@ -0,0 +1,96 @@
+"""Bulk deletion of teachers and students together with their user accounts.
+
+``Teacher.delete``/``Student.delete`` remove the linked ``User`` one object
+at a time, and queryset deletes skip that step entirely. These helpers work a
+chunk of profiles at a time: dependent rows, profiles and users go in a few
+set-based statements per chunk, each chunk in its own short transaction.
+"""
+from collections import Counter
+
+from django.db import transaction
+
+from .models import (
+    User, Teacher, Student, Exam, ExamTarget, Question, StudentExam, StudentAnswer, StudentPerformance,
+)
+from .dashboard import invalidate_school
+from .performance import rebuild as rebuild_performance
+from .search import STUDENT, TEACHER, unindex
+from .tenancy import DIRECTORY_DB, current_db, replicas_handled
+from .versioning import bump
+
+
+DELETE_CHUNK = 500
+
+
+def _raw_delete(queryset):
+    # A plain DELETE ... WHERE: no instances loaded, no per-row signals. Only
+    # used on tables whose dependants were already removed.
+    return queryset._raw_delete(queryset.db)
+
+
+def _delete_users(user_ids, db, counts):
+    if db != DIRECTORY_DB:
+        # Shard replicas first, through the collector: shard rows created_by
+        # these users cascade with them.
+        User.objects.using(db).filter(pk__in=user_ids).delete()
+    with replicas_handled():
+        _, deleted = User.objects.using(DIRECTORY_DB).filter(pk__in=user_ids).delete()
+    counts['users'] += deleted.get(User._meta.label, 0)
+
+
+def _delete_student_chunk(student_ids, db, counts):
+    user_ids = list(Student.objects.filter(pk__in=student_ids).values_list('user_id', flat=True))
+    counts['student_answers'] += _raw_delete(StudentAnswer.objects.filter(student_exam__student_id__in=student_ids))
+    counts['student_exams'] += _raw_delete(StudentExam.objects.filter(student_id__in=student_ids))
+    _raw_delete(StudentPerformance.objects.filter(student_id__in=student_ids))
+    counts['students'] += _raw_delete(Student.objects.filter(pk__in=student_ids))
+    unindex(STUDENT, student_ids, db)
+    _delete_users(user_ids, db, counts)
+    bump(['student', 'studentexam', 'user'], db)
+
+
+def _delete_teacher_chunk(teacher_ids, db, counts):
+    user_ids = list(Teacher.objects.filter(pk__in=teacher_ids).values_list('user_id', flat=True))
+    exams = Exam.objects.filter(teacher_id__in=teacher_ids)
+    examined = set(StudentExam.objects.filter(exam__in=exams).values_list('student_id', flat=True))
+    counts['student_answers'] += _raw_delete(StudentAnswer.objects.filter(student_exam__exam__in=exams))
+    counts['student_exams'] += _raw_delete(StudentExam.objects.filter(exam__in=exams))
+    counts['questions'] += _raw_delete(Question.objects.filter(exam__in=exams))
+    _raw_delete(ExamTarget.objects.filter(exam__in=exams))
+    counts['exams'] += _raw_delete(exams)
+    # Their students keep the results of other teachers' exams.
+    rebuild_performance(examined, db)
+    counts['unassigned_students'] += Student.objects.filter(assigned_teacher_id__in=teacher_ids).update(
+        assigned_teacher=None)
+    counts['teachers'] += _raw_delete(Teacher.objects.filter(pk__in=teacher_ids))
+    unindex(TEACHER, teacher_ids, db)
+    _delete_users(user_ids, db, counts)
+    bump(['teacher', 'exam', 'studentexam', 'student', 'user'], db)
+
+
+def _delete_in_chunks(queryset, delete_chunk, chunk_size):
+    db = current_db()
+    ids = list(queryset.order_by('pk').values_list('pk', flat=True))
+    counts = Counter()
+    for start in range(0, len(ids), chunk_size):
+        with transaction.atomic(using=DIRECTORY_DB), transaction.atomic(using=db):
+            delete_chunk(ids[start:start + chunk_size], db, counts)
+    invalidate_school(db)
+    return dict(counts)
+
+
+def delete_students(queryset, chunk_size=DELETE_CHUNK):
+    """Delete the students in ``queryset``, their results and their users.
+
+    Returns the number of rows deleted per kind.
+    """
+    return _delete_in_chunks(queryset, _delete_student_chunk, chunk_size)
+
+
+def delete_teachers(queryset, chunk_size=DELETE_CHUNK):
+    """Delete the teachers in ``queryset``, their exams (with results) and their users.
+
+    Their students stay, unassigned, as with the ``SET_NULL`` foreign key.
+    Returns the number of rows deleted per kind.
+    """
+    return _delete_in_chunks(queryset, _delete_teacher_chunk, chunk_size)
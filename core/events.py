@@ -0,0 +1,158 @@
+"""Live exam submissions as Server-Sent Events.
+
+Grading paths call ``submissions_added(exam_id)``; once their transaction
+commits, the in-process ``broker`` wakes every stream open on that exam.
+Streams read new rows above the highest ``StudentExam.id`` they have sent,
+so a wake-up carries no data and cannot be lost. Streams also re-read every
+``SSE_POLL_INTERVAL`` seconds, which picks up submissions graded in other
+processes. Each connection closes after ``SSE_MAX_DURATION`` seconds; the
+browser reconnects with ``Last-Event-ID`` and resumes where it left off.
+"""
+import asyncio
+import json
+import threading
+from time import monotonic
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.http import JsonResponse, StreamingHttpResponse
+
+from .models import Exam, StudentExam
+from .permissions import jwt_user
+from .tenancy import current_db, school_db
+
+
+# Rows sent per read; a burst larger than this drains over several reads.
+BATCH = 200
+
+
+class Broker:
+    """Wake-up signals from the threads that grade to the event loops that stream."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, channel):
+        wakeup = asyncio.Event()
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add((asyncio.get_running_loop(), wakeup))
+        return wakeup
+
+    def unsubscribe(self, channel, wakeup):
+        with self._lock:
+            subscribers = self._subscribers.get(channel, set())
+            subscribers.difference_update({s for s in subscribers if s[1] is wakeup})
+            if not subscribers:
+                self._subscribers.pop(channel, None)
+
+    def publish(self, channel):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, wakeup in subscribers:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                # The stream's loop has closed; it unsubscribes on its way out.
+                pass
+
+
+broker = Broker()
+
+
+def submissions_added(exam_id, using=None):
+    using = using or current_db()
+    transaction.on_commit(lambda: broker.publish((using, exam_id)), using=using)
+
+
+def _new_submissions(exam_id, after, using):
+    rows = (
+        StudentExam.objects.using(using).filter(exam_id=exam_id, id__gt=after).order_by('id')
+        .values('id', 'student_id', 'student__roll_number', 'student__user__first_name',
+                'student__user__last_name', 'marks', 'submitted_at')[:BATCH]
+    )
+    return [{
+        "id": row['id'],
+        "student": row['student_id'],
+        "student_name": f"{row['student__user__first_name']} {row['student__user__last_name']}".strip(),
+        "roll_number": row['student__roll_number'],
+        "marks": row['marks'],
+        "submitted_at": row['submitted_at'].isoformat(),
+    } for row in rows]
+
+
+def _latest_submission(exam_id, using):
+    return StudentExam.objects.using(using).filter(exam_id=exam_id).aggregate(top=Max('id'))['top'] or 0
+
+
+def _format(submission):
+    return f"id: {submission['id']}\nevent: submission\ndata: {json.dumps(submission)}\n\n"
+
+
+async def stream_submissions(exam_id, after, using):
+    """Yield SSE frames for submissions to ``exam_id`` with ids above ``after``."""
+    channel = (using, exam_id)
+    wakeup = broker.subscribe(channel)
+    deadline = monotonic() + settings.SSE_MAX_DURATION
+    try:
+        yield f"retry: {settings.SSE_RETRY_MS}\n\n"
+        while True:
+            wakeup.clear()
+            submissions = await sync_to_async(_new_submissions)(exam_id, after, using)
+            for submission in submissions:
+                yield _format(submission)
+            if submissions:
+                after = submissions[-1]['id']
+                if len(submissions) == BATCH:
+                    continue
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(wakeup.wait(), min(settings.SSE_POLL_INTERVAL, remaining))
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle connection.
+                yield ": keepalive\n\n"
+    finally:
+        broker.unsubscribe(channel, wakeup)
+
+
+def _visible_exam(exam_id, user, using):
+    exams = Exam.objects.using(using).filter(pk=exam_id)
+    if user.role != 'admin':
+        exams = exams.filter(teacher__user_id=user.pk)
+    return exams.exists()
+
+
+async def submission_stream_view(request, pk):
+    """``GET /exams/<pk>/submissions/stream``: new submissions to an exam, for its teacher or admins.
+
+    Starts after ``Last-Event-ID`` or ``?after=`` when given, otherwise with
+    the next submission.
+    """
+    user = await sync_to_async(jwt_user)(request) or await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    if user.role not in ('admin', 'teacher'):
+        return JsonResponse({"detail": "Only admin and teachers can follow submissions."}, status=403)
+
+    using = school_db(user.school)
+    if not await sync_to_async(_visible_exam)(pk, user, using):
+        return JsonResponse({"detail": "No Exam matches the given query."}, status=404)
+
+    after = request.headers.get('Last-Event-ID') or request.GET.get('after')
+    if after is None:
+        after = await sync_to_async(_latest_submission)(pk, using)
+    else:
+        try:
+            after = int(after)
+        except ValueError:
+            return JsonResponse({"detail": "Last-Event-ID and after must be submission ids."}, status=400)
+
+    response = StreamingHttpResponse(stream_submissions(pk, after, using), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Tell nginx-style proxies not to buffer the stream.
+    response['X-Accel-Buffering'] = 'no'
+    return response
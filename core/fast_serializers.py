@@ -0,0 +1,256 @@
+from operator import itemgetter
+from time import perf_counter
+
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .metrics import current_metrics
+from .models import ExamTarget
+from .sparse import keep
+
+
+# Returned by a getter to leave the key out, as DRF does for read-only
+# fields whose source path runs through a null relation.
+SKIP = object()
+
+_date = serializers.DateField().to_representation
+_datetime = serializers.DateTimeField().to_representation
+
+
+def column(lookup, convert=None):
+    get = itemgetter(lookup)
+    if convert is None:
+        return [lookup], get
+    return [lookup], lambda row: convert(get(row))
+
+
+def date_column(lookup):
+    get = itemgetter(lookup)
+    return [lookup], lambda row: _date(get(row)) if get(row) is not None else None
+
+
+def datetime_column(lookup):
+    get = itemgetter(lookup)
+    return [lookup], lambda row: _datetime(get(row))
+
+
+def full_name(prefix, unless_null=None):
+    """Mirror ``User.get_full_name`` from ``<prefix>first_name``/``last_name``."""
+    first, last = itemgetter(f'{prefix}first_name'), itemgetter(f'{prefix}last_name')
+    lookups = [f'{prefix}first_name', f'{prefix}last_name']
+    if unless_null is None:
+        return lookups, lambda row: f"{first(row)} {last(row)}".strip()
+
+    guard = itemgetter(unless_null)
+    return lookups + [unless_null], (
+        lambda row: SKIP if guard(row) is None else f"{first(row)} {last(row)}".strip()
+    )
+
+
+def attached(key, *lookups):
+    """A value ``attach`` adds to each row under ``key``; ``lookups`` are what it needs loaded."""
+    return list(lookups), itemgetter(key)
+
+
+def nested(*spec):
+    """A nested object built from the same row."""
+    return spec
+
+
+def _is_nested(col):
+    return isinstance(col, tuple) and col and isinstance(col[0], tuple)
+
+
+def _select(spec, include, exclude):
+    selected = []
+    for key, col in spec:
+        kept, sub_include, sub_exclude = keep(key, include, exclude)
+        if not kept:
+            continue
+        if _is_nested(col) and (sub_include or sub_exclude):
+            col = _select(col, sub_include, sub_exclude)
+        selected.append((key, col))
+    return tuple(selected)
+
+
+def _compile(spec, lookups):
+    steps = []
+    for key, col in spec:
+        if _is_nested(col):
+            steps.append((key, _compile(col, lookups)))
+        else:
+            columns, getter = col
+            for lookup in columns:
+                if lookup not in lookups:
+                    lookups.append(lookup)
+            steps.append((key, getter))
+
+    def build(row):
+        out = {}
+        for key, getter in steps:
+            value = getter(row)
+            if value is not SKIP:
+                out[key] = value
+        return out
+    return build
+
+
+class FastSerializer:
+    """Read-only serializer building response dicts straight from ``.values()`` rows.
+
+    ``spec`` lists ``(key, column)`` pairs in output order, where a column is
+    a ``(lookups, getter)`` pair from the helpers above or a ``nested(...)``
+    spec. Output must stay identical to the ModelSerializer it stands in for.
+    """
+
+    spec = ()
+
+    def __init__(self, include=None, exclude=None):
+        """``include``/``exclude`` are field trees as parsed by ``core.sparse``."""
+        cls = type(self)
+        if '_compiled' not in cls.__dict__:
+            cls._compiled = {}
+        key = (repr(include), repr(exclude))
+        compiled = cls._compiled.get(key)
+        if compiled is None:
+            lookups = []
+            compiled = (_compile(_select(cls.spec, include, exclude), lookups), lookups)
+            # Field selections come from query strings; keep the cache bounded.
+            if len(cls._compiled) < 256:
+                cls._compiled[key] = compiled
+        self._build, self.lookups = compiled
+        self.include, self.exclude = include, exclude
+
+    def selects(self, key):
+        """Whether the top-level field ``key`` is part of the output."""
+        return keep(key, self.include, self.exclude)[0]
+
+    def attach(self, rows):
+        """Add values that are not columns of the row (see ``attached``) to a page of rows."""
+        return rows
+
+    def values(self, queryset):
+        return queryset.values(*self.lookups)
+
+    def narrow(self, queryset):
+        """Load only the columns and joins the selected fields read."""
+        related, columns = set(), []
+        for lookup in self.lookups:
+            if lookup in queryset.query.annotations:
+                continue
+            path = lookup.rsplit('__', 1)
+            if len(path) == 2:
+                related.add(path[0])
+            columns.append(lookup)
+        queryset = queryset.select_related(None)
+        if related:
+            # select_related() without arguments would follow every relation.
+            queryset = queryset.select_related(*related)
+        return queryset.only(*columns)
+
+    def serialize(self, rows):
+        rows = self.attach(rows)
+        start = perf_counter()
+        build = self._build
+        data = [build(row) for row in rows]
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.serializer_time += perf_counter() - start
+        return data
+
+
+USER_SPEC = nested(
+    ('id', column('user__id')),
+    ('username', column('user__username')),
+    ('email', column('user__email')),
+    ('role', column('user__role')),
+    ('first_name', column('user__first_name')),
+    ('last_name', column('user__last_name')),
+)
+
+
+class FastTeacherSerializer(FastSerializer):
+    """Stands in for ``TeacherSerializer`` on list actions."""
+
+    spec = (
+        ('id', column('id')),
+        ('user', USER_SPEC),
+        ('employee_id', column('employee_id')),
+        ('phone_number', column('phone_number')),
+        ('subject_specialization', column('subject_specialization')),
+        ('date_of_joining', date_column('date_of_joining')),
+        ('status', column('status')),
+    )
+
+
+class FastStudentSerializer(FastSerializer):
+    """Stands in for ``StudentSerializer`` on list actions."""
+
+    spec = (
+        ('id', column('id')),
+        ('user', USER_SPEC),
+        ('roll_number', column('roll_number')),
+        ('phone_number', column('phone_number')),
+        ('grade', column('grade')),
+        ('class_name', column('class_name')),
+        ('date_of_birth', date_column('date_of_birth')),
+        ('admission_date', date_column('admission_date')),
+        ('status', column('status')),
+        ('assigned_teacher', column('assigned_teacher_id')),
+        ('assigned_teacher_name', full_name('assigned_teacher__user__', unless_null='assigned_teacher_id')),
+    )
+
+
+class FastExamSerializer(FastSerializer):
+    """Stands in for ``ExamSerializer`` on list actions; needs ``questions_count`` annotated."""
+
+    spec = (
+        ('id', column('id')),
+        ('title', column('title')),
+        ('subject', column('subject')),
+        ('target_class', column('target_class')),
+        ('teacher', nested(
+            ('id', column('teacher_id')),
+            ('user', nested(
+                ('id', column('teacher__user__id')),
+                ('username', column('teacher__user__username')),
+                ('full_name', full_name('teacher__user__')),
+            )),
+            ('employee_id', column('teacher__employee_id')),
+        )),
+        ('questions_count', column('questions_count')),
+        ('created_at', datetime_column('created_at')),
+        ('also_target_classes', attached('also_target_classes', 'id', 'class_key')),
+    )
+
+    def attach(self, rows):
+        if not self.selects('also_target_classes'):
+            return rows
+        rows = list(rows)
+        extras = ExamTarget.extra_keys([row['id'] for row in rows]) if rows else {}
+        for row in rows:
+            row['also_target_classes'] = extras.get(row['id'], [])
+        return rows
+
+
+class FastListMixin:
+    """Serve ``list`` through ``fast_serializer_class`` when FAST_LIST_SERIALIZERS is on."""
+
+    fast_serializer_class = None
+
+    def use_fast_list(self):
+        return self.fast_serializer_class is not None and settings.FAST_LIST_SERIALIZERS
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_list():
+            return super().list(request, *args, **kwargs)
+
+        selection = self.sparse_fields() if hasattr(self, 'sparse_fields') else None
+        fast = self.fast_serializer_class(*(selection or ()))
+        rows = fast.values(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast.serialize(page))
+        return Response(fast.serialize(rows))
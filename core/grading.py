@@ -0,0 +1,101 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from .models import Student, StudentExam, StudentAnswer, class_base
+from .omr import grade_sheets
+from .dashboard import invalidate_teachers
+from .events import submissions_added
+from .performance import record
+from .tenancy import current_db
+from .utils import chunks
+from .versioning import bump
+
+
+def _store(exam, questions, rows):
+    StudentExam.objects.bulk_create([
+        StudentExam(student_id=student_id, exam=exam, marks=marks)
+        for _, student_id, _, _, marks in rows
+    ])
+    ids = {}
+    for lookup in chunks([student_id for _, student_id, _, _, _ in rows]):
+        ids.update(
+            StudentExam.objects.filter(exam=exam, student_id__in=lookup).values_list('student_id', 'id')
+        )
+    StudentAnswer.objects.bulk_create([
+        StudentAnswer(student_exam_id=ids[student_id], question=question,
+                      answer=answer, is_correct=is_correct)
+        for _, student_id, answers, flags, _ in rows
+        for question, answer, is_correct in zip(questions, answers, flags)
+    ])
+    record([(student_id, exam.subject, marks) for _, student_id, _, _, marks in rows])
+
+
+def grade_answer_sheets(exam, rows, chunk_size=2000):
+    """Grade parsed OMR rows for ``exam`` and store the results in bulk.
+
+    Returns ``(saved_count, errors)``. Rows for unknown roll numbers, students
+    the exam is not set for, students who already submitted, or repeated roll
+    numbers are reported, not saved.
+    """
+    questions = list(exam.questions.order_by('id'))
+    answer_key = [question.correct_option for question in questions]
+    graded, errors = grade_sheets(
+        answer_key, rows,
+        parallel_threshold=settings.OMR_PARALLEL_THRESHOLD,
+        workers=settings.OMR_WORKERS,
+    )
+
+    targets = set(exam.targets.values_list('class_key', flat=True))
+    rolls = list({roll_number for roll_number, _, _, _ in graded})
+    students = {}
+    for chunk in chunks(rolls):
+        students.update(
+            (roll_number, (student_id, key)) for roll_number, student_id, key in
+            Student.objects.filter(roll_number__in=chunk).values_list('roll_number', 'id', 'class_key')
+        )
+
+    submitted = set()
+    for chunk in chunks([student_id for student_id, _ in students.values()]):
+        submitted.update(
+            StudentExam.objects.filter(exam=exam, student_id__in=chunk).values_list('student_id', flat=True)
+        )
+
+    accepted, seen = [], set()
+    for roll_number, answers, flags, marks in graded:
+        student_id, key = students.get(roll_number, (None, None))
+        if student_id is None:
+            errors.append(f"Roll number {roll_number}: no such student.")
+        elif key not in targets and class_base(key) not in targets:
+            errors.append(f"Roll number {roll_number}: this exam is not set for the student's class.")
+        elif student_id in submitted:
+            errors.append(f"Roll number {roll_number}: already submitted this exam.")
+        elif student_id in seen:
+            errors.append(f"Roll number {roll_number}: appears more than once.")
+        else:
+            seen.add(student_id)
+            accepted.append((roll_number, student_id, answers, flags, marks))
+
+    saved = 0
+    db = current_db()
+    with transaction.atomic(using=db):
+        for chunk in chunks(accepted, chunk_size):
+            try:
+                with transaction.atomic(using=db):
+                    _store(exam, questions, chunk)
+                saved += len(chunk)
+            except IntegrityError:
+                # A submission arrived after the check above; find it row by row.
+                for row in chunk:
+                    try:
+                        with transaction.atomic(using=db):
+                            _store(exam, questions, [row])
+                        saved += 1
+                    except IntegrityError:
+                        errors.append(f"Roll number {row[0]}: already submitted this exam.")
+        if saved:
+            bump(['studentexam'])
+            submissions_added(exam.pk)
+    if saved:
+        invalidate_teachers([exam.teacher_id])
+
+    return saved, errors
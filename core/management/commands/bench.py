@@ -0,0 +1,243 @@
+import json
+import math
+import os
+import random
+from contextlib import ExitStack
+from datetime import datetime
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Max
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import User, Teacher, Student, Exam, ExamTarget, Question, StudentExam, class_base, targeted_students
+from core.tenancy import DIRECTORY_DB, current_db, use_school
+
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+class BenchContext:
+    def __init__(self, requests, password, rng):
+        self.requests = requests
+        self.password = password
+        self.rng = rng
+
+
+# Each scenario yields (user, method, url, data) tuples; user None means anonymous.
+
+@scenario('login-storm')
+def login_storm(ctx):
+    usernames = list(
+        User.objects.filter(role='student').order_by('id').values_list('username', flat=True)[:ctx.requests]
+    )
+    for username in usernames:
+        yield None, 'post', reverse('custom_login'), {'username': username, 'password': ctx.password}
+
+
+@scenario('exam-start')
+def exam_start(ctx):
+    exam_by_class = {}
+    for exam_id, key in ExamTarget.objects.order_by('-exam_id').values_list('exam_id', 'class_key'):
+        exam_by_class.setdefault(key, exam_id)
+
+    students = Student.objects.select_related('user').filter(
+        targeted_students(exam_by_class)).order_by('id')[:ctx.requests]
+    for student in students:
+        exam_id = exam_by_class.get(student.class_key) or exam_by_class[class_base(student.class_key)]
+        url = reverse('exam-questions', kwargs={'pk': exam_id})
+        yield student.user, 'get', url, None
+
+
+@scenario('submission-burst')
+def submission_burst(ctx):
+    questions = {}
+    for question_id, exam_id in Question.objects.values_list('id', 'exam_id'):
+        questions.setdefault(exam_id, []).append(question_id)
+
+    issued = 0
+    for exam in Exam.objects.order_by('-id'):
+        if exam.id not in questions:
+            continue
+        takers = (
+            Student.objects.select_related('user')
+            .filter(targeted_students(exam.targets.values_list('class_key', flat=True)))
+            .exclude(studentexam__exam=exam)
+            .order_by('id')[:ctx.requests - issued]
+        )
+        for student in takers:
+            answers = [
+                {'question_id': question_id, 'answer': str(ctx.rng.randint(1, 4))}
+                for question_id in questions[exam.id]
+            ]
+            yield student.user, 'post', reverse('exam-attend', kwargs={'pk': exam.id}), {'answers': answers}
+            issued += 1
+        if issued >= ctx.requests:
+            return
+
+
+@scenario('teacher-review')
+def teacher_review(ctx):
+    reviews = list(
+        StudentExam.objects.values_list('student__assigned_teacher_id', 'exam_id')
+        .filter(student__assigned_teacher__isnull=False)
+        .distinct()[:ctx.requests]
+    )
+    teachers = Teacher.objects.select_related('user').in_bulk({teacher_id for teacher_id, _ in reviews})
+    for teacher_id, exam_id in reviews:
+        yield teachers[teacher_id].user, 'get', f"{reverse('student-exam-list')}?exam_id={exam_id}", None
+
+
+@scenario('admin-export')
+def admin_export(ctx):
+    admin = User.objects.filter(role='admin').order_by('id').first()
+    if admin is None:
+        return
+    # Exports walk whole tables; a handful of runs is representative.
+    for _ in range(max(1, ctx.requests // 50)):
+        yield admin, 'get', reverse('export_students_csv'), None
+
+
+class Cleanup:
+    """Undo the rows a scenario adds, once its requests have committed.
+
+    Covers what the scenarios write: login tokens in the directory, and
+    submissions (with their answers) on the shard; deleting a submission
+    rebuilds its student's summary. Version counters and caches stay bumped,
+    which only costs clients a revalidation.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.started = timezone.now()
+        self.last_result = StudentExam.objects.using(db).aggregate(last=Max('pk'))['last'] or 0
+
+    def undo(self):
+        StudentExam.objects.using(self.db).filter(pk__gt=self.last_result).delete()
+        Token.objects.using(DIRECTORY_DB).filter(created__gte=self.started).delete()
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile.
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = "Replay load scenarios against the app in-process and report latency, throughput and queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenarios', nargs='*', help=f"Scenarios to run (default: all). Available: {', '.join(SCENARIOS)}")
+        parser.add_argument('--requests', type=int, default=200, help="Requests per scenario.")
+        parser.add_argument('--password', default='password123', help="Password of seeded users, for login-storm.")
+        parser.add_argument('--school', default='', help="Run against this school's shard.")
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', help="Where to write the JSON results (default: bench_results/<timestamp>.json).")
+        parser.add_argument('--commit', action='store_true', help="Keep writes made by the scenarios (removed after each scenario by default).")
+
+    def handle(self, *args, **options):
+        names = options['scenarios'] or list(SCENARIOS)
+        unknown = set(names) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+        host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+        ctx = BenchContext(options['requests'], options['password'], random.Random(options['seed']))
+
+        results = {}
+        with use_school(options['school']):
+            db = current_db()
+            for name in names:
+                # Each request commits on its own, as it would in production,
+                # so commit cost is measured; the scenario's rows are removed
+                # before the next one starts.
+                cleanup = Cleanup(db)
+                try:
+                    results[name] = self._run(name, ctx, host)
+                finally:
+                    if not options['commit']:
+                        cleanup.undo()
+                self._report(name, results[name])
+
+        output = options['output'] or os.path.join(
+            settings.BASE_DIR, 'bench_results', f"{datetime.now():%Y%m%dT%H%M%S}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, 'w') as f:
+            json.dump({
+                'started_at': datetime.now().isoformat(),
+                'school': options['school'],
+                'requests_per_scenario': options['requests'],
+                'scenarios': results,
+            }, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+    def _run(self, name, ctx, host):
+        client = APIClient(HTTP_HOST=host)
+        tokens = {}
+        latencies = []
+        errors = 0
+        queries = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        wall = 0.0
+        for user, method, url, data in SCENARIOS[name](ctx):
+            if user is None:
+                client.credentials()
+            else:
+                if user.pk not in tokens:
+                    tokens[user.pk] = str(RefreshToken.for_user(user).access_token)
+                client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens[user.pk]}")
+
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(count_queries))
+                start = perf_counter()
+                response = getattr(client, method)(url, data, format='json')
+                elapsed = perf_counter() - start
+
+            wall += elapsed
+            latencies.append(elapsed * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+        latencies.sort()
+        count = len(latencies)
+        return {
+            'requests': count,
+            'errors': errors,
+            'requests_per_second': round(count / wall, 2) if wall else 0.0,
+            'mean_ms': round(sum(latencies) / count, 3) if count else 0.0,
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'queries_per_request': round(queries / count, 2) if count else 0.0,
+        }
+
+    def _report(self, name, result):
+        if not result['requests']:
+            self.stdout.write(self.style.WARNING(f"{name:<18} no requests (seed data first?)"))
+            return
+        self.stdout.write(
+            f"{name:<18} {result['requests']:>6} req  {result['requests_per_second']:>8.1f} req/s  "
+            f"p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  p99 {result['p99_ms']:>8.2f} ms  "
+            f"{result['queries_per_request']:>6.1f} q/req  {result['errors']} errors"
+        )
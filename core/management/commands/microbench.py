@@ -0,0 +1,97 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+
+from core.fast_serializers import FastStudentSerializer, FastTeacherSerializer, FastExamSerializer
+from core.renderers import FastJSONRenderer, orjson
+from core.serializers import StudentSerializer, TeacherSerializer, ExamSerializer, StudentExamSerializer
+from core.tenancy import use_school
+from core.views import student_queryset, teacher_queryset, exam_queryset, student_exam_queryset
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_serializers(command, options):
+    cases = [
+        ('students', StudentSerializer, FastStudentSerializer, student_queryset),
+        ('teachers', TeacherSerializer, FastTeacherSerializer, teacher_queryset),
+        ('exams', ExamSerializer, FastExamSerializer, lambda: exam_queryset().prefetch_related('targets')),
+    ]
+    for name, serializer_class, fast_class, queryset in cases:
+        queryset = queryset()[:options['rows']]
+        fast = fast_class()
+        instances = list(queryset.all())
+        rows = list(fast.values(queryset))
+        if not rows:
+            command.stdout.write(f"{name:<10} no rows (seed data first)")
+            continue
+
+        per_1000 = 1000 / len(rows) * 1000
+        model = best_of(options['repeat'], lambda: serializer_class(instances, many=True).data) * per_1000
+        values = best_of(options['repeat'], lambda: fast.serialize(rows)) * per_1000
+        model_total = best_of(options['repeat'], lambda: serializer_class(list(queryset.all()), many=True).data) * per_1000
+        values_total = best_of(options['repeat'], lambda: fast.serialize(list(fast.values(queryset)))) * per_1000
+        command.stdout.write(
+            f"{name:<10} {len(rows):>6} rows | serialize per 1000: ModelSerializer {model:8.2f} ms, "
+            f"fast {values:7.2f} ms ({model / values:5.1f}x) | with query: {model_total:8.2f} ms vs "
+            f"{values_total:7.2f} ms ({model_total / values_total:5.1f}x)"
+        )
+
+
+def bench_renderers(command, options):
+    if orjson is None:
+        command.stdout.write("orjson is not installed; FastJSONRenderer falls back to the stdlib encoder")
+    students = FastStudentSerializer()
+    cases = [
+        ('students', lambda rows: students.serialize(students.values(student_queryset()[:rows]))),
+        ('results', lambda rows: StudentExamSerializer(student_exam_queryset()[:rows], many=True).data),
+    ]
+    for name, load in cases:
+        data = load(options['rows'])
+        if not data:
+            command.stdout.write(f"{name:<10} no rows (seed data first)")
+            continue
+
+        stdlib, fast = JSONRenderer(), FastJSONRenderer()
+        body = fast.render(data)
+        compressed = compress_string(body)
+        stdlib_ms = best_of(options['repeat'], lambda: stdlib.render(data)) * 1000
+        fast_ms = best_of(options['repeat'], lambda: fast.render(data)) * 1000
+        gzip_ms = best_of(options['repeat'], lambda: compress_string(body)) * 1000
+        command.stdout.write(
+            f"{name:<10} {len(data):>6} rows | {len(body):>9} bytes, gzip {len(compressed):>8} "
+            f"({len(body) / len(compressed):4.1f}x) | encode: stdlib {stdlib_ms:7.2f} ms, "
+            f"fast {fast_ms:7.2f} ms ({stdlib_ms / fast_ms:4.1f}x), gzip {gzip_ms:6.2f} ms"
+        )
+
+
+SUBJECTS = {
+    'serializers': bench_serializers,
+    'renderers': bench_renderers,
+}
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmarks of hot code paths against the current database."
+
+    def add_arguments(self, parser):
+        parser.add_argument('subjects', nargs='*', help=f"Subjects (default: all): {', '.join(SUBJECTS)}")
+        parser.add_argument('--rows', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--school', default='', help="Benchmark this school's shard.")
+
+    def handle(self, *args, **options):
+        with use_school(options['school']):
+            for subject in options['subjects'] or SUBJECTS:
+                self.stdout.write(self.style.MIGRATE_HEADING(subject))
+                SUBJECTS[subject](self, options)
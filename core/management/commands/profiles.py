@@ -0,0 +1,46 @@
+import glob
+import os
+import pstats
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "List collected request profiles, or aggregate them with --aggregate."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', default=settings.PROFILE_DIR, help="Directory holding .prof files.")
+        parser.add_argument('--route', help="Only profiles of this route, e.g. exam-attend.")
+        parser.add_argument('--role', help="Only profiles of this user role.")
+        parser.add_argument('--aggregate', action='store_true', help="Merge the matching profiles and print the top functions.")
+        parser.add_argument('--sort', default='cumulative', help="pstats sort key (default: cumulative).")
+        parser.add_argument('--limit', type=int, default=25, help="Number of functions to print.")
+
+    def handle(self, *args, **options):
+        profiles = []
+        for path in sorted(glob.glob(os.path.join(options['dir'], '*.prof'))):
+            # <time>-<route>-<role>-<id>.prof; route names may contain dashes.
+            stamp, rest = os.path.basename(path)[:-len('.prof')].split('-', 1)
+            route, role, _ = rest.rsplit('-', 2)
+            if options['route'] and route != options['route']:
+                continue
+            if options['role'] and role != options['role']:
+                continue
+            profiles.append((stamp, route, role, path))
+
+        if not profiles:
+            self.stdout.write("No profiles found.")
+            return
+
+        if not options['aggregate']:
+            for stamp, route, role, path in profiles:
+                self.stdout.write(f"{stamp}  {route:<30} {role:<10} {path}")
+            self.stdout.write(f"{len(profiles)} profile(s).")
+            return
+
+        stats = pstats.Stats(profiles[0][3], stream=self.stdout)
+        for _, _, _, path in profiles[1:]:
+            stats.add(path)
+        self.stdout.write(f"Aggregated {len(profiles)} profile(s).")
+        stats.strip_dirs().sort_stats(options['sort']).print_stats(options['limit'])
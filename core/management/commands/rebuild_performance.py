@@ -0,0 +1,21 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from core import performance
+from core.tenancy import current_db, use_school
+
+
+class Command(BaseCommand):
+    help = "Recompute every student performance summary from the stored exam results."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--school', default='', help="Rebuild this school's shard.")
+
+    def handle(self, *args, **options):
+        with use_school(options['school']):
+            db = current_db()
+            start = perf_counter()
+            summaries = performance.rebuild(using=db)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {summaries} student summaries on '{db}' in {perf_counter() - start:.1f}s."))
@@ -0,0 +1,22 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import search
+from core.tenancy import current_db, use_school
+
+
+class Command(BaseCommand):
+    help = "Rebuild the student/teacher search index from the profile tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--school', default='', help="Rebuild this school's shard.")
+
+    def handle(self, *args, **options):
+        with use_school(options['school']):
+            db = current_db()
+            if not search.available(db):
+                raise CommandError(f"Database '{db}' has no FTS5 search index; run migrate first.")
+            start = perf_counter()
+            rows = search.rebuild(db)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {rows} people on '{db}' in {perf_counter() - start:.1f}s."))
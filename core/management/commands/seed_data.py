@@ -0,0 +1,245 @@
+import random
+from datetime import date, timedelta
+from time import perf_counter
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from core.models import User, Teacher, Student, Exam, ExamTarget, Question, StudentExam, StudentAnswer, class_key
+from core import dashboard, performance, search, versioning
+from core.tenancy import DIRECTORY_DB, current_db, replicate_users, use_school
+
+
+SUBJECTS = ['Math', 'Science', 'English', 'History', 'Geography', 'Computer Science']
+FIRST_NAMES = ['Aarav', 'Diya', 'Ishaan', 'Meera', 'Kabir', 'Anaya', 'Rohan', 'Sara', 'Vivaan', 'Zoya',
+               'Arjun', 'Nila', 'Dev', 'Tara', 'Reyansh', 'Kiara', 'Aditya', 'Myra', 'Kian', 'Riya']
+LAST_NAMES = ['Sharma', 'Nair', 'Menon', 'Iyer', 'Patel', 'Reddy', 'Das', 'Pillai', 'Khan', 'Singh',
+              'Joseph', 'Thomas', 'Varma', 'Rao', 'Gupta', 'Bose', 'Kapoor', 'Mehta', 'Jain', 'George']
+
+
+class Command(BaseCommand):
+    help = "Generate a reproducible synthetic school with bulk inserts (teachers, students, exams, results)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--teachers', type=int, default=100)
+        parser.add_argument('--students', type=int, default=10000)
+        parser.add_argument('--classes', type=int, default=12, help="Classes are named 1..N.")
+        parser.add_argument('--exams-per-class', type=int, default=5)
+        parser.add_argument('--participation', type=float, default=0.8,
+                            help="Probability that a student in the target class takes an exam.")
+        parser.add_argument('--accuracy', type=float, default=0.6,
+                            help="Mean probability of a correct answer; per-student ability is Beta distributed.")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--password', default='password123', help="Password of every generated user.")
+        parser.add_argument('--prefix', default='seed', help="Prefix for usernames, roll numbers and employee ids.")
+        parser.add_argument('--school', default='', help="Generate into this school's shard.")
+
+    def handle(self, *args, **options):
+        if not 0 < options['accuracy'] < 1:
+            raise CommandError("--accuracy must be between 0 and 1.")
+        if options['teachers'] < 1:
+            raise CommandError("--teachers must be at least 1.")
+
+        prefix = options['prefix']
+        if User.objects.filter(username__startswith=f"{prefix}_").exists():
+            raise CommandError(f"Users prefixed '{prefix}_' already exist; pick another --prefix.")
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        # One hash for everyone: hashing is what makes create_user slow.
+        self.password = make_password(options['password'], salt=f"{prefix}{options['seed']}")
+        self.school = options['school']
+        self.started = perf_counter()
+
+        with use_school(self.school):
+            db = current_db()
+            with transaction.atomic(using=DIRECTORY_DB), transaction.atomic(using=db):
+                teachers = self._teachers(options)
+                students = self._students(options, teachers)
+                exams = self._exams(options, teachers)
+                self._results(options, students, exams)
+                self._log(f"{search.rebuild(db)} rows in the search index")
+                self._log(f"{performance.rebuild(using=db)} student performance summaries")
+                versioning.bump(versioning.NAMES, db)
+            dashboard.invalidate_school(db)
+
+        self.stdout.write(self.style.SUCCESS(f"Done in {perf_counter() - self.started:.1f}s."))
+
+    def _next_id(self, model):
+        return (model.objects.aggregate(top=Max('id'))['top'] or 0) + 1
+
+    def _insert(self, model, objs):
+        for start in range(0, len(objs), self.batch_size):
+            model.objects.bulk_create(objs[start:start + self.batch_size], batch_size=self.batch_size)
+
+    def _insert_rows(self, model, fields, rows):
+        # The result tables run into millions of rows; plain executemany avoids
+        # building a model instance per row.
+        connection = connections[router.db_for_write(model)]
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(model._meta.get_field(name).column) for name in fields)
+        sql = (f"INSERT INTO {quote(model._meta.db_table)} ({columns}) "
+               f"VALUES ({', '.join(['%s'] * len(fields))})")
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), self.batch_size):
+                cursor.executemany(sql, rows[start:start + self.batch_size])
+
+    def _log(self, message):
+        self.stdout.write(f"[{perf_counter() - self.started:7.1f}s] {message}")
+
+    def _users(self, role, count, name):
+        first_id = self._next_id(User)
+        users = [
+            User(
+                id=first_id + i,
+                username=name(i),
+                password=self.password,
+                role=role,
+                school=self.school,
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                email=f"{name(i)}@example.com",
+            )
+            for i in range(count)
+        ]
+        self._insert(User, users)
+        replicate_users(users)
+        return users
+
+    def _teachers(self, options):
+        prefix = options['prefix']
+        self._users('admin', 1, lambda i: f"{prefix}_admin")
+        users = self._users('teacher', options['teachers'], lambda i: f"{prefix}_t{i}")
+
+        first_id = self._next_id(Teacher)
+        today = date.today()
+        teachers = [
+            Teacher(
+                id=first_id + i,
+                user_id=user.id,
+                employee_id=f"{prefix}-E{i:06d}",
+                phone_number=f"9{self.rng.randrange(10 ** 9):09d}",
+                subject_specialization=SUBJECTS[i % len(SUBJECTS)],
+                date_of_joining=today - timedelta(days=self.rng.randrange(20 * 365)),
+            )
+            for i, user in enumerate(users)
+        ]
+        self._insert(Teacher, teachers)
+        self._log(f"{len(teachers)} teachers")
+        return teachers
+
+    def _students(self, options, teachers):
+        prefix = options['prefix']
+        users = self._users('student', options['students'], lambda i: f"{prefix}_s{i}")
+
+        first_id = self._next_id(Student)
+        today = date.today()
+        students = []
+        for i, user in enumerate(users):
+            class_number = self.rng.randint(1, options['classes'])
+            students.append(Student(
+                id=first_id + i,
+                user_id=user.id,
+                class_name=str(class_number),
+                class_key=class_key(str(class_number)),
+                roll_number=f"{prefix}-R{i:07d}",
+                phone_number=f"8{self.rng.randrange(10 ** 9):09d}",
+                grade=str(class_number),
+                date_of_birth=today - timedelta(days=365 * (class_number + 5) + self.rng.randrange(365)),
+                admission_date=today - timedelta(days=self.rng.randrange(365 * class_number)),
+                assigned_teacher_id=self.rng.choice(teachers).id,
+            ))
+        self._insert(Student, students)
+        self._log(f"{len(students)} students")
+        return students
+
+    def _exams(self, options, teachers):
+        by_subject = {}
+        for teacher in teachers:
+            by_subject.setdefault(teacher.subject_specialization, []).append(teacher)
+
+        first_exam = self._next_id(Exam)
+        first_question = self._next_id(Question)
+        exams, questions = [], []
+        for class_number in range(1, options['classes'] + 1):
+            for n in range(options['exams_per_class']):
+                subject = self.rng.choice(SUBJECTS)
+                teacher = self.rng.choice(by_subject.get(subject) or teachers)
+                exam = Exam(
+                    id=first_exam + len(exams),
+                    title=f"{subject} test {n + 1} (class {class_number})",
+                    subject=subject,
+                    target_class=str(class_number),
+                    class_key=class_key(str(class_number)),
+                    teacher_id=teacher.id,
+                    created_by_id=teacher.user_id,
+                )
+                exam.answer_key = []
+                for q in range(5):
+                    question = Question(
+                        id=first_question + len(questions),
+                        exam_id=exam.id,
+                        question_text=f"{subject} question {q + 1}",
+                        option1='A', option2='B', option3='C', option4='D',
+                        correct_option=str(self.rng.randint(1, 4)),
+                    )
+                    questions.append(question)
+                    exam.answer_key.append(question)
+                exams.append(exam)
+
+        self._insert(Exam, exams)
+        self._insert(ExamTarget, [ExamTarget(exam_id=exam.id, class_key=exam.class_key) for exam in exams])
+        self._insert(Question, questions)
+        self._log(f"{len(exams)} exams, {len(questions)} questions")
+        return exams
+
+    def _results(self, options, students, exams):
+        mean = options['accuracy']
+        ability = {student.id: self.rng.betavariate(8 * mean, 8 * (1 - mean)) for student in students}
+        by_class = {}
+        for student in students:
+            by_class.setdefault(student.class_name, []).append(student.id)
+
+        connection = connections[router.db_for_write(StudentExam)]
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        wrong = {option: [o for o in '1234' if o != option] for option in '1234'}
+        next_submission = self._next_id(StudentExam)
+        next_answer = self._next_id(StudentAnswer)
+        submissions, answers = [], []
+        submission_count = answer_count = 0
+
+        for exam in exams:
+            key = [(question.id, question.correct_option) for question in exam.answer_key]
+            for student_id in by_class.get(exam.target_class, []):
+                if self.rng.random() >= options['participation']:
+                    continue
+                marks = 0
+                for question_id, correct in key:
+                    if self.rng.random() < ability[student_id]:
+                        answers.append((next_answer, next_submission, question_id, correct, True))
+                        marks += 1
+                    else:
+                        answer = self.rng.choice(wrong[correct])
+                        answers.append((next_answer, next_submission, question_id, answer, False))
+                    next_answer += 1
+                submissions.append((next_submission, student_id, exam.id, marks, now, now))
+                next_submission += 1
+
+                if len(answers) >= self.batch_size:
+                    submission_count += len(submissions)
+                    answer_count += len(answers)
+                    self._flush_results(submissions, answers)
+                    submissions, answers = [], []
+
+        submission_count += len(submissions)
+        answer_count += len(answers)
+        self._flush_results(submissions, answers)
+        self._log(f"{submission_count} submissions, {answer_count} answers")
+
+    def _flush_results(self, submissions, answers):
+        self._insert_rows(StudentExam, ['id', 'student', 'exam', 'marks', 'attempted_at', 'submitted_at'], submissions)
+        self._insert_rows(StudentAnswer, ['id', 'student_exam', 'question', 'answer', 'is_correct'], answers)
@@ -0,0 +1,48 @@
+import glob
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Summarize the slow-query log: top statements by total time."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=10, help="Number of statements to show.")
+        parser.add_argument('--log', default=settings.SLOW_QUERY_LOG, help="Path of the slow-query log.")
+        parser.add_argument('--plans', action='store_true', help="Print the last captured plan of each statement.")
+
+    def handle(self, *args, **options):
+        stats = {}
+        for path in sorted(glob.glob(f"{options['log']}*")):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    entry = stats.setdefault(record['sql'], {
+                        'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'views': set(), 'plan': [],
+                    })
+                    entry['count'] += 1
+                    entry['total_ms'] += record['duration_ms']
+                    entry['max_ms'] = max(entry['max_ms'], record['duration_ms'])
+                    entry['views'].add(record['view'])
+                    entry['plan'] = record.get('plan') or entry['plan']
+
+        if not stats:
+            self.stdout.write("No slow queries recorded.")
+            return
+
+        ranked = sorted(stats.items(), key=lambda item: item[1]['total_ms'], reverse=True)
+        for rank, (sql, entry) in enumerate(ranked[:options['top']], start=1):
+            self.stdout.write(self.style.WARNING(
+                f"#{rank} total {entry['total_ms']:.1f} ms | {entry['count']} calls | "
+                f"avg {entry['total_ms'] / entry['count']:.1f} ms | max {entry['max_ms']:.1f} ms"
+            ))
+            self.stdout.write(f"  views: {', '.join(sorted(entry['views']))}")
+            self.stdout.write(f"  {sql}")
+            if options['plans']:
+                for step in entry['plan']:
+                    self.stdout.write(f"    plan: {step}")
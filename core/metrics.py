@@ -0,0 +1,147 @@
+import threading
+from contextvars import ContextVar
+from time import perf_counter
+
+
+# Upper bounds (seconds) of the request latency histogram buckets.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_active = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = ('route', 'db_queries', 'db_time', 'serializer_time', 'in_serializer')
+
+    def __init__(self, route=''):
+        self.route = route
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.in_serializer = False
+
+
+def current_metrics():
+    return _active.get()
+
+
+def start_request():
+    metrics = RequestMetrics()
+    return metrics, _active.set(metrics)
+
+
+def end_request(token):
+    _active.reset(token)
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    metrics = _active.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += perf_counter() - start
+        metrics.db_queries += 1
+
+
+def install_db_instrumentation(sender, connection, **kwargs):
+    # Connected to ``connection_created``; wrappers survive reconnects, so
+    # only install once per connection object.
+    if db_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_execute_wrapper)
+
+
+class TimedSerializerMixin:
+    """Charge time spent in ``to_representation`` to the current request.
+
+    Only the outermost serializer is timed; nested serializers run inside it.
+    """
+
+    def to_representation(self, instance):
+        metrics = _active.get()
+        if metrics is None or metrics.in_serializer:
+            return super().to_representation(instance)
+
+        metrics.in_serializer = True
+        start = perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializer_time += perf_counter() - start
+            metrics.in_serializer = False
+
+
+class RouteStats:
+    __slots__ = ('count', 'total_time', 'buckets', 'db_queries', 'db_time',
+                 'serializer_time', 'response_bytes')
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.response_bytes = 0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def observe(self, route, duration, metrics, response_bytes):
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = RouteStats()
+            stats.count += 1
+            stats.total_time += duration
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if duration <= bound:
+                    stats.buckets[i] += 1
+                    break
+            stats.db_queries += metrics.db_queries
+            stats.db_time += metrics.db_time
+            stats.serializer_time += metrics.serializer_time
+            stats.response_bytes += response_bytes
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    def render_prometheus(self):
+        """Return the aggregates in the Prometheus text exposition format."""
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines = [
+                '# HELP core_request_duration_seconds Request latency by route.',
+                '# TYPE core_request_duration_seconds histogram',
+            ]
+            for route, stats in routes:
+                cumulative = 0
+                for bound, hits in zip(LATENCY_BUCKETS, stats.buckets):
+                    cumulative += hits
+                    lines.append(f'core_request_duration_seconds_bucket{{route="{route}",le="{bound}"}} {cumulative}')
+                lines.append(f'core_request_duration_seconds_bucket{{route="{route}",le="+Inf"}} {stats.count}')
+                lines.append(f'core_request_duration_seconds_sum{{route="{route}"}} {stats.total_time:.6f}')
+                lines.append(f'core_request_duration_seconds_count{{route="{route}"}} {stats.count}')
+
+            counters = (
+                ('core_request_db_queries_total', 'Database queries executed.', 'db_queries', '{}'),
+                ('core_request_db_seconds_total', 'Time spent in the database.', 'db_time', '{:.6f}'),
+                ('core_request_serializer_seconds_total', 'Time spent serializing.', 'serializer_time', '{:.6f}'),
+                ('core_response_bytes_total', 'Response body bytes.', 'response_bytes', '{}'),
+            )
+            for name, help_text, attr, fmt in counters:
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} counter')
+                for route, stats in routes:
+                    lines.append(f'{name}{{route="{route}"}} {fmt.format(getattr(stats, attr))}')
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
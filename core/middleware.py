@@ -0,0 +1,122 @@
+import cProfile
+import os
+import random
+import uuid
+from datetime import datetime
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.middleware.gzip import GZipMiddleware
+
+from . import metrics
+from .permissions import jwt_user
+from .tenancy import bind_request
+
+
+class TenantMiddleware:
+    """Expose the current request to the shard router for its whole lifetime."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with bind_request(request):
+            return self.get_response(request)
+
+
+class PerformanceMiddleware:
+    """Time each request and publish the breakdown.
+
+    Adds a ``Server-Timing`` header (total, db, serializer) and feeds the
+    per-route aggregates served by the ``/metrics`` endpoint.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERF_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_metrics, token = metrics.start_request()
+        start = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        duration = perf_counter() - start
+
+        route = request_metrics.route or 'unmatched'
+        size = 0 if response.streaming else len(response.content)
+
+        response['Server-Timing'] = (
+            f'total;dur={duration * 1000:.2f}, '
+            f'db;dur={request_metrics.db_time * 1000:.2f};desc="{request_metrics.db_queries} queries", '
+            f'ser;dur={request_metrics.serializer_time * 1000:.2f}'
+        )
+        metrics.registry.observe(route, duration, request_metrics, size)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Name the route before the view runs so DB hooks can attribute queries.
+        request_metrics = metrics.current_metrics()
+        if request_metrics is not None:
+            request_metrics.route = request.resolver_match.url_name or view_func.__name__
+        return None
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """Gzip responses for clients that accept it, once they reach GZIP_MIN_LENGTH bytes.
+
+    Small bodies are sent as they are: the gzip framing and the CPU spent
+    would outweigh the bytes saved. Event streams are never compressed.
+    """
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < settings.GZIP_MIN_LENGTH:
+            return response
+        if response.get('Content-Type', '').startswith('text/event-stream'):
+            # gzip buffers; events must reach the client as they are written.
+            return response
+        return super().process_response(request, response)
+
+
+class ProfilingMiddleware:
+    """Run sampled requests, or admin requests carrying PROFILE_HEADER, under cProfile.
+
+    Profiles are written to PROFILE_DIR as ``<time>-<route>-<role>-<id>.prof``;
+    see the ``profiles`` management command.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self._should_profile(request):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        response = profiler.runcall(self.get_response, request)
+        self._save(profiler, request)
+        return response
+
+    def _should_profile(self, request):
+        if request.headers.get(settings.PROFILE_HEADER):
+            user = getattr(request, 'user', None)
+            if user is None or not user.is_authenticated:
+                # DRF authenticates inside the view; resolve the JWT here so
+                # only admins can trigger a profile on demand.
+                user = jwt_user(request)
+            return user is not None and user.role == 'admin'
+        rate = settings.PROFILE_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
+
+    def _save(self, profiler, request):
+        match = request.resolver_match
+        route = (match.url_name if match else None) or 'unmatched'
+        user = getattr(request, 'user', None)
+        role = user.role if user is not None and user.is_authenticated else 'anonymous'
+
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        name = f"{datetime.now():%Y%m%dT%H%M%S}-{route}-{role}-{uuid.uuid4().hex[:8]}.prof"
+        profiler.dump_stats(os.path.join(settings.PROFILE_DIR, name))
@@ -7,15 +7,16 @@ def truncate_students_and_teachers_users(apps, schema_editor):
     User = apps.get_model('core', 'User')
     Student = apps.get_model('core', 'Student')
     Teacher = apps.get_model('core', 'Teacher')
+    db_alias = schema_editor.connection.alias
 
     logger.info("Deleting all Student records...")
-    Student.objects.all().delete()
+    Student.objects.using(db_alias).all().delete()
 
     logger.info("Deleting all Teacher records...")
-    Teacher.objects.all().delete()
+    Teacher.objects.using(db_alias).all().delete()
 
     logger.info("Deleting all non-admin Users...")
-    User.objects.exclude(role='admin').delete()
+    User.objects.using(db_alias).exclude(role='admin').delete()
 
 def reverse_truncate_students_and_teachers_users(apps, schema_editor):
     logger.warning("Reverse for truncate not implemented.")
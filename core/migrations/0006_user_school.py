@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_remove_student_first_name_remove_student_last_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='school',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+    ]
@@ -0,0 +1,53 @@
+import logging
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = 'core_person_search'
+
+
+def create_search_index(apps, schema_editor):
+    # FTS5 is SQLite only; other backends use core.search's LIKE fallback.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+                "kind UNINDEXED, obj_id UNINDEXED, name, username, roll_number, employee_id, subject, "
+                "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+            )
+        except OperationalError as e:
+            logger.warning(f"SQLite FTS5 unavailable ({e}); search falls back to LIKE lookups.")
+            return
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, kind, obj_id, name, username, roll_number, employee_id, subject) "
+            "SELECT p.id * 2, 'student', p.id, u.first_name || ' ' || u.last_name, u.username, p.roll_number, '', '' "
+            "FROM core_student p JOIN core_user u ON u.id = p.user_id"
+        )
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, kind, obj_id, name, username, roll_number, employee_id, subject) "
+            "SELECT p.id * 2 + 1, 'teacher', p.id, u.first_name || ' ' || u.last_name, u.username, '', "
+            "p.employee_id, p.subject_specialization "
+            "FROM core_teacher p JOIN core_user u ON u.id = p.user_id"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_user_school'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, reverse_code=drop_search_index),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_person_search'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exam',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='exam',
+            name='subject',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='exam',
+            name='target_class',
+            field=models.CharField(db_index=True, default='1', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='admission_date',
+            field=models.DateField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='class_name',
+            field=models.CharField(db_index=True, default='1', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='date_of_birth',
+            field=models.DateField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='grade',
+            field=models.CharField(db_index=True, max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='status',
+            field=models.IntegerField(db_index=True, default=0),
+        ),
+    ]
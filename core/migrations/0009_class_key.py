@@ -0,0 +1,70 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:32
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def class_key(value):
+    # Frozen copy of core.models.class_key.
+    value = value or ''
+    number = re.search(r'\d+', value)
+    if number:
+        return str(int(number.group()))
+    return re.sub(r'[^0-9a-z]', '', value.lower())
+
+
+def backfill_class_keys(apps, schema_editor):
+    Student = apps.get_model('core', 'Student')
+    Exam = apps.get_model('core', 'Exam')
+    ExamTarget = apps.get_model('core', 'ExamTarget')
+    db_alias = schema_editor.connection.alias
+
+    # One UPDATE per distinct class name, not per row.
+    for model, field in ((Student, 'class_name'), (Exam, 'target_class')):
+        rows = model.objects.using(db_alias)
+        for name in rows.values_list(field, flat=True).distinct():
+            rows.filter(**{field: name}).update(class_key=class_key(name))
+
+    exams = Exam.objects.using(db_alias).values_list('id', 'class_key').iterator(chunk_size=2000)
+    batch = []
+    for exam_id, key in exams:
+        batch.append(ExamTarget(exam_id=exam_id, class_key=key))
+        if len(batch) == 2000:
+            ExamTarget.objects.using(db_alias).bulk_create(batch)
+            batch = []
+    ExamTarget.objects.using(db_alias).bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_indexed_filter_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exam',
+            name='class_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='class_key',
+            field=models.CharField(db_index=True, default='1', editable=False, max_length=50),
+        ),
+        migrations.CreateModel(
+            name='ExamTarget',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('class_key', models.CharField(max_length=50)),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='targets', to='core.exam')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['class_key', 'exam'], name='core_examta_class_k_88e5aa_idx')],
+                'unique_together': {('exam', 'class_key')},
+            },
+        ),
+        migrations.RunPython(backfill_class_keys, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_class_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentPerformance',
+            fields=[
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='performance', serialize=False, to='core.student')),
+                ('exams_taken', models.IntegerField(default=0)),
+                ('total_marks', models.IntegerField(default=0)),
+                ('subjects', models.JSONField(default=dict)),
+                ('recent_marks', models.JSONField(default=list)),
+            ],
+        ),
+    ]
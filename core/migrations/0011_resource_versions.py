@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:56
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def create_versions(apps, schema_editor):
+    # One row per resource on every database, so bumps are a single UPDATE.
+    ResourceVersion = apps.get_model('core', 'ResourceVersion')
+    now = timezone.now()
+    ResourceVersion.objects.using(schema_editor.connection.alias).bulk_create([
+        ResourceVersion(name=name, version=1, modified=now)
+        for name in ('student', 'teacher', 'exam', 'studentexam', 'user')
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_student_performance'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourceVersion',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(default=0)),
+                ('modified', models.DateTimeField()),
+            ],
+        ),
+        migrations.RunPython(create_versions, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:40
+
+import core.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_resource_versions'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', core.models.DirectoryUserManager()),
+            ],
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:49
+
+import re
+
+from django.db import migrations, models
+
+
+def old_class_key(value):
+    # Frozen copy of the 0009 class_key: sections were dropped.
+    value = value or ''
+    number = re.search(r'\d+', value)
+    if number:
+        return str(int(number.group()))
+    return re.sub(r'[^0-9a-z]', '', value.lower())
+
+
+def class_key(value):
+    # Frozen copy of core.models.class_key.
+    value = (value or '').lower()
+    number = re.search(r'(\d+)(?:[\s./-]*([a-z])(?![a-z]))?', value)
+    if number:
+        return str(int(number.group(1))) + (number.group(2) or '')
+    return re.sub(r'[^0-9a-z]', '', value)
+
+
+def rekey(apps, schema_editor):
+    Student = apps.get_model('core', 'Student')
+    Exam = apps.get_model('core', 'Exam')
+    ExamTarget = apps.get_model('core', 'ExamTarget')
+    db_alias = schema_editor.connection.alias
+    exams = Exam.objects.using(db_alias)
+    targets = ExamTarget.objects.using(db_alias)
+
+    # Extra targets so far only existed as ExamTarget rows; record them on
+    # the exam. A row equal to the exam's own key is taken as its own.
+    extras = {}
+    for exam_id, key in targets.exclude(class_key=models.F('exam__class_key')).values_list('exam_id', 'class_key'):
+        extras.setdefault(exam_id, []).append(key)
+    for exam_id, keys in extras.items():
+        exams.filter(pk=exam_id).update(also_target_classes=sorted(keys))
+
+    # One UPDATE per distinct class name, not per row.
+    students = Student.objects.using(db_alias)
+    for name in students.values_list('class_name', flat=True).distinct():
+        students.filter(class_name=name).update(class_key=class_key(name))
+    for name in exams.values_list('target_class', flat=True).distinct():
+        old, new = old_class_key(name), class_key(name)
+        exams.filter(target_class=name).update(class_key=new)
+        if old != new:
+            targets.filter(exam__target_class=name, class_key=old).update(class_key=new)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_user_replica_sync'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exam',
+            name='also_target_classes',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(rekey, reverse_code=migrations.RunPython.noop),
+    ]
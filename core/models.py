@@ -1,5 +1,101 @@
-from django.contrib.auth.models import AbstractUser
+import re
+
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
+from django.db.models.functions import Left, Length
+from django.db.models.lookups import In
+
+from .tenancy import DIRECTORY_DB, REPLICA_BATCH, handling_replicas, refresh_user_replicas, replicas_handled
+
+
+# A key for one section of a numbered class ("5a"); see class_base().
+SECTION_KEY = r'^[0-9]+[a-z]$'
+
+
+def class_key(value):
+    """Normalize a class name for matching exams to students.
+
+    Names carrying a number reduce to it, keeping a one-letter section after
+    it ("Class 05", "5" -> "5"; "5A", "5-a", "Class 5 A" -> "5a"); other
+    names are lowercased with punctuation and spaces dropped ("K.G." -> "kg").
+    """
+    value = (value or '').lower()
+    number = re.search(r'(\d+)(?:[\s./-]*([a-z])(?![a-z]))?', value)
+    if number:
+        return str(int(number.group(1))) + (number.group(2) or '')
+    return re.sub(r'[^0-9a-z]', '', value)
+
+
+def class_base(key):
+    """The whole class a section key belongs to ("5a" -> "5"); other keys map to themselves."""
+    return key[:-1] if re.match(SECTION_KEY, key) else key
+
+
+def class_base_expression(field='class_key'):
+    """``class_base`` of a key column, in SQL."""
+    return models.Case(
+        models.When(**{f'{field}__regex': SECTION_KEY}, then=Left(field, Length(field) - 1)),
+        default=models.F(field),
+    )
+
+
+def targeted_students(keys):
+    """Filter for students an exam targeting ``keys`` is set for.
+
+    A student matches on their own key or, for a section, on the whole
+    class: "5" reaches 5A and 5B, while "5b" reaches 5B only.
+    """
+    keys = list(keys)
+    return models.Q(class_key__in=keys) | models.Q(In(class_base_expression(), keys))
+
+
+class UserQuerySet(models.QuerySet):
+    """Keeps shard replicas in step with set-based writes to the directory.
+
+    ``save()`` replicates through signals; ``update()`` and ``bulk_update()``
+    send none, so they refresh the replicas of the rows they touched and bump
+    the ``'user'`` version themselves.
+    """
+
+    def _syncs_replicas(self):
+        return self.db == DIRECTORY_DB and not handling_replicas()
+
+    def _refresh_replicas(self, pks, fields):
+        # Re-read from the directory: the caller's objects may be stale in
+        # fields the write did not touch.
+        aliases = set()
+        for start in range(0, len(pks), REPLICA_BATCH):
+            aliases |= refresh_user_replicas(
+                self.model.objects.using(DIRECTORY_DB).filter(pk__in=pks[start:start + REPLICA_BATCH]))
+        # As versioning.bump_on_user_write does for saves: no payload shows
+        # last_login.
+        if set(fields) - {'last_login'}:
+            from .versioning import bump  # versioning imports the models
+            for alias in aliases:
+                bump(['user'], alias)
+
+    def update(self, **kwargs):
+        if not self._syncs_replicas():
+            return super().update(**kwargs)
+        pks = list(self.values_list('pk', flat=True))
+        rows = super().update(**kwargs)
+        self._refresh_replicas(pks, kwargs)
+        return rows
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        if not self._syncs_replicas():
+            return super().bulk_update(objs, fields, batch_size=batch_size)
+        objs = list(objs)
+        # bulk_update runs update() per batch; refresh once, afterwards.
+        with replicas_handled():
+            rows = super().bulk_update(objs, fields, batch_size=batch_size)
+        self._refresh_replicas([obj.pk for obj in objs], fields)
+        return rows
+
+
+class DirectoryUserManager(UserManager.from_queryset(UserQuerySet)):
+    pass
+
 
 class User(AbstractUser):
     ROLE_CHOICES = (
@@ -8,6 +104,10 @@ class User(AbstractUser):
         ('student', 'Student'),
     )
     role = models.CharField(max_length=10, choices=ROLE_CHOICES, default='student')
+    # Tenant key: selects the database shard for this user's school (see SCHOOL_SHARDS).
+    school = models.CharField(max_length=50, blank=True, default='')
+
+    objects = DirectoryUserManager()
 
     def __str__(self):
         return self.username
@@ -19,7 +119,9 @@ class Teacher(models.Model):
     phone_number = models.CharField(max_length=15)
     subject_specialization = models.CharField(max_length=100)
     date_of_joining = models.DateField()
-    status = models.IntegerField(default=0)  
+    # status values; teachers not ACTIVE are off staff.
+    ACTIVE = 0
+    status = models.IntegerField(default=ACTIVE)
 
     def delete(self, *args, **kwargs):
         user = self.user  # store user before deletion
@@ -32,15 +134,24 @@ class Teacher(models.Model):
 
 class Student(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
-    class_name = models.CharField(max_length=50,default='1')
+    class_name = models.CharField(max_length=50, default='1', db_index=True)
+    # class_key(class_name); kept in step by save() and the bulk paths.
+    class_key = models.CharField(max_length=50, default='1', db_index=True, editable=False)
     roll_number = models.CharField(max_length=20, unique=True)
     phone_number = models.CharField(max_length=15)
-    grade = models.CharField(max_length=20)
-    date_of_birth = models.DateField()
-    admission_date = models.DateField()
-    status = models.IntegerField(default=0)  
+    grade = models.CharField(max_length=20, db_index=True)
+    date_of_birth = models.DateField(db_index=True)
+    admission_date = models.DateField(db_index=True)
+    # status values: currently enrolled, or left (see core.rollover).
+    ENROLLED = 0
+    LEFT = 1
+    status = models.IntegerField(default=ENROLLED, db_index=True)
     assigned_teacher = models.ForeignKey(Teacher, on_delete=models.SET_NULL, null=True)
 
+    def save(self, *args, **kwargs):
+        self.class_key = class_key(self.class_name)
+        super().save(*args, **kwargs)
+
     def delete(self, *args, **kwargs):
         user = self.user  
         super().delete(*args, **kwargs)
@@ -52,15 +163,77 @@ class Student(models.Model):
 
 class Exam(models.Model):
     title = models.CharField(max_length=255)
-    subject = models.CharField(max_length=100)
-    target_class = models.CharField(max_length=10,default='1')
+    subject = models.CharField(max_length=100, db_index=True)
+    target_class = models.CharField(max_length=10, default='1', db_index=True)
+    # Classes the exam is set for besides target_class; see set_targets().
+    also_target_classes = models.JSONField(default=list, blank=True)
+    # class_key(target_class); every exam also has an ExamTarget row for it.
+    class_key = models.CharField(max_length=50, default='', db_index=True, editable=False)
     teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def target_keys(self):
+        return {self.class_key} | {class_key(name) for name in self.also_target_classes}
+
+    def extra_target_keys(self):
+        """Keys of the classes the exam is set for besides its own, from its ExamTarget rows."""
+        return sorted(target.class_key for target in self.targets.all() if target.class_key != self.class_key)
+
+    def save(self, *args, **kwargs):
+        previous = self.class_key
+        self.class_key = class_key(self.target_class)
+        # Existing exams are retargeted before the row is saved, so that the
+        # save signals (see core.versioning) come after every change.
+        adding = self._state.adding
+        if adding:
+            super().save(*args, **kwargs)
+        if previous != self.class_key:
+            self._sync_targets()
+        if not adding:
+            super().save(*args, **kwargs)
+
+    def set_targets(self, class_names):
+        """Make the exam visible to exactly ``target_class`` plus ``class_names``."""
+        self.also_target_classes = list(class_names)
+        Exam.objects.using(self._state.db).filter(pk=self.pk).update(also_target_classes=self.also_target_classes)
+        self._sync_targets()
+
+    def _sync_targets(self):
+        # Only keys no longer targeted go: the old target_class may still be
+        # listed in also_target_classes.
+        keys = self.target_keys()
+        targets = ExamTarget.objects.using(self._state.db)
+        targets.filter(exam=self).exclude(class_key__in=keys).delete()
+        targets.bulk_create([ExamTarget(exam=self, class_key=key) for key in keys], ignore_conflicts=True)
+        getattr(self, '_prefetched_objects_cache', {}).pop('targets', None)
 
     def __str__(self):
         return self.title
 
+
+class ExamTarget(models.Model):
+    """One class (by class_key) an exam is set for; a whole class also covers its sections."""
+    exam = models.ForeignKey(Exam, related_name='targets', on_delete=models.CASCADE)
+    class_key = models.CharField(max_length=50)
+
+    class Meta:
+        unique_together = ('exam', 'class_key')
+        indexes = [models.Index(fields=['class_key', 'exam'])]
+
+    @classmethod
+    def extra_keys(cls, exam_ids):
+        """``{exam_id: Exam.extra_target_keys()}`` for many exams in one query."""
+        extras = {}
+        rows = (cls.objects.filter(exam_id__in=exam_ids).exclude(class_key=models.F('exam__class_key'))
+                .order_by('exam_id', 'class_key').values_list('exam_id', 'class_key'))
+        for exam_id, key in rows:
+            extras.setdefault(exam_id, []).append(key)
+        return extras
+
+    def __str__(self):
+        return f"{self.exam} -> {self.class_key}"
+
 class Question(models.Model):
     exam = models.ForeignKey(Exam, related_name='questions', on_delete=models.CASCADE)
     question_text = models.TextField()
@@ -106,4 +279,27 @@ class StudentAnswer(models.Model):
     is_correct = models.BooleanField(default=False)
 
     def __str__(self):
-        return f"{self.student_exam} - Q{self.question.id} Answer"
\ No newline at end of file
+        return f"{self.student_exam} - Q{self.question.id} Answer"
+
+class StudentPerformance(models.Model):
+    """Running totals behind a student's summary, kept by ``core.performance``."""
+    student = models.OneToOneField(Student, primary_key=True, related_name='performance', on_delete=models.CASCADE)
+    exams_taken = models.IntegerField(default=0)
+    total_marks = models.IntegerField(default=0)
+    # {subject: [exams taken, total marks]}
+    subjects = models.JSONField(default=dict)
+    # Marks of the latest submissions, oldest first.
+    recent_marks = models.JSONField(default=list)
+
+    def __str__(self):
+        return f"{self.student} performance"
+
+
+class ResourceVersion(models.Model):
+    """A counter bumped on every write to one kind of resource; see ``core.versioning``."""
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    modified = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
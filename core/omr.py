@@ -0,0 +1,73 @@
+"""Grading of scanned OMR answer sheets.
+
+Pure Python on purpose: ``grade_rows`` runs in worker processes, which must
+not need Django to be configured.
+"""
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Scanners emit either option numbers or letters.
+OPTION_ALIASES = {'a': '1', 'b': '2', 'c': '3', 'd': '4'}
+
+
+def parse_sheets(text):
+    """Split a CSV export into ``(line_number, roll_number, answers)`` rows.
+
+    The first column is the roll number; the remaining columns are the marked
+    options in question order.
+    """
+    reader = csv.reader(io.StringIO(text))
+    header = next(reader, None)
+    if not header or header[0].strip().lower() != 'roll_number':
+        raise ValueError("The first column must be 'roll_number'.")
+
+    rows = []
+    for line_number, row in enumerate(reader, start=2):
+        if not row or not any(cell.strip() for cell in row):
+            continue
+        answers = [cell.strip() for cell in row[1:]]
+        answers = [OPTION_ALIASES.get(answer.lower(), answer) for answer in answers]
+        rows.append((line_number, row[0].strip(), answers))
+    return rows
+
+
+def grade_rows(answer_key, rows):
+    """Grade rows against ``answer_key`` (correct options in question order).
+
+    Returns ``(graded, errors)`` where graded holds
+    ``(roll_number, answers, correct_flags, marks)``.
+    """
+    graded, errors = [], []
+    for line_number, roll_number, answers in rows:
+        if not roll_number:
+            errors.append(f"Row {line_number}: missing roll number.")
+            continue
+        if len(answers) != len(answer_key):
+            errors.append(f"Row {line_number}: expected {len(answer_key)} answers, got {len(answers)}.")
+            continue
+        flags = [answer == correct for answer, correct in zip(answers, answer_key)]
+        graded.append((roll_number, answers, flags, sum(flags)))
+    return graded, errors
+
+
+def _grade_chunk(args):
+    return grade_rows(*args)
+
+
+def grade_sheets(answer_key, rows, parallel_threshold=5000, workers=None):
+    """Grade all rows, fanning out to a process pool for large files."""
+    workers = workers or os.cpu_count() or 1
+    if len(rows) < parallel_threshold or workers < 2:
+        return grade_rows(answer_key, rows)
+
+    size = -(-len(rows) // workers)
+    chunks = [(answer_key, rows[i:i + size]) for i in range(0, len(rows), size)]
+    graded, errors = [], []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_graded, chunk_errors in pool.map(_grade_chunk, chunks):
+            graded.extend(chunk_graded)
+            errors.extend(chunk_errors)
+    return graded, errors
@@ -0,0 +1,99 @@
+"""Page-number pagination whose total count may come from a short-lived cache.
+
+``COUNT(*)`` over a large table costs as much as a full scan, on every page.
+For admins, who page through whole tables, ``ApproximateCountPagination``
+reuses a count cached for ``PAGINATION_COUNT_TTL`` seconds and flags it with
+``"count_approximate": true``. The last page, or a page that comes back
+short, always reports the exact count, so clients can still reach the real
+end of the list. ``?exact_count=1`` forces a fresh count.
+"""
+import hashlib
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator as DjangoPaginator
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+
+class CountedPaginator(DjangoPaginator):
+    """A paginator told its count instead of running ``COUNT(*)``."""
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            self.count = count
+
+
+def _count_key(queryset):
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.sha1(f'{queryset.db}\n{sql}\n{params!r}'.encode()).hexdigest()
+    return f'pagecount:{digest}'
+
+
+class ApproximateCountPagination(PageNumberPagination):
+    exact_count_query_param = 'exact_count'
+    approximate_roles = ('admin',)
+
+    def use_cached_count(self, request, queryset):
+        user = getattr(request, 'user', None)
+        return hasattr(queryset, 'query') and getattr(user, 'role', None) in self.approximate_roles
+
+    def exact_count(self, queryset):
+        count = queryset.count()
+        cache.set(_count_key(queryset), count, settings.PAGINATION_COUNT_TTL)
+        return count
+
+    def _on_last_page(self, request, count, page_size):
+        page_number = request.query_params.get(self.page_query_param) or 1
+        if page_number in self.last_page_strings:
+            return True
+        try:
+            return int(page_number) >= math.ceil(count / page_size)
+        except ValueError:
+            return False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count_approximate = False
+        self.django_paginator_class = DjangoPaginator
+        page_size = self.get_page_size(request)
+        if not page_size or not self.use_cached_count(request, queryset):
+            return super().paginate_queryset(queryset, request, view)
+
+        count = None
+        if request.query_params.get(self.exact_count_query_param) not in ('1', 'true'):
+            count = cache.get(_count_key(queryset))
+        if count is None or self._on_last_page(request, count, page_size):
+            count = self.exact_count(queryset)
+        else:
+            self.count_approximate = True
+        results = self._paginate(queryset, request, view, count)
+        if self.count_approximate and len(results) < page_size:
+            self.count_approximate = False
+            if not results:
+                # Past the real end: recount, and 404 if the page is gone.
+                return self._paginate(queryset, request, view, self.exact_count(queryset))
+            # A short page is the real last page, which pins down the count.
+            count = self.page.start_index() - 1 + len(results)
+            self.page = Page(results, self.page.number, CountedPaginator(queryset, page_size, count=count))
+        return results
+
+    def _paginate(self, queryset, request, view, count):
+        self.django_paginator_class = lambda object_list, per_page: CountedPaginator(
+            object_list, per_page, count=count)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count,
+            'count_approximate': self.count_approximate,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_approximate'] = {'type': 'boolean', 'example': False}
+        return response_schema
@@ -0,0 +1,164 @@
+"""Per-student performance summaries, maintained as results come in.
+
+``StudentPerformance`` holds running totals per student, overall and per
+subject, plus the marks of the latest submissions. Every grading path folds
+its new results in with ``record``; ``rebuild`` recomputes summaries from
+``StudentExam`` after deletions or subject changes (see the receivers at the
+end), or for the whole school from the ``rebuild_performance`` command.
+Reading a summary is one primary-key lookup.
+"""
+from django.db import transaction
+
+from .models import Exam, StudentExam, StudentPerformance
+from .tenancy import current_db
+from .utils import chunks
+
+
+# How many of the latest marks the trend is taken over.
+RECENT = 5
+
+WRITE_BATCH = 500
+
+FIELDS = ['exams_taken', 'total_marks', 'subjects', 'recent_marks']
+
+
+def _add(summary, subject, marks):
+    summary.exams_taken += 1
+    summary.total_marks += marks
+    exams, total = summary.subjects.get(subject, (0, 0))
+    summary.subjects[subject] = [exams + 1, total + marks]
+    summary.recent_marks = (summary.recent_marks + [marks])[-RECENT:]
+
+
+def _group(results):
+    by_student = {}
+    for student_id, subject, marks in results:
+        by_student.setdefault(student_id, []).append((subject, marks))
+    return by_student
+
+
+def record(results):
+    """Fold new ``(student_id, subject, marks)`` results, oldest first, into the summaries.
+
+    A few queries per thousand students, whatever the number of results.
+    """
+    by_student = _group(results)
+    ids = list(by_student)
+    with transaction.atomic(using=current_db()):
+        existing = {}
+        for chunk in chunks(ids):
+            existing.update(StudentPerformance.objects.select_for_update().in_bulk(chunk))
+        created = []
+        for student_id, rows in by_student.items():
+            summary = existing.get(student_id)
+            if summary is None:
+                summary = StudentPerformance(student_id=student_id, subjects={}, recent_marks=[])
+                created.append(summary)
+            for subject, marks in rows:
+                _add(summary, subject, marks)
+        StudentPerformance.objects.bulk_create(created, batch_size=WRITE_BATCH)
+        StudentPerformance.objects.bulk_update(list(existing.values()), FIELDS, batch_size=WRITE_BATCH)
+
+
+def rebuild(student_ids=None, using=None):
+    """Recompute summaries from ``StudentExam``, for ``student_ids`` or every student.
+
+    Students left without results lose their summary. Returns the number of
+    summaries written.
+    """
+    using = using or current_db()
+    summaries = StudentPerformance.objects.using(using)
+    results = StudentExam.objects.using(using)
+    with transaction.atomic(using=using):
+        if student_ids is None:
+            summaries.all().delete()
+            return _rebuild_rows(summaries, results.all())
+        written = 0
+        for chunk in chunks(student_ids):
+            summaries.filter(student_id__in=chunk).delete()
+            written += _rebuild_rows(summaries, results.filter(student_id__in=chunk))
+        return written
+
+
+def _rebuild_rows(summaries, student_exams):
+    rows = (
+        student_exams.order_by('student_id', 'submitted_at', 'id')
+        .values_list('student_id', 'exam__subject', 'marks')
+        .iterator(chunk_size=2000)
+    )
+    written, batch, summary = 0, [], None
+    for student_id, subject, marks in rows:
+        if summary is None or summary.student_id != student_id:
+            summary = StudentPerformance(student_id=student_id, subjects={}, recent_marks=[])
+            batch.append(summary)
+        _add(summary, subject, marks)
+        if len(batch) > WRITE_BATCH:
+            # The last summary may still be growing; keep it for the next batch.
+            summaries.bulk_create(batch[:-1])
+            written += len(batch) - 1
+            batch = batch[-1:]
+    summaries.bulk_create(batch)
+    return written + len(batch)
+
+
+def summarize(summary):
+    """The ``my_summary`` payload for a ``StudentPerformance`` (or ``None``).
+
+    ``trend`` is the average of the latest marks minus the overall average:
+    positive when recent results are above the student's norm.
+    """
+    if summary is None or not summary.exams_taken:
+        return {
+            "exams_taken": 0, "average_marks": None, "best_subject": None,
+            "worst_subject": None, "trend": None, "recent_marks": [],
+        }
+    average = summary.total_marks / summary.exams_taken
+    # Best and worst by average marks, ties broken by subject name.
+    subjects = sorted(summary.subjects.items(), key=lambda item: (-item[1][1] / item[1][0], item[0]))
+    recent = summary.recent_marks
+    return {
+        "exams_taken": summary.exams_taken,
+        "average_marks": round(average, 2),
+        "best_subject": subjects[0][0],
+        "worst_subject": subjects[-1][0],
+        "trend": round(sum(recent) / len(recent) - average, 2),
+        "recent_marks": recent,
+    }
+
+
+def students_of_exam(sender, instance, using, **kwargs):
+    # Before an exam (and, by cascade, its results) is deleted, note whose
+    # summaries will need recomputing.
+    instance._result_students = list(
+        StudentExam.objects.using(using).filter(exam=instance).values_list('student_id', flat=True)
+    )
+
+
+def rebuild_after_exam_delete(sender, instance, using, **kwargs):
+    student_ids = getattr(instance, '_result_students', None)
+    if student_ids:
+        rebuild(student_ids, using)
+
+
+def rebuild_after_result_delete(sender, instance, using, origin=None, **kwargs):
+    # Only results deleted on their own, e.g. from the admin. Results deleted
+    # with their exam are rebuilt once by rebuild_after_exam_delete, and those
+    # deleted with their student take the summary with them.
+    if isinstance(origin, StudentExam) or getattr(origin, 'model', None) is StudentExam:
+        rebuild([instance.student_id], using)
+
+
+def subject_before_save(sender, instance, using, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding or (update_fields is not None and 'subject' not in update_fields):
+        return
+    instance._previous_subject = (
+        Exam.objects.using(using).filter(pk=instance.pk).values_list('subject', flat=True).first()
+    )
+
+
+def rebuild_after_subject_change(sender, instance, using, created=False, **kwargs):
+    previous = instance.__dict__.pop('_previous_subject', None)
+    if created or previous is None or previous == instance.subject:
+        return
+    student_ids = StudentExam.objects.using(using).filter(exam=instance).values_list('student_id', flat=True)
+    rebuild(list(student_ids), using)
@@ -1,5 +1,17 @@
 from rest_framework import permissions
+from rest_framework.exceptions import APIException
 from rest_framework.permissions import BasePermission
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+def jwt_user(request):
+    """The user of a valid bearer token on a plain Django request, else ``None``."""
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except APIException:
+        return None
+    return result[0] if result else None
+
 
 class IsTeacher(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -0,0 +1,107 @@
+"""Academic year rollover: promote every class, retire the leavers, reassign teachers.
+
+The whole school moves in a handful of set-based UPDATE statements, whatever
+the number of students.
+"""
+from django.db import transaction
+from django.db.models import Case, Count, F, Value, When
+
+from .dashboard import invalidate_school
+from .models import Student, Teacher, class_key
+from .tenancy import current_db
+from .versioning import bump
+
+
+def _numeric_successors(values):
+    return {value: str(int(value) + 1) for value in values if value.isdigit()}
+
+
+def _mapped(field, mapping, default=None):
+    return Case(*[When(**{field: old}, then=Value(new)) for old, new in mapping.items()],
+                default=F(default or field))
+
+
+def plan_rollover(final_class=None, promotions=None):
+    """Work out what a rollover would do from the currently enrolled classes.
+
+    Numeric classes move up by one unless ``promotions`` maps them explicitly;
+    students of ``final_class`` (by default the highest numeric class) leave.
+    Returns ``(class_map, final_class, counts)`` with counts per current class.
+    """
+    counts = dict(
+        Student.objects.filter(status=Student.ENROLLED).values_list('class_name')
+        .annotate(students=Count('id')).order_by('class_name')
+    )
+    if final_class is None:
+        numeric = [int(name) for name in counts if name.isdigit()]
+        final_class = str(max(numeric)) if numeric else None
+
+    class_map = _numeric_successors(counts)
+    class_map.update(promotions or {})
+    class_map.pop(final_class, None)
+    return class_map, final_class, counts
+
+
+def rollover(final_class=None, promotions=None, leaver_status=Student.LEFT, teacher_by_class=None, dry_run=False):
+    """Promote the school; with ``dry_run`` only report what would change.
+
+    ``teacher_by_class`` maps a class name *after* promotion to the teacher
+    its students are assigned to. Grades move up alongside classes, numeric
+    grades by one. Everything runs in one transaction.
+    """
+    class_map, final_class, counts = plan_rollover(final_class, promotions)
+    teacher_by_class = teacher_by_class or {}
+
+    classes = []
+    for name, students in counts.items():
+        if name == final_class:
+            action, to = 'leave', None
+        elif name in class_map:
+            action, to = 'promote', class_map[name]
+        else:
+            action, to = 'unchanged', name
+        classes.append({
+            "class_name": name,
+            "students": students,
+            "action": action,
+            "to": to,
+            "teacher": teacher_by_class.get(to),
+        })
+
+    summary = {
+        "dry_run": dry_run,
+        "final_class": final_class,
+        "classes": classes,
+        "left": counts.get(final_class, 0),
+        "promoted": sum(counts.get(name, 0) for name in class_map),
+        "reassigned": sum(c['students'] for c in classes if c['teacher'] is not None and c['action'] != 'leave'),
+    }
+    if dry_run:
+        return summary
+
+    active = Student.objects.filter(status=Student.ENROLLED)
+    with transaction.atomic(using=current_db()):
+        if final_class is not None:
+            summary['left'] = active.filter(class_name=final_class).update(status=leaver_status)
+        if class_map:
+            grades = set(active.filter(class_name__in=class_map).values_list('grade', flat=True).distinct())
+            summary['promoted'] = active.filter(class_name__in=class_map).update(
+                class_name=_mapped('class_name', class_map),
+                class_key=_mapped('class_name', {old: class_key(new) for old, new in class_map.items()}, 'class_key'),
+                grade=_mapped('grade', _numeric_successors(grades)),
+            )
+        if teacher_by_class:
+            summary['reassigned'] = active.filter(class_name__in=teacher_by_class).update(
+                assigned_teacher=Case(*[
+                    When(class_name=name, then=Value(teacher_id))
+                    for name, teacher_id in teacher_by_class.items()
+                ]),
+            )
+        bump(['student'])
+    invalidate_school()
+    return summary
+
+
+def unknown_teachers(teacher_ids):
+    found = set(Teacher.objects.filter(pk__in=teacher_ids).values_list('pk', flat=True))
+    return sorted(set(teacher_ids) - found)
@@ -0,0 +1,45 @@
+from .tenancy import DIRECTORY_DB, current_db
+
+
+# Per-school models; everything else in core (the user directory) stays on DIRECTORY_DB.
+SHARDED_MODELS = {
+    'teacher', 'student', 'exam', 'examtarget', 'question', 'studentexam', 'studentanswer',
+    'studentperformance', 'resourceversion',
+}
+
+
+class SchoolShardRouter:
+    """Route each school's rows to its own database.
+
+    The shard is taken from the authenticated user's ``school`` (see
+    ``core.tenancy``); objects already loaded from a shard stay on it.
+
+    There is deliberately no ``allow_migrate``: every database gets the full
+    schema. Shards need ``core_user`` for their user replicas and the auth
+    tables it references, and identical schemas keep one migration history
+    for all of them; the directory-only tables simply stay empty on shards.
+    """
+
+    def _route(self, model, **hints):
+        if model._meta.app_label != 'core':
+            return None
+        if model._meta.model_name not in SHARDED_MODELS:
+            return DIRECTORY_DB
+
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return current_db()
+
+    db_for_read = _route
+    db_for_write = _route
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Shard rows point at directory users (replicated onto the shard).
+        sharded = (
+            obj1._meta.model_name in SHARDED_MODELS,
+            obj2._meta.model_name in SHARDED_MODELS,
+        )
+        if sharded[0] != sharded[1]:
+            return True
+        return None
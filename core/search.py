@@ -0,0 +1,217 @@
+"""Full-text and prefix search over students and teachers.
+
+On SQLite the index is an FTS5 table, ``core_person_search``, created by
+migration 0007 on every database and holding one row per student and
+teacher stored there. Rows are kept in sync by the signal receivers below;
+bulk paths call ``index_students``/``index_teachers``/``unindex`` themselves.
+Other backends, or SQLite builds without FTS5, fall back to ``istartswith``
+lookups.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+from .models import Teacher, Student
+from .tenancy import DIRECTORY_DB, current_db, school_db
+from .utils import chunks
+
+
+SEARCH_TABLE = 'core_person_search'
+
+STUDENT, TEACHER = 'student', 'teacher'
+KINDS = (STUDENT, TEACHER)
+
+# rowid = profile id * 2 + kind bit, so students and teachers share the table.
+_KIND_BIT = {STUDENT: 0, TEACHER: 1}
+
+# bm25 weights, by column: kind, obj_id (unindexed), name, username,
+# roll_number, employee_id, subject.
+_WEIGHTS = '0, 0, 10.0, 5.0, 5.0, 5.0, 1.0'
+
+_INDEX_SQL = {
+    STUDENT: f"""
+        INSERT INTO {SEARCH_TABLE} (rowid, kind, obj_id, name, username, roll_number, employee_id, subject)
+        SELECT p.id * 2, 'student', p.id, u.first_name || ' ' || u.last_name, u.username, p.roll_number, '', ''
+        FROM core_student p JOIN core_user u ON u.id = p.user_id
+    """,
+    TEACHER: f"""
+        INSERT INTO {SEARCH_TABLE} (rowid, kind, obj_id, name, username, roll_number, employee_id, subject)
+        SELECT p.id * 2 + 1, 'teacher', p.id, u.first_name || ' ' || u.last_name, u.username, '',
+               p.employee_id, p.subject_specialization
+        FROM core_teacher p JOIN core_user u ON u.id = p.user_id
+    """,
+}
+
+_available = {}
+
+
+def available(using):
+    """Whether ``using`` has the FTS5 index (checked once per alias)."""
+    if using not in _available:
+        connection = connections[using]
+        _available[using] = (
+            connection.vendor == 'sqlite' and SEARCH_TABLE in connection.introspection.table_names()
+        )
+    return _available[using]
+
+
+def _execute(using, sql, params=()):
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def unindex(kind, ids, using):
+    if not available(using):
+        return
+    bit = _KIND_BIT[kind]
+    for chunk in chunks(ids):
+        placeholders = ', '.join(['%s'] * len(chunk))
+        _execute(using, f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})",
+                 [pk * 2 + bit for pk in chunk])
+
+
+def _index(kind, ids, using):
+    if not available(using):
+        return
+    unindex(kind, ids, using)
+    for chunk in chunks(ids):
+        placeholders = ', '.join(['%s'] * len(chunk))
+        _execute(using, f"{_INDEX_SQL[kind]} WHERE p.id IN ({placeholders})", chunk)
+
+
+def index_students(ids, using):
+    _index(STUDENT, ids, using)
+
+
+def index_teachers(ids, using):
+    _index(TEACHER, ids, using)
+
+
+def rebuild(using):
+    """Re-create every row of the index on ``using`` from the profile tables."""
+    if not available(using):
+        return 0
+    _execute(using, f"DELETE FROM {SEARCH_TABLE}")
+    for kind in KINDS:
+        _execute(using, _INDEX_SQL[kind])
+    _execute(using, f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')")
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {SEARCH_TABLE}")
+        return cursor.fetchone()[0]
+
+
+def match_expression(query):
+    """Turn user input into an FTS5 expression: every term must match as a prefix.
+
+    Each whitespace-separated term becomes a quoted phrase of its tokens with
+    a prefix marker, so ``seed-R00012`` finds ``seed-R0001234`` and no input
+    can inject FTS5 syntax.
+    """
+    terms = []
+    for term in query.split():
+        tokens = re.findall(r'\w+', term.lower())
+        if tokens:
+            terms.append('"%s"*' % ' '.join(tokens))
+    return ' '.join(terms)
+
+
+def visible(kind, user):
+    """Profiles of ``kind`` that ``user`` may list, as in the viewsets' ``get_queryset``.
+
+    Returns ``None`` when none are.
+    """
+    model = Student if kind == STUDENT else Teacher
+    if user.role == 'admin':
+        return model.objects.all()
+    if kind == STUDENT and user.role == 'teacher':
+        return Student.objects.filter(assigned_teacher__user=user)
+    if kind == user.role:
+        return model.objects.filter(user=user)
+    return None
+
+
+def search(query, user, kinds=KINDS, limit=20, using=None):
+    """Return up to ``limit`` ``(kind, id, score)`` matches visible to ``user``, best first.
+
+    Higher scores are better.
+    """
+    using = using or current_db()
+    expression = match_expression(query)
+    if not expression:
+        return []
+    if not available(using):
+        return _fallback_search(query, user, kinds, limit)
+
+    parts, params = [], []
+    for kind in kinds:
+        scope = visible(kind, user)
+        if scope is None:
+            continue
+        condition, scope_params = '', ()
+        if user.role != 'admin':
+            scope_sql, scope_params = scope.values('pk').query.get_compiler(using).as_sql()
+            condition = f"AND obj_id IN ({scope_sql})"
+        parts.append(
+            f"SELECT kind, obj_id, bm25({SEARCH_TABLE}, {_WEIGHTS}) AS score FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH %s AND kind = %s {condition}"
+        )
+        params += [expression, kind, *scope_params]
+    if not parts:
+        return []
+
+    sql = f"SELECT kind, obj_id, score FROM ({' UNION ALL '.join(parts)}) ORDER BY score LIMIT %s"
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, params + [limit])
+        # bm25() is lower-is-better; flip it so clients can sort descending.
+        return [(kind, obj_id, round(-score, 4)) for kind, obj_id, score in cursor.fetchall()]
+
+
+_FALLBACK_FIELDS = {
+    STUDENT: ('user__first_name', 'user__last_name', 'user__username', 'roll_number'),
+    TEACHER: ('user__first_name', 'user__last_name', 'user__username', 'employee_id', 'subject_specialization'),
+}
+
+
+def _fallback_search(query, user, kinds, limit):
+    results = []
+    for kind in kinds:
+        queryset = visible(kind, user)
+        if queryset is None:
+            continue
+        for term in query.split():
+            condition = Q()
+            for field in _FALLBACK_FIELDS[kind]:
+                condition |= Q(**{f'{field}__istartswith': term})
+            queryset = queryset.filter(condition)
+        results += [(kind, pk, 0.0) for pk in queryset.order_by('pk').values_list('pk', flat=True)[:limit]]
+    return results[:limit]
+
+
+def index_profile_on_save(sender, instance, using, raw=False, **kwargs):
+    if raw:
+        return
+    _index(STUDENT if sender is Student else TEACHER, [instance.pk], using)
+
+
+def unindex_profile_on_delete(sender, instance, using, **kwargs):
+    unindex(STUDENT if sender is Student else TEACHER, [instance.pk], using)
+
+
+NAME_FIELDS = {'first_name', 'last_name', 'username'}
+
+
+def reindex_user_on_save(sender, instance, using, raw=False, created=False, update_fields=None, **kwargs):
+    # Renames change the indexed name columns of the user's profile; logins
+    # (update_fields={'last_login'}) and new users (no profile yet) do not.
+    if raw or created or using != DIRECTORY_DB:
+        return
+    if update_fields is not None and not NAME_FIELDS & set(update_fields):
+        return
+    alias = school_db(instance.school)
+    if not available(alias):
+        return
+    for kind, model in ((STUDENT, Student), (TEACHER, Teacher)):
+        ids = list(model.objects.using(alias).filter(user_id=instance.pk).values_list('pk', flat=True))
+        if ids:
+            _index(kind, ids, alias)
@@ -1,7 +1,15 @@
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 from django.contrib.auth.hashers import make_password
 from core.models import Exam, Question, Teacher
 from .models import User, Teacher, Student, StudentExam, StudentAnswer
+from .tenancy import current_school
+from .rollover import unknown_teachers
+from .performance import record
+from .dashboard import invalidate_teachers
+from .events import submissions_added
+from .versioning import bump
+from .metrics import TimedSerializerMixin
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 
@@ -52,7 +60,7 @@ class UserSerializer(serializers.ModelSerializer):
         return instance
 
 
-class TeacherSerializer(serializers.ModelSerializer):
+class TeacherSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = UserSerializer()
 
     class Meta:
@@ -67,7 +75,7 @@ class TeacherSerializer(serializers.ModelSerializer):
         user_data['role'] = 'teacher'
         user_serializer = UserSerializer(data=user_data)
         user_serializer.is_valid(raise_exception=True)
-        user = user_serializer.save()
+        user = user_serializer.save(school=current_school())
         teacher = Teacher.objects.create(user=user, **validated_data)
         return teacher
 
@@ -88,7 +96,7 @@ class TeacherSerializer(serializers.ModelSerializer):
         return instance
 
 
-class StudentSerializer(serializers.ModelSerializer):
+class StudentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = UserSerializer()
     assigned_teacher = serializers.PrimaryKeyRelatedField(
         queryset=Teacher.objects.all(),
@@ -116,7 +124,7 @@ class StudentSerializer(serializers.ModelSerializer):
         user_data['role'] = 'student'
         user_serializer = UserSerializer(data=user_data)
         user_serializer.is_valid(raise_exception=True)
-        user = user_serializer.save()
+        user = user_serializer.save(school=current_school())
         
        
         if request_user.role == 'teacher' and 'assigned_teacher' not in validated_data:
@@ -151,7 +159,70 @@ class StudentSerializer(serializers.ModelSerializer):
         return instance
 
 
-class TeacherSelfUpdateSerializer(serializers.ModelSerializer):
+class RosterStudentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """A student nested under its teacher, so without the teacher's id and name."""
+
+    user = UserSerializer(read_only=True)
+
+    class Meta:
+        model = Student
+        fields = [
+            'id', 'user', 'roll_number', 'phone_number', 'grade',
+            'class_name', 'date_of_birth', 'admission_date', 'status'
+        ]
+
+
+class TeacherRosterSerializer(TeacherSerializer):
+    """``TeacherSerializer`` plus the extras listed in ``context['include']``.
+
+    ``students`` reads the ``roster`` prefetch and ``student_count`` an
+    annotation; see ``TeacherIncludeMixin``.
+    """
+
+    INCLUDES = ('students', 'student_count')
+
+    students = RosterStudentSerializer(many=True, read_only=True, source='roster')
+    student_count = serializers.IntegerField(read_only=True)
+
+    class Meta(TeacherSerializer.Meta):
+        fields = TeacherSerializer.Meta.fields + ['students', 'student_count']
+
+    def get_fields(self):
+        fields = super().get_fields()
+        include = self.context.get('include', ())
+        for name in self.INCLUDES:
+            if name not in include:
+                fields.pop(name)
+        return fields
+
+
+def _without_unique_validators(fields):
+    for field in fields.values():
+        field.validators = [v for v in field.validators if not isinstance(v, UniqueValidator)]
+    return fields
+
+
+class BulkUserSerializer(UserSerializer):
+    """``UserSerializer`` minus the per-item uniqueness queries; see ``core.bulk``."""
+
+    def get_fields(self):
+        return _without_unique_validators(super().get_fields())
+
+
+class BulkStudentSerializer(StudentSerializer):
+    """Validates one item of a bulk create without touching the database.
+
+    Uniqueness and the assigned teacher are checked for the whole batch by
+    ``core.bulk.create_students``.
+    """
+    user = BulkUserSerializer()
+    assigned_teacher = serializers.IntegerField(required=False, allow_null=True)
+
+    def get_fields(self):
+        return _without_unique_validators(super().get_fields())
+
+
+class TeacherSelfUpdateSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     first_name = serializers.CharField(source='user.first_name')
     last_name = serializers.CharField(source='user.last_name')
     email = serializers.EmailField(source='user.email')
@@ -177,7 +248,7 @@ class TeacherSelfUpdateSerializer(serializers.ModelSerializer):
         return instance
 
 
-class QuestionSerializer(serializers.ModelSerializer):
+class QuestionSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Question
         fields = [
@@ -201,7 +272,14 @@ class TeacherMiniSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'employee_id']
 
 
-class ExamSerializer(serializers.ModelSerializer):
+class ExtraTargetsField(serializers.ListField):
+    """Written as class names; read back as the keys of the exam's ExamTarget rows."""
+
+    def get_attribute(self, instance):
+        return instance.extra_target_keys()
+
+
+class ExamSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     teacher = TeacherMiniSerializer(read_only=True)
     teacher_id = serializers.PrimaryKeyRelatedField(
         queryset=Teacher.objects.all(),
@@ -211,16 +289,18 @@ class ExamSerializer(serializers.ModelSerializer):
     )
     questions = QuestionSerializer(many=True, write_only=True, required=True)
     questions_count = serializers.SerializerMethodField()
+    also_target_classes = ExtraTargetsField(child=serializers.CharField(max_length=50), required=False)
 
     class Meta:
         model = Exam
         fields = [
             'id', 'title', 'subject', 'target_class', 'teacher', 'teacher_id', 
-            'questions', 'questions_count', 'created_at'
+            'questions', 'questions_count', 'created_at', 'also_target_classes'
         ]
 
     def get_questions_count(self, obj):
-        return obj.questions.count()
+        count = getattr(obj, 'questions_count', None)
+        return count if count is not None else obj.questions.count()
 
     def validate_questions(self, value):
         if len(value) != 5:
@@ -240,7 +320,11 @@ class ExamSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("Teacher profile not found.")
 
         validated_data['created_by'] = request_user
+        # Creating the exam writes a target row for every class it is set for.
         exam = Exam.objects.create(**validated_data)
+        if exam.also_target_classes:
+            # The extra rows land after the save signal's bump.
+            bump(['exam'])
 
        
         for q_data in questions_data:
@@ -250,11 +334,15 @@ class ExamSerializer(serializers.ModelSerializer):
 
     def update(self, instance, validated_data):
         questions_data = validated_data.pop('questions', None)
+        also_target_classes = validated_data.pop('also_target_classes', None)
         
        
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
+        if also_target_classes is not None:
+            instance.set_targets(also_target_classes)
+            bump(['exam'])
 
       
         if questions_data is not None:
@@ -280,7 +368,7 @@ class StudentAnswerSerializer(serializers.ModelSerializer):
         fields = ['id', 'question', 'question_text', 'answer', 'is_correct']
 
 
-class StudentExamSerializer(serializers.ModelSerializer):
+class StudentExamSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     exam_title = serializers.CharField(source='exam.title', read_only=True)
     exam_subject = serializers.CharField(source='exam.subject', read_only=True)
     student_name = serializers.CharField(source='student.user.get_full_name', read_only=True)
@@ -296,7 +384,8 @@ class StudentExamSerializer(serializers.ModelSerializer):
         ]
 
     def get_total_questions(self, obj):
-        return obj.exam.questions.count()
+        count = getattr(obj, 'total_questions', None)
+        return count if count is not None else obj.exam.questions.count()
 
 
 class ExamSubmissionSerializer(serializers.Serializer):
@@ -351,4 +440,37 @@ class ExamSubmissionSerializer(serializers.Serializer):
 
         student_exam.marks = score
         student_exam.save()
-        return student_exam
\ No newline at end of file
+        record([(student.pk, exam.subject, score)])
+        invalidate_teachers([exam.teacher_id])
+        submissions_added(exam.pk)
+        return student_exam
+
+class RolloverSerializer(serializers.Serializer):
+    final_class = serializers.CharField(required=False)
+    promotions = serializers.DictField(child=serializers.CharField(), required=False)
+    leaver_status = serializers.IntegerField(default=Student.LEFT)
+    teacher_by_class = serializers.DictField(child=serializers.IntegerField(), required=False)
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate_leaver_status(self, value):
+        if value == Student.ENROLLED:
+            raise serializers.ValidationError(f"Leavers cannot keep the enrolled status {Student.ENROLLED}.")
+        return value
+
+    def validate_teacher_by_class(self, value):
+        missing = unknown_teachers(value.values())
+        if missing:
+            raise serializers.ValidationError(f"Unknown teacher id(s): {', '.join(map(str, missing))}.")
+        return value
+
+
+class ReassignSerializer(serializers.Serializer):
+    student_ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    unassigned = serializers.BooleanField(default=False)
+    teacher_ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    subject = serializers.CharField(required=False)
+
+    def validate(self, attrs):
+        if ('student_ids' in attrs) == attrs['unassigned']:
+            raise serializers.ValidationError("Send either 'student_ids' or 'unassigned': true.")
+        return attrs
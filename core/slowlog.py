@@ -0,0 +1,69 @@
+import json
+import logging
+from datetime import datetime, timezone
+from time import perf_counter
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from .tenancy import current_request
+
+
+# Routed to a RotatingFileHandler (see LOGGING['loggers']['core.slowqueries']).
+slow_logger = logging.getLogger('core.slowqueries')
+
+EXPLAIN_PREFIX = {
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+    'postgresql': 'EXPLAIN ',
+    'mysql': 'EXPLAIN ',
+}
+
+
+def _explain(connection, sql, params):
+    prefix = EXPLAIN_PREFIX.get(connection.vendor)
+    if prefix is None or not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return []
+    try:
+        with connection.cursor() as cursor:
+            # The backend cursor bypasses execute wrappers, so the EXPLAIN is
+            # neither timed nor logged itself.
+            cursor.cursor.execute(prefix + sql, params)
+            return [' '.join(str(col) for col in row) for row in cursor.cursor.fetchall()]
+    except DatabaseError as e:
+        return [f"EXPLAIN failed: {e}"]
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (perf_counter() - start) * 1000
+        threshold = settings.SLOW_QUERY_THRESHOLD_MS
+        if threshold is not None and duration_ms >= threshold:
+            record_slow_query(context['connection'], sql, params, many, duration_ms)
+
+
+def _route():
+    # From the request TenantMiddleware binds, so entries are grouped by
+    # route whether or not PerformanceMiddleware is enabled.
+    match = getattr(current_request(), 'resolver_match', None)
+    return (match.url_name or match.view_name) if match else ''
+
+
+def record_slow_query(connection, sql, params, many, duration_ms):
+    record = {
+        'at': datetime.now(timezone.utc).isoformat(),
+        'db': connection.alias,
+        'view': _route() or '-',
+        'duration_ms': round(duration_ms, 3),
+        'sql': sql,
+        'params': None if many else params,
+        'plan': [] if many else _explain(connection, sql, params),
+    }
+    slow_logger.warning(json.dumps(record, default=str))
+
+
+def install_slow_query_log(sender, connection, **kwargs):
+    if slow_query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_wrapper)
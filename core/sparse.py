@@ -0,0 +1,124 @@
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+def parse_field_list(value):
+    """Parse ``"id,user.username,roll_number"`` into ``{'id': None, 'user': {'username': None}, ...}``.
+
+    ``None`` selects a field with everything below it.
+    """
+    tree = {}
+    for item in value.split(','):
+        parts = [part for part in item.strip().split('.') if part]
+        if not parts:
+            continue
+        node = tree
+        for part in parts[:-1]:
+            if part in node and node[part] is None:
+                break
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+def nested_serializer(field):
+    """The serializer behind a nested field (a ``many=True`` list's child), else ``None``."""
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    return field if isinstance(field, serializers.Serializer) else None
+
+
+def readable_tree(fields):
+    tree = {}
+    for name, field in fields.items():
+        if field.write_only:
+            continue
+        nested = nested_serializer(field)
+        tree[name] = readable_tree(nested.fields) if nested is not None else None
+    return tree
+
+
+def unknown_paths(requested, available, prefix=''):
+    unknown = []
+    for name, sub in requested.items():
+        if name not in available:
+            unknown.append(f"{prefix}{name}")
+        elif sub and available[name] is not None:
+            unknown.extend(unknown_paths(sub, available[name], f"{prefix}{name}."))
+        elif sub:
+            unknown.append(f"{prefix}{name}.{next(iter(sub))}")
+    return unknown
+
+
+def keep(name, include, exclude):
+    """Return ``(kept, sub_include, sub_exclude)`` for one field."""
+    if include is not None and name not in include:
+        return False, None, None
+    if exclude is not None and name in exclude and exclude[name] is None:
+        return False, None, None
+    sub_include = include.get(name) if include is not None else None
+    sub_exclude = exclude.get(name) if exclude is not None else None
+    return True, sub_include, sub_exclude
+
+
+def prune_fields(fields, include, exclude):
+    for name in list(fields):
+        kept, sub_include, sub_exclude = keep(name, include, exclude)
+        if not kept:
+            fields.pop(name)
+        elif (sub_include or sub_exclude) and nested_serializer(fields[name]) is not None:
+            prune_fields(nested_serializer(fields[name]).fields, sub_include, sub_exclude)
+
+
+class SparseFieldsMixin:
+    """Support ``?fields=`` and ``?exclude=`` on read requests.
+
+    Both take comma-separated field names, with dots reaching into nested
+    objects (``fields=id,user.username,class_name``). Output is trimmed and,
+    when the view has a ``fast_serializer_class``, the queryset only loads the
+    columns and joins the remaining fields need.
+    """
+
+    def sparse_fields(self):
+        """Return ``(include, exclude)`` trees, or ``None`` when not requested."""
+        request = self.request
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return None
+        if hasattr(request, '_sparse_fields'):
+            return request._sparse_fields
+
+        params = request.query_params
+        include = parse_field_list(params['fields']) if params.get('fields') else None
+        exclude = parse_field_list(params['exclude']) if params.get('exclude') else None
+        selection = None
+        if include is not None or exclude is not None:
+            available = readable_tree(self.get_serializer_class()(context=self.get_serializer_context()).fields)
+            for param, tree in (('fields', include), ('exclude', exclude)):
+                unknown = unknown_paths(tree or {}, available)
+                if unknown:
+                    raise ValidationError({param: f"Unknown field(s): {', '.join(unknown)}."})
+            selection = (include, exclude)
+
+        request._sparse_fields = selection
+        return selection
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        selection = self.sparse_fields()
+        if selection is not None:
+            target = serializer.child if isinstance(serializer, serializers.ListSerializer) else serializer
+            prune_fields(target.fields, *selection)
+        return serializer
+
+    def narrowing_serializer_class(self):
+        """The fast serializer whose column list trims the queryset, if any."""
+        return getattr(self, 'fast_serializer_class', None)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        selection = self.sparse_fields()
+        fast_class = self.narrowing_serializer_class()
+        if selection is not None and fast_class is not None:
+            queryset = fast_class(*selection).narrow(queryset)
+        return queryset
@@ -0,0 +1,143 @@
+import copy
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+# Users (the shared directory) always live here; school data lives on the shards.
+DIRECTORY_DB = 'default'
+
+_current_school = ContextVar('current_school', default=None)
+_current_request = ContextVar('current_request', default=None)
+_replicas_handled = ContextVar('replicas_handled', default=False)
+
+# Users re-read and rewritten per statement when refreshing shard replicas.
+REPLICA_BATCH = 500
+
+
+def school_db(school):
+    """Return the database alias holding the data of ``school``."""
+    if not school:
+        return DIRECTORY_DB
+    try:
+        return settings.SCHOOL_SHARDS[school]
+    except KeyError:
+        raise ImproperlyConfigured(f"No database shard configured for school '{school}'.")
+
+
+def current_school():
+    school = _current_school.get()
+    if school is not None:
+        return school
+
+    request = _current_request.get()
+    user = getattr(request, 'user', None) if request is not None else None
+    if user is not None and user.is_authenticated:
+        return user.school
+    return ''
+
+
+def current_db():
+    return school_db(current_school())
+
+
+def current_request():
+    """The request being served on this context (see ``TenantMiddleware``), or ``None``."""
+    return _current_request.get()
+
+
+@contextmanager
+def use_school(school):
+    """Route school data to ``school``'s shard, e.g. in commands and tests."""
+    token = _current_school.set(school)
+    try:
+        yield
+    finally:
+        _current_school.reset(token)
+
+
+@contextmanager
+def bind_request(request):
+    # The user is resolved lazily: DRF authenticates inside the view and
+    # writes the result back onto the underlying HttpRequest.
+    token = _current_request.set(request)
+    try:
+        yield
+    finally:
+        _current_request.reset(token)
+
+
+def replicate_users(users):
+    """Copy directory users onto their school's shard.
+
+    Shard tables join against ``core_user`` (``select_related('student__user')``
+    and the foreign keys), so every shard keeps a read replica of its own users.
+    ``save()`` does this through signals; bulk paths call it explicitly.
+    """
+    by_alias = {}
+    for user in users:
+        alias = school_db(user.school)
+        if alias != DIRECTORY_DB:
+            by_alias.setdefault(alias, []).append(copy.copy(user))
+
+    from .models import User
+    for alias, replicas in by_alias.items():
+        User.objects.using(alias).filter(pk__in=[u.pk for u in replicas]).delete()
+        User.objects.using(alias).bulk_create(replicas)
+
+
+def refresh_user_replicas(users):
+    """Overwrite the shard copies of existing ``users`` with their directory values.
+
+    ``QuerySet.update()`` and ``bulk_update()`` send no ``post_save``, so the
+    user queryset calls this after them (see ``core.models.UserQuerySet``).
+    Unlike ``replicate_users`` it updates in place: deleting a replica would
+    cascade to the profile rows that point at it. Returns the databases whose
+    payloads show these users, the directory included for users without a
+    school.
+    """
+    by_alias = {}
+    for user in users:
+        by_alias.setdefault(school_db(user.school), []).append(user)
+
+    from .models import User
+    fields = [field.name for field in User._meta.concrete_fields if not field.primary_key]
+    for alias, replicas in by_alias.items():
+        if alias != DIRECTORY_DB:
+            User.objects.using(alias).bulk_update(replicas, fields, batch_size=REPLICA_BATCH)
+    return set(by_alias)
+
+
+@contextmanager
+def replicas_handled():
+    """Skip the per-user replica signals; the caller syncs the shards in bulk."""
+    token = _replicas_handled.set(True)
+    try:
+        yield
+    finally:
+        _replicas_handled.reset(token)
+
+
+def handling_replicas():
+    """Whether the caller of a ``replicas_handled`` block is doing the shard bookkeeping."""
+    return _replicas_handled.get()
+
+
+def replicate_user_on_save(sender, instance, using, raw=False, **kwargs):
+    if raw or using != DIRECTORY_DB or not instance.school:
+        return
+    alias = school_db(instance.school)
+    if alias == DIRECTORY_DB:
+        return
+    instance.save_base(using=alias, raw=True)
+    instance._state.db = DIRECTORY_DB
+
+
+def delete_user_replica(sender, instance, using, **kwargs):
+    if using != DIRECTORY_DB or not instance.school or handling_replicas():
+        return
+    alias = school_db(instance.school)
+    if alias != DIRECTORY_DB:
+        sender.objects.using(alias).filter(pk=instance.pk).delete()
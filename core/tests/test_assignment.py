@@ -0,0 +1,78 @@
+from django.db import connections
+from django.test import TestCase, SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.assignment import balance
+from core.models import User, Teacher, Student
+from datetime import date
+
+
+class BalanceTests(SimpleTestCase):
+    def test_fills_least_loaded_first(self):
+        assignments = balance(range(6), {1: 3, 2: 0, 3: 1})
+        self.assertEqual(assignments, {0: 2, 1: 2, 2: 3, 3: 2, 4: 3, 5: 1})
+
+
+class ReassignTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            user=User.objects.create_user(username='admin', password='adminpass', role='admin'))
+        self.teachers = [
+            Teacher.objects.create(
+                user=User.objects.create_user(username=f'teacher{n}', password='x', role='teacher'),
+                employee_id=f"EMP{n}", phone_number="1", subject_specialization=subject,
+                date_of_joining=date.today())
+            for n, subject in enumerate(['Math', 'Math', 'Science'])
+        ]
+        for n in range(12):
+            Student.objects.create(
+                user=User.objects.create_user(username=f'student{n}', password='x', role='student'),
+                roll_number=f'R{n}', phone_number='1', grade='5', class_name='5',
+                date_of_birth=date(2015, 1, 1), admission_date=date.today(),
+                assigned_teacher=self.teachers[0] if n < 3 else None)
+
+    def load(self, teacher):
+        return Student.objects.filter(assigned_teacher=teacher).count()
+
+    def test_unassigned_students_are_balanced_in_one_update(self):
+        with CaptureQueriesContext(connections['default']) as queries:
+            response = self.client.post(reverse('student-reassign'), {'unassigned': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['reassigned'], 9)
+        self.assertEqual([self.load(t) for t in self.teachers], [4, 4, 4])
+        self.assertEqual(sum('UPDATE "core_student"' in q['sql'] for q in queries), 1)
+
+    def test_subject_filter(self):
+        response = self.client.post(reverse('student-reassign'), {'unassigned': True, 'subject': 'math'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([self.load(t) for t in self.teachers], [6, 6, 0])
+
+    def test_no_matching_teachers(self):
+        response = self.client.post(reverse('student-reassign'), {'unassigned': True, 'subject': 'Art'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Student.objects.filter(assigned_teacher__isnull=True).count(), 9)
+
+    def test_students_who_left_are_neither_moved_nor_counted(self):
+        Student.objects.filter(roll_number__in=['R0', 'R1', 'R3']).update(status=1)
+        response = self.client.post(reverse('student-reassign'), {'unassigned': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['reassigned'], 8)
+        # teacher0 keeps one enrolled student, so takes two of the eight.
+        self.assertEqual([row['load'] for row in response.data['teachers']], [3, 3, 3])
+        self.assertIsNone(Student.objects.get(roll_number='R3').assigned_teacher)
+
+    def test_unknown_student_ids_are_reported(self):
+        student = Student.objects.get(roll_number='R5')
+        response = self.client.post(reverse('student-reassign'), {
+            'student_ids': [student.pk, 9998, 9999], 'teacher_ids': [self.teachers[1].pk],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response.data['reassigned'], 1)
+        self.assertEqual(response.data['missing'], [9998, 9999])
+        self.assertEqual(Student.objects.get(pk=student.pk).assigned_teacher, self.teachers[1])
+
+        response = self.client.post(reverse('student-reassign'), {'student_ids': [9999]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,89 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.batch import groups
+from core.models import User, Teacher, Student
+from datetime import date
+
+
+class GroupTests(SimpleTestCase):
+    def test_writes_split_the_reads_around_them(self):
+        self.assertEqual(groups(['GET', 'GET', 'PATCH', 'GET', 'HEAD', 'POST', 'DELETE']),
+                         [[0, 1], [2], [3, 4], [5], [6]])
+
+
+class BatchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', password='x', role='admin')
+        self.teacher = Teacher.objects.create(
+            user=User.objects.create_user(username='teacher1', password='x', role='teacher'),
+            employee_id="EMP001", phone_number="1", subject_specialization="Math", date_of_joining=date.today())
+        self.student = Student.objects.create(
+            user=User.objects.create_user(username='student1', password='x', role='student'),
+            roll_number='R1', phone_number='1', grade='5', class_name='5',
+            date_of_birth=date(2015, 1, 1), admission_date=date.today(), assigned_teacher=self.teacher)
+        Student.objects.create(
+            user=User.objects.create_user(username='student2', password='x', role='student'),
+            roll_number='R2', phone_number='1', grade='5', class_name='5',
+            date_of_birth=date(2015, 1, 1), admission_date=date.today())
+
+    def batch(self, user, requests):
+        self.client.force_authenticate(user=user)
+        return self.client.post(reverse('batch'), {"requests": requests}, format='json')
+
+    def test_runs_in_order_as_the_caller(self):
+        detail = reverse('student-detail', kwargs={'pk': self.student.pk})
+        response = self.batch(self.admin, [
+            {"path": detail},
+            {"method": "PATCH", "path": detail, "body": {"phone_number": "2"}},
+            {"path": detail},
+            {"path": reverse('exam-list') + '?page=1'},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        before, patch, after, exams = response.data['responses']
+        self.assertEqual(before['body']['phone_number'], '1')
+        self.assertEqual(patch['status'], status.HTTP_200_OK)
+        self.assertEqual(after['body']['phone_number'], '2')
+        self.assertNotEqual(before['headers']['ETag'], after['headers']['ETag'])
+        self.assertEqual(exams['body']['count'], 0)
+        self.assertEqual(before['headers']['Content-Type'], 'application/json')
+
+    def test_content_type_follows_the_rendered_format(self):
+        detail = reverse('student-detail', kwargs={'pk': self.student.pk})
+        self.client.force_authenticate(user=self.admin)
+        etag = self.client.get(detail, headers={'Accept': 'application/json'})['ETag']
+        response = self.batch(self.admin, [
+            {"path": detail, "headers": {"Accept": "text/html"}},
+            {"path": detail, "headers": {"If-None-Match": etag}},
+        ])
+        html, unchanged = response.data['responses']
+        self.assertTrue(html['headers']['Content-Type'].startswith('text/html'))
+        self.assertIn('R1', html['body'])
+        self.assertEqual(unchanged['status'], status.HTTP_304_NOT_MODIFIED)
+        self.assertNotIn('Content-Type', unchanged['headers'])
+
+    def test_sub_requests_keep_the_callers_permissions(self):
+        response = self.batch(self.teacher.user, [
+            {"path": reverse('teacher-students-list')},
+            {"path": reverse('teacher_dashboard')},
+            {"method": "DELETE", "path": reverse('student-detail', kwargs={'pk': self.student.pk})},
+        ])
+        students, dashboard, delete = response.data['responses']
+        self.assertEqual([s['roll_number'] for s in students['body']['results']], ['R1'])
+        self.assertEqual(dashboard['status'], status.HTTP_200_OK)
+        self.assertEqual(delete['status'], status.HTTP_403_FORBIDDEN)
+        self.assertTrue(Student.objects.filter(pk=self.student.pk).exists())
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_rejects_bad_batches(self):
+        for requests in ([], [{"path": "/students/"}] * 3, [{"path": "/nowhere"}],
+                         [{"path": reverse('batch')}], [{"path": reverse('metrics')}],
+                         [{"path": "/students/", "method": "TRACE"}]):
+            with self.subTest(requests=requests):
+                self.assertEqual(self.batch(self.admin, requests).status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(user=None)
+        response = self.client.post(reverse('batch'), {"requests": [{"path": "/students/"}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,116 @@
+from unittest import mock
+from django.conf import settings
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import User, Teacher, Student
+from datetime import date
+
+
+def student_item(n, **extra):
+    item = {
+        'user': {'username': f'bulk{n}', 'email': f'bulk{n}@example.com', 'password': 'studpass',
+                 'first_name': 'Bulk', 'last_name': str(n)},
+        'roll_number': f'B{n:03}', 'phone_number': '1', 'grade': '5', 'class_name': '5',
+        'date_of_birth': '2015-01-01', 'admission_date': '2024-06-01',
+    }
+    item.update(extra)
+    return item
+
+
+class BulkStudentCreateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.teacher_user = User.objects.create_user(username='teacher1', password='teachpass', role='teacher')
+        self.teacher = Teacher.objects.create(
+            user=self.teacher_user, employee_id="EMP001", phone_number="1",
+            subject_specialization="Math", date_of_joining=date.today())
+
+    def test_admin_creates_a_class_in_one_request(self):
+        self.client.force_authenticate(user=self.admin_user)
+        items = [student_item(n, assigned_teacher=self.teacher.pk) for n in range(40)]
+        with CaptureQueriesContext(connections['default']) as queries:
+            response = self.client.post(reverse('student-list'), items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 40)
+        self.assertEqual(Student.objects.filter(assigned_teacher=self.teacher).count(), 40)
+        self.assertLess(len(queries), 15)
+
+        result = response.data['results'][3]
+        self.assertEqual((result['index'], result['status']), (3, 'created'))
+        self.assertEqual(result['data']['roll_number'], 'B003')
+        self.assertEqual(result['data']['assigned_teacher_name'], self.teacher_user.get_full_name())
+        self.assertEqual(User.objects.get(username='bulk3').role, 'student')
+        self.assertTrue(User.objects.get(username='bulk39').check_password('studpass'))
+        # Same password, but every account has its own salt.
+        hashes = User.objects.filter(username__startswith='bulk').values_list('password', flat=True)
+        self.assertEqual(len(set(hashes)), 40)
+
+    @override_settings(BULK_PASSWORD_HASHER='md5', PASSWORD_HASHERS=[
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ])
+    def test_cheaper_hasher_is_opt_in_and_still_salted(self):
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post(reverse('student-list'), [student_item(n) for n in range(2)], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        first, second = User.objects.filter(username__startswith='bulk').order_by('username')
+        self.assertTrue(first.password.startswith('md5$'))
+        self.assertNotEqual(first.password, second.password)
+        # Logging in upgrades the hash to the default hasher.
+        self.assertTrue(first.check_password('studpass'))
+        first.refresh_from_db()
+        self.assertTrue(first.password.startswith('pbkdf2_sha256$'))
+
+    def test_invalid_items_are_reported_per_item(self):
+        Student.objects.create(
+            user=User.objects.create_user(username='taken', password='x', role='student'),
+            roll_number='B002', phone_number='1', grade='5', class_name='5',
+            date_of_birth=date(2015, 1, 1), admission_date=date.today())
+        self.client.force_authenticate(user=self.admin_user)
+        items = [
+            student_item(0),
+            student_item(1, user=dict(student_item(1)['user'], username='bulk0')),
+            student_item(2),
+            student_item(3, date_of_birth='not a date'),
+            student_item(4, assigned_teacher=9999),
+        ]
+        response = self.client.post(reverse('student-list'), items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response.data['created'], 1)
+        statuses = [result['status'] for result in response.data['results']]
+        self.assertEqual(statuses, ['created', 'error', 'error', 'error', 'error'])
+        errors = [result.get('errors') for result in response.data['results']]
+        self.assertIn('username', errors[1]['user'])
+        self.assertIn('roll_number', errors[2])
+        self.assertIn('date_of_birth', errors[3])
+        self.assertIn('assigned_teacher', errors[4])
+        self.assertFalse(User.objects.filter(username='bulk2').exists())
+
+    def test_teacher_bulk_create_assigns_self(self):
+        self.client.force_authenticate(user=self.teacher_user)
+        response = self.client.post(reverse('teacher-students-list'), [student_item(1), student_item(2)], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Student.objects.filter(assigned_teacher=self.teacher).count(), 2)
+
+    def test_student_cannot_bulk_create(self):
+        student_user = User.objects.create_user(username='stud', password='x', role='student')
+        self.client.force_authenticate(user=student_user)
+        response = self.client.post(reverse('student-list'), [student_item(1)], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_requests_over_the_cap_are_rejected_before_hashing(self):
+        self.client.force_authenticate(user=self.admin_user)
+        items = [student_item(n) for n in range(settings.BULK_CREATE_MAX_ITEMS + 1)]
+        with mock.patch('core.bulk.make_password') as make_password:
+            response = self.client.post(reverse('student-list'), items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        make_password.assert_not_called()
+        self.assertFalse(Student.objects.exists())
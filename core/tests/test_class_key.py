@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import User, Teacher, Student, Exam, ExamTarget, class_base, class_key
+from core.dashboard import compute
+from core.rollover import rollover
+from core.views import ExamViewSet
+from datetime import date
+
+
+class ClassKeyTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.teacher = Teacher.objects.create(
+            user=User.objects.create_user(username='teacher1', password='x', role='teacher'),
+            employee_id="EMP001", phone_number="1", subject_specialization="Math", date_of_joining=date.today())
+        self.student = Student.objects.create(
+            user=User.objects.create_user(username='student1', password='x', role='student'),
+            roll_number='R1', phone_number='1', grade='5', class_name='5A',
+            date_of_birth=date(2015, 1, 1), admission_date=date(2024, 6, 1))
+
+    def exam(self, title, target_class):
+        return Exam.objects.create(title=title, subject='Math', target_class=target_class,
+                                   teacher=self.teacher, created_by=self.teacher.user)
+
+    def visible_titles(self, user):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse('exam-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(exam['title'] for exam in response.data['results'])
+
+    def test_normalization(self):
+        for name in ('5', '05', 'Class 5', ' class-5 ', '5th'):
+            self.assertEqual(class_key(name), '5')
+        for name in ('5A', '5-a', 'Class 5 A'):
+            self.assertEqual(class_key(name), '5a')
+        self.assertEqual(class_key('K.G.'), 'kg')
+        self.assertEqual(class_key(''), '')
+        self.assertEqual(self.student.class_key, '5a')
+        self.assertEqual((class_base('5a'), class_base('5'), class_base('kg')), ('5', '5', 'kg'))
+
+    def test_student_sees_exams_for_their_section_and_whole_class(self):
+        self.exam('numbered', 'Class 5')
+        self.exam('plain', '5')
+        self.exam('section', '5-A')
+        self.exam('other section', '5B')
+        self.exam('other', '6')
+        self.assertEqual(self.visible_titles(self.student.user), ['numbered', 'plain', 'section'])
+
+        view = ExamViewSet(request=SimpleNamespace(user=self.student.user))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(len(list(view.get_queryset())), 3)
+        self.assertEqual(len(queries), 1)
+
+    def test_retargeting_moves_the_exam(self):
+        exam = self.exam('moving', '6')
+        exam.target_class = '5'
+        exam.save()
+        self.assertEqual(list(exam.targets.values_list('class_key', flat=True)), ['5'])
+        self.assertEqual(self.visible_titles(self.student.user), ['moving'])
+
+    def test_retargeting_keeps_keys_still_listed(self):
+        exam = self.exam('moving', '6')
+        exam.set_targets(['6', '7'])
+        exam.target_class = '5'
+        exam.save()
+        self.assertEqual(sorted(exam.targets.values_list('class_key', flat=True)), ['5', '6', '7'])
+
+    def test_additional_target_classes(self):
+        self.client.force_authenticate(user=self.teacher.user)
+        questions = [{'question_text': f'Q{n}', 'option1': 'a', 'option2': 'b', 'option3': 'c',
+                      'option4': 'd', 'correct_option': '1'} for n in range(5)]
+        response = self.client.post(reverse('exam-list'), {
+            'title': 'shared', 'subject': 'Math', 'target_class': '6',
+            'also_target_classes': ['Class 5'], 'questions': questions,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        exam = Exam.objects.get(title='shared')
+        self.assertEqual(sorted(exam.targets.values_list('class_key', flat=True)), ['5', '6'])
+        self.assertEqual(self.visible_titles(self.student.user), ['shared'])
+        self.assertEqual(response.data['data']['also_target_classes'], ['5'])
+
+        self.client.force_authenticate(user=User.objects.create_user(username='admin', password='x', role='admin'))
+        detail = reverse('exam-detail', kwargs={'pk': exam.pk})
+        response = self.client.patch(detail, {'also_target_classes': ['7', '5A']}, format='json')
+        self.assertEqual(response.data['also_target_classes'], ['5a', '7'])
+        self.assertEqual(self.client.get(detail).data['also_target_classes'], ['5a', '7'])
+        listed = self.client.get(reverse('exam-list')).data['results']
+        self.assertEqual([row['also_target_classes'] for row in listed], [['5a', '7']])
+
+        exam.set_targets([])
+        self.assertEqual(list(ExamTarget.objects.filter(exam=exam).values_list('class_key', flat=True)), ['6'])
+
+    def test_rollover_keeps_keys_in_step(self):
+        rollover(final_class='9', promotions={'5A': '6A'})
+        self.student.refresh_from_db()
+        self.assertEqual((self.student.class_name, self.student.class_key), ('6A', '6a'))
+
+    def test_dashboard_counts_each_student_once_per_exam(self):
+        self.student.assigned_teacher = self.teacher
+        self.student.save()
+        exam = self.exam('both', '5')
+        exam.set_targets(['5A', '5B'])
+        exams = compute(self.teacher)['exams']
+        self.assertEqual(exams[0]['eligible'], 1)
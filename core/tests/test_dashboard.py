@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.grading import grade_answer_sheets
+from core.models import User, Teacher, Student, Exam, Question
+from datetime import date
+
+
+class TeacherDashboardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.teacher = Teacher.objects.create(
+            user=User.objects.create_user(username='teacher1', password='x', role='teacher'),
+            employee_id="EMP001", phone_number="1", subject_specialization="Math", date_of_joining=date.today())
+        for n, class_name in enumerate(('5', '5', '6')):
+            Student.objects.create(
+                user=User.objects.create_user(username=f'student{n}', password='x', role='student'),
+                roll_number=f'R{n}', phone_number='1', grade=class_name, class_name=class_name,
+                date_of_birth=date(2015, 1, 1), admission_date=date.today(), assigned_teacher=self.teacher)
+        self.exam = Exam.objects.create(title='Maths', subject='Math', target_class='5',
+                                        teacher=self.teacher, created_by=self.teacher.user)
+        Question.objects.bulk_create([
+            Question(exam=self.exam, question_text=f'Q{i}', option1='a', option2='b', option3='c',
+                     option4='d', correct_option='1')
+            for i in range(5)
+        ])
+
+    def dashboard(self):
+        self.client.force_authenticate(user=self.teacher.user)
+        response = self.client.get(reverse('teacher_dashboard'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_figures(self):
+        grade_answer_sheets(self.exam, [(2, 'R0', ['1'] * 5), (3, 'R1', ['1', '2', '2', '2', '2'])])
+        data = self.dashboard()
+        self.assertEqual(data['students'], 3)
+        self.assertEqual(data['students_by_class'], [{'class_name': '5', 'students': 2},
+                                                     {'class_name': '6', 'students': 1}])
+        self.assertEqual((data['exams_created'], data['submissions'], data['average_marks']), (1, 2, 3.0))
+        exam = data['exams'][0]
+        self.assertEqual((exam['eligible'], exam['submissions'], exam['submission_rate']), (2, 2, 1.0))
+
+    def test_fixed_query_count_and_cache(self):
+        with self.assertNumQueries(5):
+            self.dashboard()
+        with self.assertNumQueries(1):
+            self.dashboard()
+
+    def test_submissions_and_roster_changes_invalidate(self):
+        self.assertEqual(self.dashboard()['submissions'], 0)
+        grade_answer_sheets(self.exam, [(2, 'R0', ['1'] * 5)])
+        self.assertEqual(self.dashboard()['submissions'], 1)
+
+        Student.objects.filter(roll_number='R2').get().delete()
+        self.assertEqual(self.dashboard()['students'], 2)
+
+        other = Student.objects.get(roll_number='R1')
+        other.class_name = '6'
+        other.save()
+        self.assertEqual(self.dashboard()['exams'][0]['eligible'], 1)
+
+    def test_students_cannot_see_dashboards(self):
+        self.client.force_authenticate(user=Student.objects.first().user)
+        self.assertEqual(self.client.get(reverse('teacher_dashboard')).status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,90 @@
+from django.contrib.admin.sites import site
+from django.db import connections
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.deletion import delete_students, delete_teachers
+from core.models import User, Teacher, Student, Exam, Question, StudentExam, StudentAnswer
+from datetime import date
+
+
+class BulkDeletionTests(TestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.teachers = [
+            Teacher.objects.create(
+                user=User.objects.create_user(username=f'teacher{n}', password='x', role='teacher'),
+                employee_id=f"EMP{n}", phone_number="1", subject_specialization="Math", date_of_joining=date.today())
+            for n in range(2)
+        ]
+        self.students = [
+            Student.objects.create(
+                user=User.objects.create_user(username=f'student{n}', password='x', role='student'),
+                roll_number=f'R{n}', phone_number='1', grade='5', class_name='5',
+                date_of_birth=date(2015, 1, 1), admission_date=date.today(), assigned_teacher=self.teachers[n % 2])
+            for n in range(6)
+        ]
+        for teacher in self.teachers:
+            exam = Exam.objects.create(title='Maths', subject='Math', target_class='5',
+                                       teacher=teacher, created_by=teacher.user)
+            question = Question.objects.create(exam=exam, question_text='Q', option1='a', option2='b',
+                                               option3='c', option4='d', correct_option='1')
+            for student in self.students:
+                result = StudentExam.objects.create(student=student, exam=exam, marks=1)
+                StudentAnswer.objects.create(student_exam=result, question=question, answer='1', is_correct=True)
+
+    def test_delete_students_removes_results_and_users(self):
+        counts = delete_students(Student.objects.filter(roll_number__in=['R0', 'R1', 'R2']), chunk_size=2)
+        self.assertEqual(counts, {'students': 3, 'student_exams': 6, 'student_answers': 6, 'users': 3})
+        self.assertEqual(Student.objects.count(), 3)
+        self.assertFalse(User.objects.filter(username__in=['student0', 'student1', 'student2']).exists())
+        self.assertEqual(StudentAnswer.objects.count(), 6)
+
+    def test_query_count_does_not_grow_with_chunk_size(self):
+        with CaptureQueriesContext(connections['default']) as few:
+            delete_students(Student.objects.filter(roll_number__in=['R0']))
+        with CaptureQueriesContext(connections['default']) as many:
+            delete_students(Student.objects.filter(roll_number__in=['R1', 'R2', 'R3', 'R4']))
+        self.assertEqual(len(many), len(few))
+
+    def test_delete_teachers_removes_exams_and_unassigns_students(self):
+        counts = delete_teachers(Teacher.objects.filter(pk=self.teachers[0].pk))
+        self.assertEqual(counts['teachers'], 1)
+        self.assertEqual(counts['exams'], 1)
+        self.assertEqual(counts['users'], 1)
+        self.assertEqual(counts['unassigned_students'], 3)
+        self.assertEqual(StudentExam.objects.count(), 6)
+        self.assertFalse(User.objects.filter(username='teacher0').exists())
+        self.assertEqual(Student.objects.filter(assigned_teacher__isnull=True).count(), 3)
+
+    def test_admin_delete_selected_removes_users(self):
+        site._registry[Teacher].delete_queryset(None, Teacher.objects.all())
+        self.assertFalse(User.objects.filter(role='teacher').exists())
+
+    def test_bulk_delete_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(user=self.admin_user)
+        response = client.post(reverse('student-bulk-delete'),
+                               {'ids': [self.students[0].pk, self.students[1].pk, 9999]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response.data['deleted']['students'], 2)
+        self.assertEqual(response.data['missing'], [9999])
+
+        response = client.post(reverse('teacher-bulk-delete'), {'ids': [t.pk for t in self.teachers]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Teacher.objects.count(), 0)
+
+        client.force_authenticate(user=self.students[2].user)
+        response = client.post(reverse('student-bulk-delete'), {'ids': [self.students[3].pk]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_delete_rejects_booleans(self):
+        client = APIClient()
+        client.force_authenticate(user=self.admin_user)
+        for ids in ([True], [self.students[0].pk, False]):
+            with self.subTest(ids=ids):
+                response = client.post(reverse('student-bulk-delete'), {'ids': ids}, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Student.objects.count(), len(self.students))
@@ -0,0 +1,95 @@
+import asyncio
+import threading
+
+from asgiref.sync import sync_to_async
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+from core.events import Broker, broker
+from core.grading import grade_answer_sheets
+from core.models import User, Teacher, Student, Exam, Question, StudentExam
+from datetime import date
+
+
+class BrokerTests(SimpleTestCase):
+    def test_publish_from_another_thread_wakes_the_subscriber(self):
+        local = Broker()
+
+        async def wait():
+            wakeup = local.subscribe('exam')
+            threading.Thread(target=local.publish, args=('exam',)).start()
+            await asyncio.wait_for(wakeup.wait(), 1)
+            local.unsubscribe('exam', wakeup)
+
+        asyncio.run(wait())
+        self.assertEqual(local._subscribers, {})
+
+
+@override_settings(SSE_POLL_INTERVAL=0.05, SSE_MAX_DURATION=0.3)
+class SubmissionStreamTests(TestCase):
+    def setUp(self):
+        self.teacher_user = User.objects.create_user(username='teacher1', password='x', role='teacher')
+        self.teacher = Teacher.objects.create(
+            user=self.teacher_user, employee_id="EMP001", phone_number="1",
+            subject_specialization="Math", date_of_joining=date.today())
+        self.exam = Exam.objects.create(title='Maths', subject='Math', target_class='5',
+                                        teacher=self.teacher, created_by=self.teacher_user)
+        Question.objects.bulk_create([
+            Question(exam=self.exam, question_text=f'Q{i}', option1='a', option2='b', option3='c',
+                     option4='d', correct_option='1')
+            for i in range(5)
+        ])
+        for roll in ('R1', 'R2'):
+            Student.objects.create(
+                user=User.objects.create_user(username=roll, password='x', role='student', first_name=roll),
+                roll_number=roll, phone_number="1", grade="5", class_name="5",
+                date_of_birth=date(2015, 1, 1), admission_date=date.today())
+        self.url = reverse('exam-submission-stream', kwargs={'pk': self.exam.pk})
+
+    def auth(self, user):
+        return {'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'}
+
+    async def read(self, user, **headers):
+        response = await self.async_client.get(self.url, headers={**self.auth(user), **headers})
+        if not response.streaming:
+            return response, ''
+        return response, b''.join([chunk async for chunk in response.streaming_content]).decode()
+
+    async def test_streams_submissions_after_the_last_event_id(self):
+        await sync_to_async(grade_answer_sheets)(self.exam, [(2, 'R1', ['1'] * 5)])
+        first = await StudentExam.objects.aget(student__roll_number='R1')
+
+        response, body = await self.read(self.teacher_user, Last_Event_ID='0', Accept_Encoding='gzip')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn(f'id: {first.id}\nevent: submission\n', body)
+        self.assertIn('"roll_number": "R1"', body)
+
+        await sync_to_async(grade_answer_sheets)(self.exam, [(2, 'R2', ['1', '2', '2', '2', '2'])])
+        _, body = await self.read(self.teacher_user, Last_Event_ID=str(first.id))
+        self.assertNotIn('"R1"', body)
+        self.assertIn('"marks": 1', body)
+
+    @override_settings(SSE_POLL_INTERVAL=10, SSE_MAX_DURATION=0.5)
+    async def test_published_submissions_arrive_without_waiting_for_a_poll(self):
+        async def submit_later():
+            await asyncio.sleep(0.1)
+            await sync_to_async(grade_answer_sheets)(self.exam, [(2, 'R1', ['1'] * 5)])
+            # The test transaction never commits, so publish as on_commit would.
+            broker.publish(('default', self.exam.pk))
+
+        task = asyncio.create_task(submit_later())
+        _, body = await self.read(self.teacher_user)
+        await task
+        # Sent on the wake-up, before the stream ever went idle.
+        self.assertLess(body.index('"roll_number": "R1"'), body.index(': keepalive'))
+
+    async def test_only_the_exam_teacher_and_admins_may_follow(self):
+        other = await User.objects.acreate(username='teacher2', role='teacher')
+        student = await User.objects.aget(username='R1')
+        response, _ = await self.read(other)
+        self.assertEqual(response.status_code, 404)
+        response, _ = await self.read(student)
+        self.assertEqual(response.status_code, 403)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,116 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from core.models import User, Teacher, Student, Exam, Question
+from core.fast_serializers import FastStudentSerializer, FastTeacherSerializer, FastExamSerializer
+from core.serializers import StudentSerializer, TeacherSerializer, ExamSerializer
+from core.views import student_queryset, teacher_queryset, exam_queryset
+from datetime import date
+
+
+class SchoolFixtureMixin:
+    """Teachers, students and an exam covering the serializers' edge cases."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.teacher_user = User.objects.create_user(
+            username='teacher1', password='teachpass', role='teacher', first_name='Asha', last_name='Menon')
+        self.teacher = Teacher.objects.create(
+            user=self.teacher_user, employee_id="EMP001", phone_number="1234567890",
+            subject_specialization="Math", date_of_joining=date(2020, 6, 1), status=1)
+        # A teacher without a name and a student without a teacher cover the edge cases.
+        Teacher.objects.create(
+            user=User.objects.create_user(username='teacher2', password='teachpass', role='teacher'),
+            employee_id="EMP002", phone_number="1", subject_specialization="Science",
+            date_of_joining=date(2021, 1, 1))
+        self.student_user = User.objects.create_user(
+            username='student1', password='studpass', role='student', first_name='Ravi', email='r@example.com')
+        Student.objects.create(
+            user=self.student_user, roll_number="R001", phone_number="9", grade="5", class_name="5",
+            date_of_birth=date(2015, 1, 1), admission_date=date(2024, 6, 1), assigned_teacher=self.teacher)
+        Student.objects.create(
+            user=User.objects.create_user(username='student2', password='studpass', role='student'),
+            roll_number="R002", phone_number="9", grade="5", class_name="5",
+            date_of_birth=date(2015, 2, 1), admission_date=date(2024, 6, 1))
+        exam = Exam.objects.create(
+            title='Maths', subject='Math', target_class='5', teacher=self.teacher, created_by=self.teacher_user)
+        exam.set_targets(['6', '5B'])
+        for i in range(5):
+            Question.objects.create(exam=exam, question_text=f'Q{i}', option1='a', option2='b',
+                                    option3='c', option4='d', correct_option='1')
+
+
+class FastSerializerParityTests(SchoolFixtureMixin, TestCase):
+    def test_querysets_match_model_serializers(self):
+        cases = [
+            (FastStudentSerializer, StudentSerializer, student_queryset()),
+            (FastTeacherSerializer, TeacherSerializer, teacher_queryset()),
+            (FastExamSerializer, ExamSerializer, exam_queryset()),
+        ]
+        for fast_class, serializer_class, queryset in cases:
+            with self.subTest(serializer=serializer_class.__name__):
+                fast = fast_class()
+                expected = serializer_class(queryset, many=True).data
+                self.assertEqual(fast.serialize(fast.values(queryset)), expected)
+
+    def test_list_endpoints_match(self):
+        routes = [
+            ('student-list', self.admin_user),
+            ('student-list', self.teacher_user),
+            ('teacher-students-list', self.teacher_user),
+            ('teacher-list', self.admin_user),
+            ('admin-teacher-list', self.admin_user),
+            ('exam-list', self.admin_user),
+            ('exam-list', self.student_user),
+            ('exam-list', self.teacher_user),
+        ]
+        for name, user in routes:
+            with self.subTest(route=name, role=user.role):
+                self.client.force_authenticate(user=user)
+                with override_settings(FAST_LIST_SERIALIZERS=False):
+                    slow = self.client.get(reverse(name))
+                fast = self.client.get(reverse(name))
+                self.assertEqual(fast.status_code, 200)
+                self.assertEqual(fast.content, slow.content)
+
+
+class SparseFieldsTests(SchoolFixtureMixin, TestCase):
+    def _get(self, name, user=None, **params):
+        self.client.force_authenticate(user=user or self.admin_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(name, kwargs=params.pop('kwargs', {})), params)
+        sql = ' '.join(q['sql'] for q in queries.captured_queries)
+        return response, sql
+
+    def test_fields_trim_output_and_columns(self):
+        for fast in (True, False):
+            with self.subTest(fast=fast), override_settings(FAST_LIST_SERIALIZERS=fast):
+                response, sql = self._get('student-list', fields='id,user.username,class_name')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data['results'][0], {
+                    'id': response.data['results'][0]['id'],
+                    'user': {'username': 'student1'},
+                    'class_name': '5',
+                })
+                self.assertNotIn('phone_number', sql)
+                self.assertNotIn('core_teacher', sql)
+
+    def test_exclude_on_detail_skips_join(self):
+        response, sql = self._get('teacher-detail', kwargs={'pk': self.teacher.pk}, exclude='user')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('user', response.data)
+        self.assertEqual(response.data['employee_id'], 'EMP001')
+        self.assertNotIn("core_user", sql.split('FROM "core_teacher"')[-1])
+
+    def test_nested_exam_fields(self):
+        response, sql = self._get('exam-list', fields='title,teacher.user.full_name')
+        self.assertEqual(response.data['results'][0], {
+            'title': 'Maths', 'teacher': {'user': {'full_name': 'Asha Menon'}}})
+
+    def test_unknown_field_is_rejected(self):
+        response, _ = self._get('student-list', fields='id,password')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('password', str(response.data['fields']))
@@ -0,0 +1,95 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework import status
+from core.filters import AllowlistFilter, check_indexed
+from core.models import User, Teacher, Student, Exam
+from core.views import StudentViewSet, ExamViewSet, student_queryset, exam_queryset
+from datetime import date
+
+
+def table_access(queryset, table):
+    """The plan lines that read ``table`` itself."""
+    return [line for line in queryset.explain().splitlines() if f' {table} ' in f'{line} ']
+
+
+class FilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            user=User.objects.create_user(username='admin', password='adminpass', role='admin'))
+        self.teacher = Teacher.objects.create(
+            user=User.objects.create_user(username='teacher1', password='x', role='teacher'),
+            employee_id="EMP001", phone_number="1", subject_specialization="Math", date_of_joining=date.today())
+        for n, (class_name, admitted) in enumerate([('5', date(2023, 6, 1)), ('5', date(2024, 6, 1)), ('6', date(2025, 6, 1))]):
+            Student.objects.create(
+                user=User.objects.create_user(username=f'student{n}', password='x', role='student'),
+                roll_number=f'R{n}', phone_number='1', grade=class_name, class_name=class_name, status=n % 2,
+                date_of_birth=date(2015, 1, 1), admission_date=admitted,
+                assigned_teacher=self.teacher if n else None)
+        for subject in ('Math', 'Science'):
+            Exam.objects.create(title=subject, subject=subject, target_class='5',
+                                teacher=self.teacher, created_by=self.teacher.user)
+
+    def rolls(self, **params):
+        response = self.client.get(reverse('student-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [student['roll_number'] for student in response.data['results']]
+
+    def test_exact_range_and_ordering(self):
+        self.assertEqual(self.rolls(class_name='5'), ['R0', 'R1'])
+        self.assertEqual(self.rolls(class_name='5,6', status='1'), ['R1'])
+        self.assertEqual(self.rolls(assigned_teacher=self.teacher.pk), ['R1', 'R2'])
+        self.assertEqual(self.rolls(admission_date_after='2024-01-01', admission_date_before='2024-12-31'), ['R1'])
+        self.assertEqual(self.rolls(ordering='-admission_date'), ['R2', 'R1', 'R0'])
+
+        response = self.client.get(reverse('exam-list'), {'subject': 'Science', 'created_at_after': date.today()})
+        self.assertEqual([exam['title'] for exam in response.data['results']], ['Science'])
+
+    def test_invalid_values_and_unlisted_ordering_are_rejected(self):
+        response = self.client.get(reverse('student-list'), {'status': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('status', response.data)
+        response = self.client.get(reverse('student-list'), {'ordering': 'phone_number'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unindexed_fields_cannot_be_declared(self):
+        with self.assertRaises(ImproperlyConfigured):
+            check_indexed(Student, ['class_name', 'phone_number'])
+
+
+class FilterQueryPlanTests(TestCase):
+    """Every allowlisted filter and ordering reads the table through an index."""
+
+    factory = APIRequestFactory()
+
+    def filtered(self, view, queryset, params):
+        return AllowlistFilter().filter_queryset(Request(self.factory.get('/', params)), queryset, view)
+
+    def assertIndexed(self, view, queryset, table, params):
+        lines = table_access(self.filtered(view, queryset, params), table)
+        self.assertTrue(lines, params)
+        for line in lines:
+            self.assertIn('USING', line, f"{params}: {line}")
+        plan = self.filtered(view, queryset, params).explain()
+        self.assertNotIn('TEMP B-TREE', plan, params)
+
+    def test_student_filters_use_indexes(self):
+        view = StudentViewSet()
+        for params in [{'class_name': '5'}, {'grade': '5'}, {'status': '1'}, {'assigned_teacher': '1'},
+                       {'admission_date_after': '2024-01-01'}, {'date_of_birth_before': '2015-01-01'}]:
+            self.assertIndexed(view, student_queryset(), 'core_student', params)
+        for field in view.ordering_fields:
+            for ordering in (field, f'-{field}'):
+                self.assertIndexed(view, student_queryset(), 'core_student', {'ordering': ordering})
+
+    def test_exam_filters_use_indexes(self):
+        view = ExamViewSet()
+        for params in [{'subject': 'Math'}, {'target_class': '5'}, {'teacher': '1'},
+                       {'created_at_after': '2024-01-01'}]:
+            self.assertIndexed(view, exam_queryset(), 'core_exam', params)
+        for field in view.ordering_fields:
+            for ordering in (field, f'-{field}'):
+                self.assertIndexed(view, exam_queryset(), 'core_exam', {'ordering': ordering})
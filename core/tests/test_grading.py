@@ -0,0 +1,104 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, SimpleTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import User, Teacher, Student, Exam, Question, StudentExam, StudentAnswer
+from core.omr import parse_sheets, grade_rows, grade_sheets
+from core import grading
+from datetime import date
+from unittest import mock
+
+
+class OMRGradingTests(SimpleTestCase):
+    def test_parse_accepts_letters_and_numbers(self):
+        rows = parse_sheets("roll_number,q1,q2,q3\nR1,A,2,d\n\nR2,1,b,3\n")
+        self.assertEqual(rows, [(2, 'R1', ['1', '2', '4']), (4, 'R2', ['1', '2', '3'])])
+
+    def test_parse_requires_roll_number_column(self):
+        with self.assertRaises(ValueError):
+            parse_sheets("name,q1\nx,1\n")
+
+    def test_grade_rows(self):
+        graded, errors = grade_rows(['1', '2'], [(2, 'R1', ['1', '3']), (3, 'R2', ['1'])])
+        self.assertEqual(graded, [('R1', ['1', '3'], [True, False], 1)])
+        self.assertEqual(len(errors), 1)
+
+    def test_process_pool_matches_serial(self):
+        rows = [(i + 2, f'R{i}', [str(i % 4 + 1), '2']) for i in range(50)]
+        self.assertEqual(
+            grade_sheets(['1', '2'], rows, parallel_threshold=10, workers=2),
+            grade_rows(['1', '2'], rows),
+        )
+
+
+class GradeSheetsViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.teacher_user = User.objects.create_user(username='teacher1', password='teachpass', role='teacher')
+        self.teacher = Teacher.objects.create(
+            user=self.teacher_user, employee_id="EMP001", phone_number="1",
+            subject_specialization="Math", date_of_joining=date.today())
+        self.exam = Exam.objects.create(
+            title='Maths', subject='Math', target_class='5', teacher=self.teacher, created_by=self.teacher_user)
+        for i, correct in enumerate('12341'):
+            Question.objects.create(exam=self.exam, question_text=f'Q{i}', option1='a', option2='b',
+                                    option3='c', option4='d', correct_option=correct)
+        for roll in ('R1', 'R2'):
+            Student.objects.create(
+                user=User.objects.create_user(username=roll, password='studpass', role='student'),
+                roll_number=roll, phone_number="1", grade="5", class_name="5",
+                date_of_birth=date(2015, 1, 1), admission_date=date.today(), assigned_teacher=self.teacher)
+
+    def _upload(self, content):
+        sheet = SimpleUploadedFile('sheets.csv', content.encode(), content_type='text/csv')
+        return self.client.post(
+            reverse('exam-grade-sheets', kwargs={'pk': self.exam.pk}), {'file': sheet}, format='multipart')
+
+    def test_teacher_grades_whole_file(self):
+        self.client.force_authenticate(user=self.teacher_user)
+        response = self._upload("roll_number,q1,q2,q3,q4,q5\nR1,1,2,3,4,1\nR2,A,A,A,A,A\n")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['graded'], 2)
+
+        marks = dict(StudentExam.objects.values_list('student__roll_number', 'marks'))
+        self.assertEqual(marks, {'R1': 5, 'R2': 2})
+        self.assertEqual(StudentAnswer.objects.count(), 10)
+
+    def test_bad_rows_are_reported(self):
+        self.client.force_authenticate(user=self.teacher_user)
+        self._upload("roll_number,q1,q2,q3,q4,q5\nR1,1,2,3,4,1\n")
+        response = self._upload("roll_number,q1,q2,q3,q4,q5\nR1,1,1,1,1,1\nR9,1,1,1,1,1\nR2,1,1\n")
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response.data['graded'], 0)
+        self.assertEqual(len(response.data['errors']), 3)
+        self.assertEqual(StudentExam.objects.count(), 1)
+
+    def test_other_teacher_cannot_grade(self):
+        other = User.objects.create_user(username='teacher2', password='teachpass', role='teacher')
+        Teacher.objects.create(user=other, employee_id="EMP002", phone_number="1",
+                               subject_specialization="Math", date_of_joining=date.today())
+        self.client.force_authenticate(user=other)
+        response = self._upload("roll_number,q1,q2,q3,q4,q5\nR1,1,2,3,4,1\n")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_students_outside_the_target_classes_are_reported(self):
+        Student.objects.filter(roll_number='R2').update(class_name='6', class_key='6')
+        saved, errors = grading.grade_answer_sheets(self.exam, [(2, 'R1', ['1'] * 5), (3, 'R2', ['1'] * 5)])
+        self.assertEqual(saved, 1)
+        self.assertEqual(errors, ["Roll number R2: this exam is not set for the student's class."])
+
+    def test_concurrent_submission_is_reported_as_duplicate(self):
+        store = grading._store
+
+        def submit_first(exam, questions, rows):
+            # Another request submits for R1 between the check and the insert.
+            if not StudentExam.objects.filter(student__roll_number='R1').exists():
+                StudentExam.objects.create(student=Student.objects.get(roll_number='R1'), exam=exam, marks=0)
+            store(exam, questions, rows)
+
+        with mock.patch.object(grading, '_store', side_effect=submit_first):
+            saved, errors = grading.grade_answer_sheets(self.exam, [(2, 'R1', ['1'] * 5), (3, 'R2', ['1'] * 5)])
+        self.assertEqual(saved, 1)
+        self.assertEqual(errors, ["Roll number R1: already submitted this exam."])
+        self.assertEqual(StudentExam.objects.get(student__roll_number='R2').answers.count(), 5)
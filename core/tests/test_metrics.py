@@ -0,0 +1,256 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import User, Teacher, Student, Exam, Question, StudentExam, StudentAnswer, StudentPerformance
+from datetime import date
+from core.metrics import registry
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.authtoken.models import Token
+
+
+class PerformanceMetricsTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            username='admin', password='adminpass', role='admin')
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('student-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = response['Server-Timing']
+        self.assertIn('total;dur=', timing)
+        self.assertIn('db;dur=', timing)
+        self.assertIn('ser;dur=', timing)
+
+    def test_metrics_endpoint_aggregates_per_route(self):
+        self.client.get(reverse('student-list'))
+        self.client.get(reverse('student-list'))
+
+        response = self.client.get(reverse('metrics'), headers=self.admin_auth())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.content.decode()
+        self.assertIn('core_request_duration_seconds_count{route="student-list"} 2', body)
+        self.assertIn('core_request_db_queries_total{route="student-list"}', body)
+
+    def admin_auth(self):
+        return {'Authorization': f'Bearer {RefreshToken.for_user(self.admin_user).access_token}'}
+
+    def test_metrics_endpoint_is_private_without_a_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_401_UNAUTHORIZED)
+        teacher = User.objects.create_user(username='teacher', password='x', role='teacher')
+        response = self.client.get(reverse('metrics'), headers={
+            'Authorization': f'Bearer {RefreshToken.for_user(teacher).access_token}'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.login(username='admin', password='adminpass')
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_200_OK)
+
+    @override_settings(PERF_METRICS_TOKEN='secret')
+    def test_metrics_endpoint_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class SlowQueryLogTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            username='admin', password='adminpass', role='admin')
+        self.client.force_authenticate(user=self.admin_user)
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_slow_queries_are_logged_with_view_and_plan(self):
+        with self.assertLogs('core.slowqueries', level='WARNING') as logs:
+            self.client.get(reverse('student-list'))
+
+        records = [json.loads(line.split(':', 2)[2]) for line in logs.output]
+        selects = [r for r in records if r['sql'].startswith('SELECT') and 'core_student' in r['sql']]
+        self.assertTrue(selects)
+        self.assertEqual(selects[0]['view'], 'student-list')
+        self.assertTrue(selects[0]['plan'])
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0, PERF_METRICS_ENABLED=False)
+    def test_slow_queries_name_the_view_without_performance_metrics(self):
+        client = APIClient()
+        client.force_authenticate(user=self.admin_user)
+        with self.assertLogs('core.slowqueries', level='WARNING') as logs:
+            client.get(reverse('student-list'))
+
+        records = [json.loads(line.split(':', 2)[2]) for line in logs.output]
+        self.assertIn('student-list', {r['view'] for r in records if 'core_student' in r['sql']})
+
+    def test_summary_command_ranks_by_total_time(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'slow.log')
+            with open(path, 'w') as f:
+                for sql, ms in [('SELECT a', 5), ('SELECT b', 50), ('SELECT a', 5)]:
+                    f.write(json.dumps({'sql': sql, 'duration_ms': ms, 'view': 'v', 'plan': []}) + '\n')
+            out = StringIO()
+            call_command('slowqueries', log=path, stdout=out)
+
+        output = out.getvalue()
+        self.assertLess(output.index('SELECT b'), output.index('SELECT a'))
+        self.assertIn('2 calls', output)
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        self.profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profile_dir)
+        self.admin_user = User.objects.create_user(
+            username='admin', password='adminpass', role='admin')
+        self.student_user = User.objects.create_user(
+            username='student1', password='studpass', role='student')
+
+    def _get(self, user):
+        client = APIClient()
+        token = RefreshToken.for_user(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_X_PROFILE='1')
+        return client.get(reverse('student-list'))
+
+    def test_admin_header_writes_tagged_profile(self):
+        with override_settings(PROFILE_DIR=self.profile_dir):
+            self.assertEqual(self._get(self.admin_user).status_code, status.HTTP_200_OK)
+            files = os.listdir(self.profile_dir)
+            self.assertEqual(len(files), 1)
+            self.assertIn('-student-list-admin-', files[0])
+
+            out = StringIO()
+            call_command('profiles', route='student-list', aggregate=True, stdout=out)
+            self.assertIn('Aggregated 1 profile(s).', out.getvalue())
+
+    def test_non_admin_header_is_ignored(self):
+        with override_settings(PROFILE_DIR=self.profile_dir):
+            self.assertEqual(self._get(self.student_user).status_code, status.HTTP_200_OK)
+        self.assertEqual(os.listdir(self.profile_dir), [])
+
+
+class BenchCommandTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(username='admin', password='password123', role='admin')
+        teacher = Teacher.objects.create(
+            user=User.objects.create_user(username='teacher1', password='password123', role='teacher'),
+            employee_id='EMP001', phone_number='1', subject_specialization='Math',
+            date_of_joining=date.today())
+        Student.objects.create(
+            user=User.objects.create_user(username='student1', password='password123', role='student'),
+            roll_number='R001', phone_number='1', grade='5', class_name='5',
+            date_of_birth=date(2015, 1, 1), admission_date=date.today(), assigned_teacher=teacher)
+        exam = Exam.objects.create(
+            title='Maths', subject='Math', target_class='5', teacher=teacher, created_by=teacher.user)
+        for i in range(5):
+            Question.objects.create(exam=exam, question_text=f'Q{i}', option1='a', option2='b',
+                                    option3='c', option4='d', correct_option='1')
+
+    def test_bench_writes_json_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'bench.json')
+            call_command('bench', requests=5, output=output, stdout=StringIO())
+            with open(output) as f:
+                report = json.load(f)
+
+        scenarios = report['scenarios']
+        self.assertEqual(set(scenarios), {
+            'login-storm', 'exam-start', 'submission-burst', 'teacher-review', 'admin-export'})
+        self.assertEqual(scenarios['login-storm']['errors'], 0)
+        self.assertEqual(scenarios['submission-burst']['requests'], 1)
+        self.assertGreater(scenarios['exam-start']['p50_ms'], 0)
+        self.assertGreater(scenarios['exam-start']['queries_per_request'], 0)
+        # Writes made while benchmarking are removed afterwards.
+        self.assertFalse(Exam.objects.get().studentexam_set.exists())
+
+    def test_scenario_writes_are_removed_afterwards(self):
+        call_command('seed_data', teachers=1, students=10, classes=1, exams_per_class=3,
+                     seed=1, prefix='b', stdout=StringIO())
+        # Leave the newest exam untaken so the burst has something to submit.
+        StudentExam.objects.filter(exam=Exam.objects.latest('id')).delete()
+        before = (StudentExam.objects.count(), StudentAnswer.objects.count(),
+                  list(StudentPerformance.objects.order_by('pk').values()))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'bench.json')
+            call_command('bench', 'submission-burst', requests=3, output=output, stdout=StringIO())
+            with open(output) as f:
+                result = json.load(f)['scenarios']['submission-burst']
+
+        self.assertEqual((result['requests'], result['errors']), (3, 0))
+        after = (StudentExam.objects.count(), StudentAnswer.objects.count(),
+                 list(StudentPerformance.objects.order_by('pk').values()))
+        self.assertEqual(after, before)
+
+
+class ShardBenchCommandTests(TestCase):
+    databases = {'default', 'school_north'}
+
+    def test_directory_writes_are_removed_too(self):
+        User.objects.create_user(username='student1', password='password123', role='student', school='north')
+        with tempfile.TemporaryDirectory() as tmp:
+            call_command('bench', 'login-storm', requests=1, school='north',
+                         output=os.path.join(tmp, 'bench.json'), stdout=StringIO())
+        # The login's token was written to the directory, not the shard.
+        self.assertFalse(Token.objects.exists())
+
+
+class SeedDataCommandTests(TestCase):
+    def _seed(self, prefix, seed=7):
+        call_command('seed_data', teachers=3, students=40, classes=2, exams_per_class=2,
+                     seed=seed, prefix=prefix, stdout=StringIO())
+        return list(
+            StudentExam.objects.filter(student__user__username__startswith=f'{prefix}_')
+            .order_by('id').values_list('marks', flat=True)
+        )
+
+    def test_generates_linked_rows(self):
+        self._seed('a')
+        self.assertEqual(Teacher.objects.count(), 3)
+        self.assertEqual(Student.objects.count(), 40)
+        self.assertEqual(Question.objects.count(), 2 * 2 * 5)
+        self.assertEqual(StudentAnswer.objects.count(), StudentExam.objects.count() * 5)
+        self.assertTrue(User.objects.get(username='a_s0').check_password('password123'))
+        for submission in StudentExam.objects.all()[:10]:
+            self.assertEqual(submission.marks, submission.answers.filter(is_correct=True).count())
+
+    def test_same_seed_is_reproducible(self):
+        self.assertEqual(self._seed('a'), self._seed('b'))
+        self.assertNotEqual(self._seed('c', seed=8), self._seed('d'))
+
+
+class ResponseEncodingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            username='admin', password='adminpass', role='admin')
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_fast_renderer_matches_stdlib(self):
+        from rest_framework.renderers import JSONRenderer
+        from core.renderers import FastJSONRenderer
+        data = {'name': 'Zo\u00eb \u2028\u2029', 'marks': [1, 2.5, None], 'ok': True, 'when': date(2024, 1, 2)}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            FastJSONRenderer().render(data, 'application/json; indent=2'),
+            JSONRenderer().render(data, 'application/json; indent=2'),
+        )
+
+    def test_large_responses_are_gzipped(self):
+        for i in range(30):
+            user = User.objects.create_user(username=f'teacher{i}', password='pass', role='teacher')
+            Teacher.objects.create(user=user, employee_id=f'EMP{i:03}', phone_number='1',
+                                   subject_specialization='Math', date_of_joining=date.today())
+        response = self.client.get(reverse('teacher-list'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    @override_settings(GZIP_MIN_LENGTH=100000)
+    def test_small_responses_are_not_gzipped(self):
+        response = self.client.get(reverse('teacher-list'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.has_header('Content-Encoding'))
@@ -0,0 +1,69 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import User, Teacher, Student
+from datetime import date
+
+
+class ApproximateCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', password='x', role='admin')
+        self.teacher = Teacher.objects.create(
+            user=User.objects.create_user(username='teacher1', password='x', role='teacher'),
+            employee_id="EMP001", phone_number="1", subject_specialization="Math", date_of_joining=date.today())
+        self.add_students(25)
+
+    def add_students(self, n):
+        start = Student.objects.count()
+        users = User.objects.bulk_create([
+            User(username=f'student{i}', password='x', role='student') for i in range(start, start + n)])
+        Student.objects.bulk_create([
+            Student(user=user, roll_number=f'R{user.username}', phone_number='1', grade='5', class_name='5',
+                    date_of_birth=date(2015, 1, 1), admission_date=date.today(), assigned_teacher=self.teacher)
+            for user in users
+        ])
+
+    def page(self, user=None, **params):
+        self.client.force_authenticate(user=user or self.admin)
+        response = self.client.get(reverse('student-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_cached_count_is_flagged_and_skips_count_query(self):
+        first = self.page()
+        self.assertEqual((first['count'], first['count_approximate']), (25, False))
+
+        self.add_students(1)
+        # The resource version lookup and the page itself; no COUNT(*).
+        with self.assertNumQueries(2):
+            second = self.page(page=2)
+        self.assertEqual((second['count'], second['count_approximate']), (25, True))
+
+        exact = self.page(page=2, exact_count=1)
+        self.assertEqual((exact['count'], exact['count_approximate']), (26, False))
+
+    def test_last_and_short_pages_are_exact(self):
+        self.page()
+        self.add_students(10)
+        last = self.page(page=3)
+        self.assertEqual((last['count'], last['count_approximate']), (35, False))
+        self.assertIsNotNone(last['next'])
+        self.assertEqual(len(self.page(page=4)['results']), 5)
+
+        self.page(exact_count=1)
+        Student.objects.filter(pk__in=list(Student.objects.order_by('-id').values_list('pk', flat=True)[:20])).delete()
+        short = self.page(page=2)
+        self.assertEqual((short['count'], short['count_approximate'], short['next']), (15, False, None))
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(self.client.get(reverse('student-list'), {'page': 3}).status_code,
+                         status.HTTP_404_NOT_FOUND)
+
+    def test_other_roles_always_get_exact_counts(self):
+        self.page(user=self.teacher.user)
+        self.add_students(1)
+        data = self.page(user=self.teacher.user, page=2)
+        self.assertEqual((data['count'], data['count_approximate']), (26, False))
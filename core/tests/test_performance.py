@@ -0,0 +1,117 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core import performance
+from core.deletion import delete_teachers
+from core.grading import grade_answer_sheets
+from core.models import User, Teacher, Student, Exam, Question, StudentExam, StudentPerformance
+from datetime import date
+
+
+class StudentPerformanceTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.teachers = [
+            Teacher.objects.create(
+                user=User.objects.create_user(username=f'teacher{n}', password='x', role='teacher'),
+                employee_id=f"EMP{n}", phone_number="1", subject_specialization=subject,
+                date_of_joining=date.today())
+            for n, subject in enumerate(('Math', 'Science'))
+        ]
+        self.students = [
+            Student.objects.create(
+                user=User.objects.create_user(username=roll, password='x', role='student'),
+                roll_number=roll, phone_number="1", grade="5", class_name="5",
+                date_of_birth=date(2015, 1, 1), admission_date=date.today())
+            for roll in ('R1', 'R2')
+        ]
+
+    def exam(self, teacher):
+        subject = teacher.subject_specialization
+        exam = Exam.objects.create(title=subject, subject=subject, target_class='5',
+                                   teacher=teacher, created_by=teacher.user)
+        Question.objects.bulk_create([
+            Question(exam=exam, question_text=f'Q{i}', option1='a', option2='b', option3='c',
+                     option4='d', correct_option='1')
+            for i in range(5)
+        ])
+        return exam
+
+    def attend(self, exam, correct):
+        self.client.force_authenticate(user=self.students[0].user)
+        answers = [{'question_id': question.id, 'answer': '1' if n < correct else '2'}
+                   for n, question in enumerate(exam.questions.order_by('id'))]
+        response = self.client.post(reverse('exam-attend', kwargs={'pk': exam.pk}), {'answers': answers},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def summary(self):
+        self.client.force_authenticate(user=self.students[0].user)
+        response = self.client.get(reverse('exam-my-summary'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_submissions_update_the_summary(self):
+        self.assertEqual(self.summary()['exams_taken'], 0)
+        self.attend(self.exam(self.teachers[0]), 2)
+        self.attend(self.exam(self.teachers[1]), 5)
+        self.attend(self.exam(self.teachers[0]), 4)
+
+        self.assertEqual(self.summary(), {
+            "exams_taken": 3, "average_marks": 3.67, "best_subject": 'Science',
+            "worst_subject": 'Math', "trend": 0.0, "recent_marks": [2, 5, 4],
+        })
+        self.assertNumQueries(1, lambda: self.client.get(reverse('exam-my-summary')))
+
+    def test_grade_sheets_and_rebuild_agree(self):
+        exam = self.exam(self.teachers[0])
+        self.attend(self.exam(self.teachers[1]), 1)
+        grade_answer_sheets(exam, [(2, 'R1', ['1'] * 5), (3, 'R2', ['1', '1', '2', '2', '2'])])
+
+        incremental = {s.student_id: (s.exams_taken, s.total_marks, s.subjects, s.recent_marks)
+                       for s in StudentPerformance.objects.all()}
+        self.assertEqual(incremental[self.students[1].pk], (1, 2, {'Math': [1, 2]}, [2]))
+        self.assertEqual(performance.rebuild(), 2)
+        rebuilt = {s.student_id: (s.exams_taken, s.total_marks, s.subjects, s.recent_marks)
+                   for s in StudentPerformance.objects.all()}
+        self.assertEqual(rebuilt, incremental)
+
+    def test_deleting_exams_updates_the_summary(self):
+        self.attend(self.exam(self.teachers[0]), 2)
+        science = self.exam(self.teachers[1])
+        self.attend(science, 5)
+
+        science.delete()
+        self.assertEqual(self.summary()['recent_marks'], [2])
+
+        delete_teachers(Teacher.objects.filter(pk=self.teachers[0].pk))
+        self.assertFalse(StudentPerformance.objects.exists())
+        self.assertEqual(self.summary()['exams_taken'], 0)
+
+    def test_deleting_results_updates_the_summary(self):
+        self.attend(self.exam(self.teachers[0]), 2)
+        science = self.exam(self.teachers[1])
+        self.attend(science, 5)
+
+        StudentExam.objects.get(exam=science).delete()
+        self.assertEqual(self.summary()['recent_marks'], [2])
+
+        # As the admin's "delete selected" action does.
+        StudentExam.objects.all().delete()
+        self.assertFalse(StudentPerformance.objects.exists())
+
+    def test_renaming_the_subject_updates_the_summary(self):
+        math = self.exam(self.teachers[0])
+        self.attend(math, 2)
+        self.attend(self.exam(self.teachers[1]), 5)
+
+        math.subject = 'Algebra'
+        math.save()
+        summary = self.summary()
+        self.assertEqual((summary['best_subject'], summary['worst_subject']), ('Science', 'Algebra'))
+
+    def test_only_students_have_a_summary(self):
+        self.client.force_authenticate(user=self.teachers[0].user)
+        response = self.client.get(reverse('exam-my-summary'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,202 @@
+from collections import namedtuple
+from datetime import date
+from itertools import count
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from core.models import User, Teacher, Student, Exam, Question, StudentExam, StudentAnswer
+
+
+# One row per core route: who may call it, the maximum number of queries it
+# may run, and how to build its URL/arguments from the fixture. Budgets hold
+# regardless of table size; the test also checks counts do not grow with N.
+# ``query`` is appended to the URL, so one route can be listed with options;
+# ``expect`` maps roles to the status they get when it is not a success.
+# Not listed: the Django password-reset pages and the API password reset
+# (mail flows for anonymous users), and the SSE stream (async, long-lived).
+Route = namedtuple('Route', 'name roles budget kwargs method data query format headers expect')
+Route.__new__.__defaults__ = (None, 'get', None, '', 'json', None, {})
+
+ADMIN, TEACHER, STUDENT = 'admin', 'teacher', 'student'
+EVERYONE = (ADMIN, TEACHER, STUDENT)
+
+QUERY_BUDGETS = [
+    Route('custom_login', (ADMIN,), 2, method='post',
+          data=lambda f, kwargs: {'username': f.admin.username, 'password': 'pass1234'}),
+    Route('teacher-list', EVERYONE, 2),
+    Route('teacher-list', (ADMIN, TEACHER), 3, query='include=students,student_count'),
+    Route('teacher-detail', (ADMIN, TEACHER), 1, lambda f: {'pk': f.teacher.pk}),
+    Route('teacher-bulk-delete', (ADMIN,), 28, method='post',
+          data=lambda f, kwargs: {'ids': [f.fresh_teacher().pk]}),
+    Route('student-list', EVERYONE, 3),
+    Route('student-detail', EVERYONE, 2, lambda f: {'pk': f.student.pk}),
+    Route('student-bulk-delete', (ADMIN,), 22, method='post',
+          data=lambda f, kwargs: {'ids': [f.fresh_student().pk]}),
+    Route('student-reassign', (ADMIN,), 8, method='post',
+          data=lambda f, kwargs: {'student_ids': [f.student.pk], 'teacher_ids': [f.teacher.pk]}),
+    Route('student-rollover', (ADMIN,), 1, method='post', data=lambda f, kwargs: {'dry_run': True}),
+    Route('teacher-students-list', (TEACHER,), 3),
+    Route('teacher-students-detail', (TEACHER,), 2, lambda f: {'pk': f.student.pk}),
+    Route('admin-teacher-list', (ADMIN,), 2),
+    Route('admin-teacher-list', (ADMIN,), 3, query='include=students,student_count'),
+    Route('admin-teacher-detail', (ADMIN,), 1, lambda f: {'pk': f.teacher.pk}),
+    Route('admin-teacher-get-students', (ADMIN,), 2, lambda f: {'pk': f.teacher.pk}),
+    Route('exam-list', EVERYONE, 4),
+    Route('exam-detail', EVERYONE, 3, lambda f: {'pk': f.exam.pk}, expect={TEACHER: 404}),
+    Route('exam-questions', (ADMIN, STUDENT), 3, lambda f: {'pk': f.exam.pk}),
+    Route('exam-my-marks', (STUDENT,), 4),
+    Route('exam-my-summary', (STUDENT,), 1),
+    Route('student-exam-list', EVERYONE, 6),
+    Route('student-exam-marks', EVERYONE, 6),
+    Route('teacher_self_update', (TEACHER,), 1),
+    Route('teacher_dashboard', (TEACHER,), 5),
+    Route('export_students_csv', (ADMIN,), 1),
+    Route('export_teachers_csv', (ADMIN,), 1),
+    Route('import_students_csv', (ADMIN,), 6, method='post', format='multipart',
+          data=lambda f, kwargs: {'file': f.student_csv()}),
+    Route('search', EVERYONE, 2, query='q=Student'),
+    Route('metrics', (ADMIN,), 1, headers=lambda f: f.bearer(f.admin)),
+    Route('batch', EVERYONE, 7, method='post',
+          data=lambda f, kwargs: {'requests': [{'path': reverse('student-list')}, {'path': reverse('exam-list')}]}),
+    Route('exam-attend', (STUDENT,), 21, lambda f: {'pk': f.fresh_exam().pk}, 'post',
+          lambda f, kwargs: f.answers_for(kwargs['pk'])),
+    Route('exam-grade-sheets', (ADMIN, TEACHER), 17, lambda f: {'pk': f.fresh_exam().pk}, 'post',
+          lambda f, kwargs: {'file': f.answer_sheet()}, format='multipart'),
+]
+
+
+class Fixture:
+    """Grows a school around one admin, teacher and student."""
+
+    password = make_password('pass1234')
+
+    def __init__(self):
+        self._seq = count(1)
+        self.admin = self._user('admin')
+        self.teacher = Teacher.objects.create(
+            user=self._user('teacher'), employee_id='EMP-MAIN', phone_number='1',
+            subject_specialization='Math', date_of_joining=date.today())
+        self.student = Student.objects.create(
+            user=self._user('student'), roll_number='R-MAIN', phone_number='1', grade='5',
+            class_name='5', date_of_birth=date(2015, 1, 1), admission_date=date.today(),
+            assigned_teacher=self.teacher)
+        self.exam = self._exam()
+
+    def _user(self, role):
+        n = next(self._seq)
+        return User.objects.create(
+            username=f'{role}{n}', password=self.password, role=role,
+            first_name=role.title(), last_name=str(n))
+
+    def _exam(self):
+        exam = Exam.objects.create(
+            title=f'Exam {next(self._seq)}', subject='Math', target_class='5',
+            teacher=self.teacher, created_by=self.teacher.user)
+        Question.objects.bulk_create([
+            Question(exam=exam, question_text=f'Q{i}', option1='a', option2='b',
+                     option3='c', option4='d', correct_option='1')
+            for i in range(5)
+        ])
+        return exam
+
+    def grow(self, n):
+        for _ in range(n):
+            other = Teacher.objects.create(
+                user=self._user('teacher'), employee_id=f'EMP{next(self._seq)}', phone_number='1',
+                subject_specialization='Science', date_of_joining=date.today())
+            student = Student.objects.create(
+                user=self._user('student'), roll_number=f'R{next(self._seq)}', phone_number='1',
+                grade='5', class_name='5', date_of_birth=date(2015, 1, 1),
+                admission_date=date.today(), assigned_teacher=self.teacher)
+            Student.objects.create(
+                user=self._user('student'), roll_number=f'R{next(self._seq)}', phone_number='1',
+                grade='5', class_name='5', date_of_birth=date(2015, 1, 1),
+                admission_date=date.today(), assigned_teacher=other)
+
+            exam = self._exam()
+            for taker in (self.student, student):
+                submission = StudentExam.objects.create(student=taker, exam=exam, marks=3)
+                StudentAnswer.objects.bulk_create([
+                    StudentAnswer(student_exam=submission, question=q, answer='1', is_correct=True)
+                    for q in exam.questions.all()
+                ])
+
+    def fresh_exam(self):
+        return self._exam()
+
+    def fresh_teacher(self):
+        return Teacher.objects.create(
+            user=self._user('teacher'), employee_id=f'EMP{next(self._seq)}', phone_number='1',
+            subject_specialization='Science', date_of_joining=date.today())
+
+    def fresh_student(self):
+        return Student.objects.create(
+            user=self._user('student'), roll_number=f'R{next(self._seq)}', phone_number='1',
+            grade='5', class_name='5', date_of_birth=date(2015, 1, 1), admission_date=date.today())
+
+    def student_csv(self):
+        n = next(self._seq)
+        content = (
+            "username,email,roll_number,phone_number,grade,class_name,date_of_birth,admission_date\n"
+            f"imported{n},i{n}@example.com,I{n},1,5,5,2015-01-01,2024-06-01\n"
+        )
+        return SimpleUploadedFile('students.csv', content.encode(), content_type='text/csv')
+
+    def answer_sheet(self):
+        content = f"roll_number,q1,q2,q3,q4,q5\n{self.student.roll_number},1,1,1,1,1\n"
+        return SimpleUploadedFile('sheets.csv', content.encode(), content_type='text/csv')
+
+    def bearer(self, user):
+        return {'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'}
+
+    def answers_for(self, exam_id):
+        return {'answers': [
+            {'question_id': q.id, 'answer': '1'}
+            for q in Question.objects.filter(exam_id=exam_id)
+        ]}
+
+    def user_for(self, role):
+        return {ADMIN: self.admin, TEACHER: self.teacher.user, STUDENT: self.student.user}[role]
+
+
+class QueryBudgetTests(TestCase):
+    N = 3
+
+    def _measure(self, fixture):
+        counts = {}
+        client = APIClient()
+        for route in QUERY_BUDGETS:
+            for role in route.roles:
+                client.force_authenticate(user=fixture.user_for(role))
+                kwargs = route.kwargs(fixture) if route.kwargs else {}
+                url = reverse(route.name, kwargs=kwargs) + (f'?{route.query}' if route.query else '')
+                data = route.data(fixture, kwargs) if route.data else None
+                headers = route.headers(fixture) if route.headers else None
+
+                with CaptureQueriesContext(connection) as queries:
+                    response = getattr(client, route.method)(url, data, format=route.format, headers=headers)
+                if role in route.expect:
+                    self.assertEqual(response.status_code, route.expect[role], f"{route.name} as {role}")
+                else:
+                    self.assertLess(response.status_code, 300, f"{route.name} as {role}: {response.status_code}")
+                counts[route.name, route.query, role] = len(queries)
+        return counts
+
+    def test_query_counts_do_not_grow_with_data(self):
+        fixture = Fixture()
+        fixture.grow(self.N)
+        small = self._measure(fixture)
+        fixture.grow(9 * self.N)
+        large = self._measure(fixture)
+
+        budgets = {(route.name, route.query): route.budget for route in QUERY_BUDGETS}
+        for (name, query, role), queries in large.items():
+            with self.subTest(route=name, query=query, role=role):
+                self.assertLessEqual(queries, small[name, query, role], "query count grows with N")
+                self.assertLessEqual(queries, budgets[name, query], "query budget exceeded")
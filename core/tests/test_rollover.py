@@ -0,0 +1,58 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import User, Teacher, Student
+from datetime import date
+
+
+class RolloverTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.client.force_authenticate(user=self.admin_user)
+        self.teacher = Teacher.objects.create(
+            user=User.objects.create_user(username='teacher1', password='teachpass', role='teacher'),
+            employee_id="EMP001", phone_number="1", subject_specialization="Math", date_of_joining=date.today())
+        for n, class_name in enumerate(['1', '1', '2', '3', 'KG']):
+            Student.objects.create(
+                user=User.objects.create_user(username=f's{n}', password='x', role='student'),
+                roll_number=f'R{n}', phone_number='1', grade=class_name, class_name=class_name,
+                date_of_birth=date(2015, 1, 1), admission_date=date.today())
+
+    def classes(self):
+        return list(Student.objects.order_by('roll_number').values_list('class_name', 'grade', 'status'))
+
+    def test_dry_run_reports_counts_without_writing(self):
+        response = self.client.post(reverse('student-rollover'), {'dry_run': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['final_class'], '3')
+        by_class = {c['class_name']: (c['students'], c['action'], c['to']) for c in response.data['classes']}
+        self.assertEqual(by_class, {
+            '1': (2, 'promote', '2'), '2': (1, 'promote', '3'), '3': (1, 'leave', None), 'KG': (1, 'unchanged', 'KG'),
+        })
+        self.assertEqual((response.data['promoted'], response.data['left']), (3, 1))
+        self.assertEqual(self.classes()[0], ('1', '1', 0))
+
+    def test_rollover_promotes_retires_and_reassigns(self):
+        response = self.client.post(reverse('student-rollover'), {
+            'promotions': {'KG': '1'},
+            'leaver_status': 2,
+            'teacher_by_class': {'2': self.teacher.pk},
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['promoted'], response.data['left'], response.data['reassigned']), (4, 1, 2))
+        self.assertEqual(self.classes(), [
+            ('2', '2', 0), ('2', '2', 0), ('3', '3', 0), ('3', '3', 2), ('1', 'KG', 0),
+        ])
+        self.assertEqual(Student.objects.filter(assigned_teacher=self.teacher).count(), 2)
+
+    def test_unknown_teacher_is_rejected(self):
+        response = self.client.post(reverse('student-rollover'), {'teacher_by_class': {'2': 999}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.classes()[0], ('1', '1', 0))
+
+    def test_only_admin_can_roll_over(self):
+        self.client.force_authenticate(user=self.teacher.user)
+        response = self.client.post(reverse('student-rollover'), {'dry_run': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,69 @@
+from django.test import TestCase, SimpleTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.deletion import delete_students
+from core.models import User, Teacher, Student
+from core.search import match_expression
+from datetime import date
+
+
+class MatchExpressionTests(SimpleTestCase):
+    def test_terms_become_prefix_phrases(self):
+        self.assertEqual(match_expression('Meera seed-R00'), '"meera"* "seed r00"*')
+        self.assertEqual(match_expression('" OR * ('), '"or"*')
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.teachers = [
+            Teacher.objects.create(
+                user=User.objects.create_user(username=f'teacher{n}', password='x', role='teacher',
+                                              first_name=first, last_name='Nair'),
+                employee_id=f"EMP-{n}", phone_number="1", subject_specialization=subject,
+                date_of_joining=date.today())
+            for n, (first, subject) in enumerate([('Anaya', 'Mathematics'), ('Kabir', 'Science')])
+        ]
+        self.students = [
+            Student.objects.create(
+                user=User.objects.create_user(username=f'pupil{n}', password='x', role='student',
+                                              first_name=first, last_name='Menon'),
+                roll_number=f'R-{n:04}', phone_number='1', grade='5', class_name='5',
+                date_of_birth=date(2015, 1, 1), admission_date=date.today(), assigned_teacher=self.teachers[n % 2])
+            for n, first in enumerate(['Meera', 'Meenakshi', 'Rohan'])
+        ]
+
+    def search(self, user, **params):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse('search'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(r['type'], r['data'].get('roll_number') or r['data'].get('employee_id'))
+                for r in response.data['results']]
+
+    def test_prefix_search_over_names_and_codes(self):
+        self.assertEqual(sorted(self.search(self.admin_user, q='mee')), [('student', 'R-0000'), ('student', 'R-0001')])
+        self.assertEqual(self.search(self.admin_user, q='r-0002'), [('student', 'R-0002')])
+        self.assertEqual(self.search(self.admin_user, q='math'), [('teacher', 'EMP-0')])
+        self.assertEqual(len(self.search(self.admin_user, q='nair', type='student')), 0)
+
+    def test_results_follow_role_scoping(self):
+        self.assertEqual(sorted(self.search(self.teachers[0].user, q='menon')), [('student', 'R-0000'), ('student', 'R-0002')])
+        self.assertEqual(self.search(self.teachers[0].user, q='nair'), [('teacher', 'EMP-0')])
+        self.assertEqual(self.search(self.students[1].user, q='mee'), [('student', 'R-0001')])
+
+    def test_index_follows_renames_and_deletes(self):
+        user = self.students[2].user
+        user.first_name = 'Zubin'
+        user.save()
+        self.assertEqual(self.search(self.admin_user, q='zubin'), [('student', 'R-0002')])
+
+        self.students[0].delete()
+        delete_students(Student.objects.filter(pk=self.students[1].pk))
+        self.assertEqual(self.search(self.admin_user, q='mee'), [])
+
+    def test_short_query_is_rejected(self):
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(reverse('search'), {'q': 'm'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,63 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import User, Teacher, Student
+from datetime import date
+
+
+class TeacherIncludeTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', password='x', role='admin')
+        self.teachers = [
+            Teacher.objects.create(
+                user=User.objects.create_user(username=f'teacher{n}', password='x', role='teacher'),
+                employee_id=f"EMP00{n}", phone_number="1", subject_specialization="Math",
+                date_of_joining=date.today())
+            for n in range(2)
+        ]
+        for n, teacher in enumerate([self.teachers[0], self.teachers[0], None]):
+            Student.objects.create(
+                user=User.objects.create_user(username=f'student{n}', password='x', role='student'),
+                roll_number=f'R{n}', phone_number='1', grade='5', class_name='5',
+                date_of_birth=date(2015, 1, 1), admission_date=date.today(), assigned_teacher=teacher)
+        self.client.force_authenticate(user=self.admin)
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_students_and_counts_are_embedded(self):
+        for name in ('teacher-list', 'admin-teacher-list'):
+            with self.subTest(route=name):
+                rows = self.get(reverse(name) + '?include=students,student_count')['results']
+                self.assertEqual([row['student_count'] for row in rows], [2, 0])
+                self.assertEqual([s['roll_number'] for s in rows[0]['students']], ['R0', 'R1'])
+                self.assertEqual(rows[0]['students'][0]['user']['username'], 'student0')
+                self.assertNotIn('assigned_teacher_name', rows[0]['students'][0])
+                self.assertEqual(rows[1]['students'], [])
+
+    def test_only_requested_extras_appear(self):
+        row = self.get(reverse('admin-teacher-list') + '?include=student_count')['results'][0]
+        self.assertEqual(row['student_count'], 2)
+        self.assertNotIn('students', row)
+        self.assertNotIn('student_count', self.get(reverse('admin-teacher-list'))['results'][0])
+
+        detail = self.get(reverse('teacher-detail', kwargs={'pk': self.teachers[0].pk}) + '?include=students')
+        self.assertEqual(len(detail['students']), 2)
+
+        row = self.get(reverse('admin-teacher-list') + '?include=students&fields=id,students.roll_number')['results'][0]
+        self.assertEqual(row, {'id': self.teachers[0].pk, 'students': [{'roll_number': 'R0'}, {'roll_number': 'R1'}]})
+
+    def test_teachers_see_their_own_roster_only(self):
+        self.client.force_authenticate(user=self.teachers[0].user)
+        rows = self.get(reverse('teacher-list') + '?include=students')['results']
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(len(rows[0]['students']), 2)
+
+    def test_unknown_include_is_rejected(self):
+        response = self.client.get(reverse('teacher-list') + '?include=exams')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('include', response.data)
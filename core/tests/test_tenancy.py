@@ -0,0 +1,116 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import User, Teacher, Student
+from core.tenancy import use_school
+from core.deletion import delete_teachers
+from datetime import date
+
+
+class SchoolShardTests(TestCase):
+    databases = {'default', 'school_north', 'school_south'}
+
+    def setUp(self):
+        self.client = APIClient()
+
+        self.north_admin = User.objects.create_user(
+            username='north_admin', password='adminpass', role='admin', school='north')
+        self.south_admin = User.objects.create_user(
+            username='south_admin', password='adminpass', role='admin', school='south')
+
+        self.north_teacher_user = User.objects.create_user(
+            username='north_teacher', password='teachpass', role='teacher', school='north')
+        with use_school('north'):
+            self.north_teacher = Teacher.objects.create(
+                user=self.north_teacher_user,
+                employee_id="EMP001",
+                phone_number="1234567890",
+                subject_specialization="Math",
+                date_of_joining=date.today(),
+            )
+
+    def test_users_live_in_directory_and_are_replicated(self):
+        self.assertTrue(User.objects.using('default').filter(username='north_teacher').exists())
+        self.assertTrue(User.objects.using('school_north').filter(username='north_teacher').exists())
+        self.assertFalse(User.objects.using('school_south').filter(username='north_teacher').exists())
+
+    def test_school_rows_are_written_to_their_shard(self):
+        self.assertEqual(Teacher.objects.using('school_north').count(), 1)
+        self.assertEqual(Teacher.objects.using('school_south').count(), 0)
+        self.assertEqual(Teacher.objects.using('default').count(), 0)
+
+    def test_related_user_is_resolved_from_directory(self):
+        with use_school('north'):
+            teacher = Teacher.objects.get(employee_id="EMP001")
+        self.assertEqual(teacher.user._state.db, 'default')
+        self.assertEqual(teacher.user.username, 'north_teacher')
+
+    def test_listing_is_scoped_to_requesting_school(self):
+        self.client.force_authenticate(user=self.north_admin)
+        response = self.client.get(reverse('teacher-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+
+        self.client.force_authenticate(user=self.south_admin)
+        response = self.client.get(reverse('teacher-list'))
+        self.assertEqual(response.data['count'], 0)
+
+    def test_created_student_lands_in_admins_shard(self):
+        self.client.force_authenticate(user=self.south_admin)
+        response = self.client.post(reverse('student-list'), {
+            "user": {"username": "south_student", "password": "studpass", "email": "s@example.com"},
+            "roll_number": "R100",
+            "phone_number": "9999999999",
+            "grade": "5",
+            "class_name": "5",
+            "date_of_birth": "2015-01-01",
+            "admission_date": "2024-06-01",
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        user = User.objects.get(username='south_student')
+        self.assertEqual(user.school, 'south')
+        self.assertTrue(Student.objects.using('school_south').filter(roll_number='R100').exists())
+        self.assertFalse(Student.objects.using('school_north').filter(roll_number='R100').exists())
+
+    def test_bulk_created_students_land_in_teachers_shard(self):
+        self.client.force_authenticate(user=self.north_teacher_user)
+        response = self.client.post(reverse('teacher-students-list'), [{
+            "user": {"username": f"north_student{n}", "password": "studpass"},
+            "roll_number": f"N{n}", "phone_number": "1", "grade": "5", "class_name": "5",
+            "date_of_birth": "2015-01-01", "admission_date": "2024-06-01",
+        } for n in range(3)], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(User.objects.filter(username__startswith='north_student', school='north').count(), 3)
+        self.assertEqual(User.objects.using('school_north').filter(username__startswith='north_student').count(), 3)
+        self.assertEqual(Student.objects.using('school_north').filter(assigned_teacher=self.north_teacher).count(), 3)
+
+    def test_deleting_teacher_removes_user_and_replica(self):
+        with use_school('north'):
+            Teacher.objects.get(employee_id="EMP001").delete()
+        self.assertFalse(User.objects.using('default').filter(username='north_teacher').exists())
+        self.assertFalse(User.objects.using('school_north').filter(username='north_teacher').exists())
+
+    def test_bulk_delete_removes_users_and_replicas(self):
+        with use_school('north'):
+            counts = delete_teachers(Teacher.objects.all())
+        self.assertEqual(counts['users'], 1)
+        self.assertFalse(User.objects.using('default').filter(username='north_teacher').exists())
+        self.assertFalse(User.objects.using('school_north').filter(username='north_teacher').exists())
+        self.assertEqual(Teacher.objects.using('school_north').count(), 0)
+
+    def test_set_based_user_writes_reach_the_replicas(self):
+        User.objects.filter(school='north').update(is_active=False)
+        replicas = User.objects.using('school_north')
+        self.assertFalse(replicas.filter(is_active=True).exists())
+        # The profile pointing at the replica survives the refresh.
+        self.assertEqual(Teacher.objects.using('school_north').count(), 1)
+
+        self.north_teacher_user.first_name = 'Renamed'
+        User.objects.bulk_update([self.north_teacher_user], ['first_name'])
+        replica = replicas.get(username='north_teacher')
+        self.assertEqual(replica.first_name, 'Renamed')
+        self.assertFalse(replica.is_active)
+        self.assertFalse(User.objects.using('school_south').filter(username='north_teacher').exists())
@@ -0,0 +1,133 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import User, Teacher, Student, Exam, StudentExam
+from core.rollover import rollover
+from datetime import date
+import time
+from unittest import mock
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.teacher = Teacher.objects.create(
+            user=User.objects.create_user(username='teacher1', password='x', role='teacher'),
+            employee_id="EMP001", phone_number="1", subject_specialization="Math", date_of_joining=date.today())
+        self.student = Student.objects.create(
+            user=User.objects.create_user(username='student1', password='x', role='student'),
+            roll_number='R1', phone_number='1', grade='5', class_name='5',
+            date_of_birth=date(2015, 1, 1), admission_date=date.today(), assigned_teacher=self.teacher)
+        self.client.force_authenticate(user=self.admin)
+
+    def get(self, url, **headers):
+        return self.client.get(url, headers=headers)
+
+    def test_unchanged_list_is_not_modified_without_running_the_view(self):
+        url = reverse('student-list')
+        first = self.get(url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn('private', first['Cache-Control'])
+
+        with self.assertNumQueries(1):
+            second = self.get(url, If_None_Match=first['ETag'])
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(self.get(url, If_None_Match=f"W/{first['ETag']}").status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+
+        self.assertNotEqual(self.get(url + '?ordering=-grade')['ETag'], first['ETag'])
+        self.client.force_authenticate(user=self.teacher.user)
+        self.assertEqual(self.get(url, If_None_Match=first['ETag']).status_code, status.HTTP_200_OK)
+
+    def test_writes_change_the_etag(self):
+        url = reverse('student-detail', kwargs={'pk': self.student.pk})
+        etag = self.get(url)['ETag']
+
+        self.student.phone_number = '2'
+        self.student.save()
+        response = self.get(url, If_None_Match=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        # Set-based paths bump the counters themselves.
+        rollover(final_class='9')
+        response = self.get(url, If_None_Match=etag)
+        self.assertEqual(response.data['class_name'], '6')
+        etag = response['ETag']
+
+        # Renames reach the payload through the user; logins do not.
+        self.client.login(username='admin', password='adminpass')
+        self.assertEqual(self.get(url, If_None_Match=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.student.user.first_name = 'Renamed'
+        self.student.user.save()
+        self.assertEqual(self.get(url, If_None_Match=etag).status_code, status.HTTP_200_OK)
+
+    def test_set_based_user_writes_change_the_etag(self):
+        url = reverse('student-list')
+        etag = self.get(url)['ETag']
+
+        User.objects.filter(pk=self.student.user.pk).update(first_name='Zed')
+        response = self.get(url, If_None_Match=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        self.student.user.last_name = 'Renamed'
+        User.objects.bulk_update([self.student.user], ['last_name'])
+        response = self.get(url, If_None_Match=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        User.objects.filter(pk=self.student.user.pk).update(last_login=timezone.now())
+        self.assertEqual(self.get(url, If_None_Match=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_deleting_a_result_changes_the_etag(self):
+        exam = Exam.objects.create(title='Maths', subject='Math', target_class='5',
+                                   teacher=self.teacher, created_by=self.teacher.user)
+        result = StudentExam.objects.create(student=self.student, exam=exam, marks=3)
+        url = reverse('student-exam-list')
+        response = self.get(url)
+        self.assertEqual(len(response.data['results']), 1)
+
+        result.delete()
+        response = self.get(url, If_None_Match=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [])
+
+    def test_exams_and_if_modified_since(self):
+        url = reverse('exam-list')
+        time.sleep(1)
+        response = self.get(url)
+        since = response['Last-Modified']
+        self.assertEqual(self.get(url, If_Modified_Since=since).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        time.sleep(1)
+        Exam.objects.create(title='Maths', subject='Math', target_class='5',
+                            teacher=self.teacher, created_by=self.teacher.user)
+        response = self.get(url, If_Modified_Since=since)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        time.sleep(1)
+        self.assertEqual(self.get(url, If_Modified_Since=http_date()).status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_writes_in_the_current_second_are_not_trusted_to_dates(self):
+        url = reverse('exam-list')
+        with mock.patch('core.versioning.time.time', return_value=time.time() - 5):
+            # Still the second of the last write: no date to revalidate
+            # against, and a date naming it is treated as modified.
+            response = self.get(url, If_Modified_Since=http_date())
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('Last-Modified', response)
+
+            # The ETag still revalidates exactly, and wins over the date.
+            response = self.get(url, If_None_Match=response['ETag'], If_Modified_Since=http_date(0))
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with mock.patch('core.versioning.time.time', return_value=time.time() + 5):
+            self.assertIn('Last-Modified', self.get(url))
+        response = self.get(url, If_None_Match='"stale"', If_Modified_Since=http_date(time.time() + 60))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
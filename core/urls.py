@@ -1,6 +1,8 @@
 from django.urls import path, include
 from django.contrib.auth import views as auth_views
 from rest_framework.routers import DefaultRouter
+from .batch import batch_view
+from .events import submission_stream_view
 from .views import (
     # RegisterTeacherView,
     # RegisterStudentView,
@@ -16,7 +18,10 @@ from .views import (
     ExamViewSet,
     StudentExamListView,
     CustomPasswordResetView,
-    CustomPasswordResetConfirmView
+    CustomPasswordResetConfirmView,
+    metrics_view,
+    search_view,
+    teacher_dashboard_view
 )
 
 router = DefaultRouter()
@@ -28,6 +33,7 @@ router.register(r'exams', ExamViewSet, basename='exam')
 urlpatterns = [
     path('login', CustomLoginView.as_view(), name='custom_login'),
     path('teacher/me', TeacherSelfUpdateView.as_view(), name='teacher_self_update'),
+    path('teacher/dashboard', teacher_dashboard_view, name='teacher_dashboard'),
     path('export/students', export_students_csv, name='export_students_csv'),
     path('export/teachers', export_teachers_csv, name='export_teachers_csv'),
     path('student-exams/', StudentExamListView.as_view(), name='student-exam-list'),
@@ -39,5 +45,9 @@ urlpatterns = [
     path('api/student-marks/', StudentExamListView.as_view(), name='student-exam-marks'),
     path('api/password-reset/', CustomPasswordResetView.as_view(), name='password_reset'),
     path('api/password-reset-confirm/<uidb64>/<token>/', CustomPasswordResetConfirmView.as_view(), name='password_reset_confirm'),
+    path('metrics', metrics_view, name='metrics'),
+    path('search', search_view, name='search'),
+    path('exams/<int:pk>/submissions/stream', submission_stream_view, name='exam-submission-stream'),
+    path('batch', batch_view, name='batch'),
     path('', include(router.urls)),
 ]
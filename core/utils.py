@@ -1,2 +1,11 @@
 # In core/utils.py
 
+# Keeps IN (...) lists under every backend's parameter limit (SQLite's was 999).
+LOOKUP_CHUNK = 900
+
+
+def chunks(items, size=LOOKUP_CHUNK):
+    """Yield ``items`` (any iterable) as lists of at most ``size``."""
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
@@ -0,0 +1,126 @@
+"""Version counters behind conditional GETs (ETag / Last-Modified).
+
+Each shard has one ``ResourceVersion`` row per kind of resource in
+``NAMES``. Every write to that kind bumps the row in the same database, and
+so in the same transaction. ORM saves and deletes do it through the signal
+receivers below; bulk paths call ``bump`` themselves. ``ConditionalGetMixin``
+builds a list's or a detail's ETag from the counters it depends on, the user
+and the request, so an unchanged resource is answered with 304 after one
+small query, before the view's own query or serializer runs.
+"""
+import hashlib
+import time
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import ResourceVersion
+from .tenancy import DIRECTORY_DB, current_db, handling_replicas, school_db
+
+
+# 'user' covers the names and usernames shown inside every profile payload.
+NAMES = ('student', 'teacher', 'exam', 'studentexam', 'user')
+
+
+def bump(names, using=None):
+    """Mark ``names`` as changed on ``using`` (the current shard by default)."""
+    using = using or current_db()
+    names = sorted(set(names))
+    now = timezone.now()
+    versions = ResourceVersion.objects.using(using)
+    updated = versions.filter(name__in=names).update(version=F('version') + 1, modified=now)
+    if updated < len(names):
+        versions.bulk_create([ResourceVersion(name=name, version=1, modified=now) for name in names],
+                             ignore_conflicts=True)
+
+
+def current(names, using=None):
+    """``{name: (version, modified)}`` for ``names``; unknown names are absent."""
+    rows = ResourceVersion.objects.using(using or current_db()).filter(name__in=names)
+    return {name: (version, modified) for name, version, modified in rows.values_list('name', 'version', 'modified')}
+
+
+# Models whose rows make up each versioned resource. Answers are only ever
+# written together with their StudentExam, whose save covers them.
+MODEL_VERSIONS = {
+    'student': 'student',
+    'teacher': 'teacher',
+    'exam': 'exam',
+    'question': 'exam',
+    'studentexam': 'studentexam',
+}
+
+
+def bump_on_write(sender, instance, using, raw=False, **kwargs):
+    if not raw:
+        bump([MODEL_VERSIONS[sender._meta.model_name]], using)
+
+
+def bump_on_user_write(sender, instance, using, raw=False, update_fields=None, **kwargs):
+    # Users live in the directory; their names are read from the school's
+    # replica. Logins only touch last_login, which no payload shows, and bulk
+    # deletions bump once for the whole chunk.
+    if raw or using != DIRECTORY_DB or handling_replicas():
+        return
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    bump(['user'], school_db(instance.school))
+
+
+class ConditionalGetMixin:
+    """ETag and Last-Modified on ``list``/``retrieve``, answering 304 when unchanged.
+
+    Views set ``version_names`` to the ``NAMES`` their payload depends on.
+    """
+
+    version_names = ()
+
+    def conditional(self, request, handler, *args, **kwargs):
+        versions = current(self.version_names)
+        user = request.user
+        key = '|'.join([
+            request.get_full_path(), request.headers.get('Accept', ''), str(user.pk), user.role,
+            *(f'{name}:{versions.get(name, (0,))[0]}' for name in self.version_names),
+        ])
+        etag = quote_etag(hashlib.sha1(key.encode()).hexdigest())
+        modified = max((moment for _, moment in versions.values()), default=None)
+        # HTTP dates have one-second resolution; the ETag is the exact check.
+        # A write later in the current second would keep the same date, so
+        # that second is never handed out or trusted as Last-Modified.
+        last_modified = int(modified.timestamp()) if modified else None
+        if last_modified and last_modified >= int(time.time()):
+            last_modified = None
+
+        if self._not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+            # Per-user payloads: browsers may keep them but must revalidate.
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    @staticmethod
+    def _not_modified(request, etag, last_modified):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            # If-None-Match wins over If-Modified-Since (RFC 9110 13.2.2).
+            # Compression downgrades our ETag to a weak one; compare weakly.
+            tags = {tag.removeprefix('W/') for tag in parse_etags(if_none_match)}
+            return etag in tags or '*' in tags
+        # last_modified is None while the latest write's second is current.
+        since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+        return bool(since and last_modified and last_modified <= since)
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(request, super().retrieve, *args, **kwargs)
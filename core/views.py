@@ -5,17 +5,37 @@ from rest_framework import status, viewsets, permissions, generics
 from .serializers import (
     TeacherSerializer, StudentSerializer, ExamSerializer, 
     ExamSubmissionSerializer, StudentExamSerializer, QuestionSerializer,
-    TeacherSelfUpdateSerializer
+    TeacherSelfUpdateSerializer, RolloverSerializer, ReassignSerializer, TeacherRosterSerializer
+)
+from .models import (
+    Teacher, Student, Exam, ExamTarget, Question, StudentExam, StudentAnswer, StudentPerformance, User,
+    class_base_expression
 )
-from .models import Teacher, Student, Exam, Question, StudentExam, StudentAnswer, User
 from django.db import models
+from django.db.models.functions import Coalesce
 from rest_framework.authtoken.models import Token
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes, parser_classes
 from django.contrib.auth import authenticate
-from .permissions import IsAdmin, IsTeacher, IsAdminOrSelf
+from .permissions import IsAdmin, IsTeacher, IsAdminOrSelf, jwt_user
+from .tenancy import current_school
+from .assignment import candidate_teachers, reassign_students
+from .bulk import BulkStudentCreateMixin
+from .dashboard import teacher_dashboard
+from .deletion import delete_students, delete_teachers
+from .filters import AllowlistFilter, EXACT, RANGE
+from .grading import grade_answer_sheets
+from .omr import parse_sheets
+from .performance import summarize
+from .rollover import rollover as run_rollover
+from . import search as person_search
+from .sparse import SparseFieldsMixin
+from .versioning import ConditionalGetMixin
+from .fast_serializers import (
+    FastListMixin, FastTeacherSerializer, FastStudentSerializer, FastExamSerializer
+)
 from rest_framework.decorators import action
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.generics import RetrieveUpdateAPIView
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
@@ -26,12 +46,46 @@ from datetime import datetime
 import csv
 import io
 from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.crypto import constant_time_compare
+from . import metrics
 import logging
 
 
 logger = logging.getLogger(__name__)
 
 
+# Base querysets carrying the joins/prefetches their serializers read, so
+# list endpoints run a constant number of queries.
+def teacher_queryset():
+    return Teacher.objects.select_related('user').order_by('id')
+
+
+def student_queryset():
+    return Student.objects.select_related('user', 'assigned_teacher__user').order_by('id')
+
+
+def exam_queryset():
+    # A correlated count rather than annotate(Count()): no GROUP BY, so
+    # filters and ordering can use the exam indexes.
+    questions = Question.objects.filter(exam=models.OuterRef('pk')).order_by().values('exam')
+    return (
+        Exam.objects.select_related('teacher__user')
+        .annotate(questions_count=Coalesce(
+            models.Subquery(questions.annotate(count=models.Count('id')).values('count')), 0))
+        .order_by('id')
+    )
+
+
+def student_exam_queryset():
+    return (
+        StudentExam.objects.select_related('exam', 'student__user')
+        .prefetch_related('answers__question')
+        .annotate(total_questions=models.Count('exam__questions'))
+        .order_by('id')
+    )
+
+
 class CustomLoginView(APIView):
     permission_classes = []
 
@@ -68,9 +122,90 @@ class CustomLoginView(APIView):
         }, status=status.HTTP_200_OK)
 
 
-class TeacherViewSet(viewsets.ModelViewSet):
+STUDENT_FILTERS = {
+    'class_name': EXACT, 'grade': EXACT, 'status': EXACT, 'assigned_teacher': EXACT,
+    'admission_date': RANGE, 'date_of_birth': RANGE,
+}
+STUDENT_ORDERING = ['class_name', 'grade', 'status', 'assigned_teacher', 'admission_date', 'date_of_birth', 'roll_number']
+
+EXAM_FILTERS = {'subject': EXACT, 'target_class': EXACT, 'teacher': EXACT, 'created_at': RANGE}
+EXAM_ORDERING = ['subject', 'target_class', 'teacher', 'created_at']
+
+
+def bulk_delete_response(request, queryset, delete, kind):
+    ids = request.data.get('ids') if isinstance(request.data, dict) else None
+    # type() rather than isinstance(): JSON true/false would pass as 1/0.
+    if not isinstance(ids, list) or not ids or not all(type(pk) is int for pk in ids):
+        return Response({"error": "Send a non-empty list of integer 'ids'."}, status=status.HTTP_400_BAD_REQUEST)
+
+    queryset = queryset.filter(pk__in=ids)
+    found = set(queryset.values_list('pk', flat=True))
+    missing = sorted(set(ids) - found)
+    if not found:
+        return Response({"error": f"None of the {kind} were found."}, status=status.HTTP_404_NOT_FOUND)
+
+    logger.warning(f"[{request.user.role.upper()}:{request.user.username}] Bulk deleting {len(found)} {kind}")
+    deleted = delete(queryset)
+    if missing:
+        return Response({
+            "message": f"Deleted {len(found)} {kind}; {len(missing)} ids were not found.",
+            "deleted": deleted,
+            "missing": missing
+        }, status=status.HTTP_206_PARTIAL_CONTENT)
+    return Response({
+        "message": f"Deleted {len(found)} {kind}.",
+        "deleted": deleted
+    }, status=status.HTTP_200_OK)
+
+
+class TeacherIncludeMixin:
+    """``?include=students,student_count`` on teacher reads.
+
+    Rosters come from one prefetch for the whole page and counts from one
+    correlated subquery, instead of a ``students`` request per teacher.
+    """
+
+    def includes(self):
+        request = self.request
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return frozenset()
+        requested = {name for name in request.query_params.get('include', '').split(',') if name}
+        unknown = requested.difference(TeacherRosterSerializer.INCLUDES)
+        if unknown:
+            raise ValidationError({'include': f"Unknown include(s): {', '.join(sorted(unknown))}."})
+        return frozenset(requested)
+
+    def use_fast_list(self):
+        # The fast serializers have no nested rosters.
+        return not self.includes() and super().use_fast_list()
+
+    def get_serializer_class(self):
+        return TeacherRosterSerializer if self.includes() else super().get_serializer_class()
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), 'include': self.includes()}
+
+    def narrowing_serializer_class(self):
+        # Its column list knows nothing of the roster or the count.
+        return None if self.includes() else super().narrowing_serializer_class()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        include = self.includes()
+        if 'students' in include:
+            queryset = queryset.prefetch_related(models.Prefetch(
+                'student_set', queryset=Student.objects.select_related('user').order_by('id'), to_attr='roster'))
+        if 'student_count' in include:
+            students = Student.objects.filter(assigned_teacher=models.OuterRef('pk')).order_by().values('assigned_teacher')
+            queryset = queryset.annotate(student_count=Coalesce(
+                models.Subquery(students.annotate(count=models.Count('id')).values('count')), 0))
+        return queryset
+
+
+class TeacherViewSet(TeacherIncludeMixin, FastListMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Teacher.objects.all()
     serializer_class = TeacherSerializer
+    fast_serializer_class = FastTeacherSerializer
     permission_classes = [IsAuthenticated]
 
     def get_permissions(self):
@@ -83,9 +218,9 @@ class TeacherViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         if user.role == 'admin':
-            return Teacher.objects.all()
+            return teacher_queryset()
         elif user.role == 'teacher':
-            return Teacher.objects.filter(user=user)
+            return teacher_queryset().filter(user=user)
         return Teacher.objects.none()
 
     def create(self, request, *args, **kwargs):
@@ -109,10 +244,20 @@ class TeacherViewSet(viewsets.ModelViewSet):
         logger.warning(f"[{request.user.role.upper()}:{request.user.username}] Deleting teacher ID {teacher.id}")
         return super().destroy(request, *args, **kwargs)
 
+    @action(detail=False, methods=['post'], url_path='bulk-delete')
+    def bulk_delete(self, request):
+        return bulk_delete_response(request, self.get_queryset(), delete_teachers, 'teachers')
+
 
-class StudentViewSet(viewsets.ModelViewSet):
+class StudentViewSet(ConditionalGetMixin, BulkStudentCreateMixin, FastListMixin, SparseFieldsMixin,
+                     viewsets.ModelViewSet):
     queryset = Student.objects.all()
     serializer_class = StudentSerializer
+    fast_serializer_class = FastStudentSerializer
+    version_names = ('student', 'teacher', 'user')
+    filter_backends = [AllowlistFilter]
+    filter_fields = STUDENT_FILTERS
+    ordering_fields = STUDENT_ORDERING
     permission_classes = [IsAuthenticated]
 
     def get_permissions(self):
@@ -122,22 +267,28 @@ class StudentViewSet(viewsets.ModelViewSet):
             return [IsAuthenticated(), IsAdminOrSelf()]
         elif self.action in ['retrieve', 'list']:
             return [IsAuthenticated()]
+        elif self.action in ['rollover', 'bulk_delete', 'reassign']:
+            return [IsAuthenticated(), IsAdmin()]
         return [IsAuthenticated()]
 
     def get_queryset(self):
         user = self.request.user
         if user.role == 'admin':
-            return Student.objects.all()
+            return student_queryset()
         elif user.role == 'student':
-            return Student.objects.filter(user=user)
+            return student_queryset().filter(user=user)
         elif user.role == 'teacher':
-            return Student.objects.filter(assigned_teacher__user=user)
+            return student_queryset().filter(assigned_teacher__user=user)
         return Student.objects.none()
 
     def create(self, request, *args, **kwargs):
        
         if request.user.role not in ['admin', 'teacher']:
             raise PermissionDenied("Only admin and teachers can create students.")
+
+        if isinstance(request.data, list):
+            logger.info(f"[{request.user.role.upper()}:{request.user.username}] Creating {len(request.data)} students")
+            return self.bulk_create(request)
             
         logger.info(f"[{request.user.role.upper()}:{request.user.username}] Creating a new student")
         serializer = self.get_serializer(data=request.data)
@@ -159,13 +310,61 @@ class StudentViewSet(viewsets.ModelViewSet):
         logger.warning(f"[{request.user.role.upper()}:{request.user.username}] Deleting student ID {student.id}")
         return super().destroy(request, *args, **kwargs)
 
+    @action(detail=False, methods=['post'], url_path='bulk-delete')
+    def bulk_delete(self, request):
+        return bulk_delete_response(request, self.get_queryset(), delete_students, 'students')
+
+    @action(detail=False, methods=['post'], url_path='reassign')
+    def reassign(self, request):
+        serializer = ReassignSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        options = serializer.validated_data
+
+        missing = []
+        if options['unassigned']:
+            students = Student.objects.filter(assigned_teacher__isnull=True, status=Student.ENROLLED)
+        else:
+            students = Student.objects.filter(pk__in=options['student_ids'])
+            found = set(students.values_list('pk', flat=True))
+            if not found:
+                return Response({"error": "None of the students were found."}, status=status.HTTP_404_NOT_FOUND)
+            missing = sorted(set(options['student_ids']) - found)
+        teachers = candidate_teachers(options.get('teacher_ids'), options.get('subject'))
+        if not teachers.exists():
+            return Response({"error": "No active teachers match."}, status=status.HTTP_400_BAD_REQUEST)
+
+        logger.info(f"[ADMIN:{request.user.username}] Reassigning students across teachers")
+        result = reassign_students(students, teachers)
+        if missing:
+            result['missing'] = missing
+            return Response(result, status=status.HTTP_206_PARTIAL_CONTENT)
+        return Response(result)
+
+    @action(detail=False, methods=['post'], url_path='rollover')
+    def rollover(self, request):
+        serializer = RolloverSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        options = serializer.validated_data
+
+        if options['dry_run']:
+            logger.info(f"[ADMIN:{request.user.username}] Previewing academic year rollover")
+        else:
+            logger.warning(f"[ADMIN:{request.user.username}] Running academic year rollover")
+        return Response(run_rollover(**options))
+
 
-class StudentByTeacherViewSet(viewsets.ModelViewSet):    
+class StudentByTeacherViewSet(ConditionalGetMixin, BulkStudentCreateMixin, FastListMixin, SparseFieldsMixin,
+                              viewsets.ModelViewSet):
     serializer_class = StudentSerializer
+    fast_serializer_class = FastStudentSerializer
+    version_names = ('student', 'teacher', 'user')
+    filter_backends = [AllowlistFilter]
+    filter_fields = STUDENT_FILTERS
+    ordering_fields = STUDENT_ORDERING
     permission_classes = [IsTeacher]
 
     def get_queryset(self):
-        return Student.objects.filter(assigned_teacher__user=self.request.user)
+        return student_queryset().filter(assigned_teacher__user=self.request.user)
     
     def get_object(self):
         obj = super().get_object()
@@ -175,6 +374,10 @@ class StudentByTeacherViewSet(viewsets.ModelViewSet):
 
     def create(self, request, *args, **kwargs):
        
+        if isinstance(request.data, list):
+            logger.info(f"[TEACHER:{request.user.username}] Creating {len(request.data)} students")
+            return self.bulk_create(request)
+
         logger.info(f"[TEACHER:{request.user.username}] Creating student")
         return super().create(request, *args, **kwargs)
 
@@ -195,15 +398,18 @@ class StudentByTeacherViewSet(viewsets.ModelViewSet):
         return Response(response_data)
 
 
-class AdminTeacherViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Teacher.objects.all()
+class AdminTeacherViewSet(TeacherIncludeMixin, FastListMixin, SparseFieldsMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = TeacherSerializer
+    fast_serializer_class = FastTeacherSerializer
     permission_classes = [IsAdmin]
 
+    def get_queryset(self):
+        return teacher_queryset()
+
     @action(detail=True, methods=['get'], url_path='students')
     def get_students(self, request, pk=None):
         teacher = self.get_object()
-        students = Student.objects.filter(assigned_teacher=teacher)
+        students = student_queryset().filter(assigned_teacher=teacher)
         serializer = StudentSerializer(students, many=True)
         return Response(serializer.data)
 
@@ -216,9 +422,15 @@ class TeacherSelfUpdateView(RetrieveUpdateAPIView):
         return self.request.user.teacher
 
 
-class ExamViewSet(viewsets.ModelViewSet):
+class ExamViewSet(ConditionalGetMixin, FastListMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Exam.objects.all()
     serializer_class = ExamSerializer
+    fast_serializer_class = FastExamSerializer
+    # 'student': a student's class decides which exams they see.
+    version_names = ('exam', 'teacher', 'user', 'student')
+    filter_backends = [AllowlistFilter]
+    filter_fields = EXAM_FILTERS
+    ordering_fields = EXAM_ORDERING
 
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
@@ -231,26 +443,29 @@ class ExamViewSet(viewsets.ModelViewSet):
         user = self.request.user
 
         if user.role == 'student':
-            try:
-                student = Student.objects.get(user=user)
-                return Exam.objects.filter(target_class=student.class_name)
-            except Student.DoesNotExist:
-                return Exam.objects.none()
-           
-            student_class = student.class_name
-            
-            
-            student_numeric_class = ''.join(filter(str.isdigit, student_class))
-            
-          
-            return Exam.objects.filter(
-                models.Q(target_class=student_class) |  
-                models.Q(target_class=student_numeric_class)    
-            )
+            # One query through the (class_key, exam) index: exams for the
+            # student's own key or, for a section, its whole class. No
+            # student row means NULL keys and no exams.
+            student = Student.objects.filter(user=user)
+            keys = [
+                models.Subquery(student.values('class_key')[:1]),
+                models.Subquery(student.annotate(base=class_base_expression()).values('base')[:1]),
+            ]
+            return exam_queryset().filter(
+                pk__in=ExamTarget.objects.filter(class_key__in=keys).values('exam_id'))
         elif user.role == 'admin':
-            return Exam.objects.all()
+            return exam_queryset()
+
+        # Still annotated: the fast list reads questions_count off it.
+        return exam_queryset().none()
 
-        return Exam.objects.none()
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action == 'list' and not self.use_fast_list():
+            # ExamSerializer reads every exam's extra targets; the fast list
+            # fetches them for the page itself.
+            queryset = queryset.prefetch_related('targets')
+        return queryset
 
     def create(self, request, *args, **kwargs):
        
@@ -293,6 +508,42 @@ class ExamViewSet(viewsets.ModelViewSet):
             "total": 5
         })
 
+    @action(detail=True, methods=['post'], url_path='grade-sheets',
+            permission_classes=[permissions.IsAuthenticated], parser_classes=[MultiPartParser])
+    def grade_sheets(self, request, pk=None):
+        if request.user.role == 'admin':
+            exam = self.get_object()
+        elif request.user.role == 'teacher':
+            exam = get_object_or_404(Exam, pk=pk, teacher__user=request.user)
+        else:
+            raise PermissionDenied("Only admin and teachers can grade answer sheets.")
+
+        sheet_file = request.FILES.get('file')
+        if not sheet_file:
+            return Response({"error": "CSV file is missing."}, status=status.HTTP_400_BAD_REQUEST)
+        if not sheet_file.name.endswith('.csv'):
+            return Response({"error": "Only CSV files are accepted."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            rows = parse_sheets(sheet_file.read().decode('utf-8'))
+        except (UnicodeDecodeError, ValueError) as e:
+            return Response({"error": f"Error processing CSV file: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        logger.info(f"[{request.user.role.upper()}:{request.user.username}] Grading {len(rows)} answer sheets for exam ID {exam.id}")
+        graded_count, errors = grade_answer_sheets(exam, rows)
+
+        if errors:
+            return Response({
+                "message": f"Graded {graded_count} answer sheets with {len(errors)} errors.",
+                "graded": graded_count,
+                "errors": errors[:10]
+            }, status=status.HTTP_206_PARTIAL_CONTENT)
+
+        return Response({
+            "message": f"Successfully graded {graded_count} answer sheets.",
+            "graded": graded_count
+        }, status=status.HTTP_201_CREATED)
+
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def my_marks(self, request):
         if request.user.role != 'student':
@@ -300,20 +551,30 @@ class ExamViewSet(viewsets.ModelViewSet):
             
         try:
             student = Student.objects.get(user=request.user)
-            exams = StudentExam.objects.filter(student=student)
+            exams = student_exam_queryset().filter(student=student)
             serializer = StudentExamSerializer(exams, many=True)
             return Response(serializer.data)
         except Student.DoesNotExist:
             return Response([], status=status.HTTP_200_OK)
 
+    @action(detail=False, methods=['get'], url_path='my-summary', permission_classes=[permissions.IsAuthenticated])
+    def my_summary(self, request):
+        if request.user.role != 'student':
+            raise PermissionDenied("Only students can view their performance summary.")
+
+        # One indexed lookup on the precomputed row, however many exams were taken.
+        summary = StudentPerformance.objects.filter(student__user=request.user).first()
+        return Response(summarize(summary))
+
 
-class StudentExamListView(generics.ListAPIView):
+class StudentExamListView(ConditionalGetMixin, SparseFieldsMixin, generics.ListAPIView):
     serializer_class = StudentExamSerializer
+    version_names = ('studentexam', 'student', 'exam', 'user')
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
-        queryset = StudentExam.objects.all()
+        queryset = student_exam_queryset()
 
         if user.role == 'admin':
             pass 
@@ -331,7 +592,7 @@ class StudentExamListView(generics.ListAPIView):
         if exam_id:
             queryset = queryset.filter(exam__id=exam_id)
 
-        return queryset.select_related('exam', 'student__user')
+        return queryset
 
 
 
@@ -425,7 +686,8 @@ def import_students_csv(request):
                     first_name=row.get('first_name', ''),
                     last_name=row.get('last_name', ''),
                     password="default123",
-                    role='student'
+                    role='student',
+                    school=current_school()
                 )
 
                
@@ -438,7 +700,7 @@ def import_students_csv(request):
                     date_of_birth=datetime.strptime(row['date_of_birth'], '%Y-%m-%d').date(),
                     admission_date=datetime.strptime(row['admission_date'], '%Y-%m-%d').date(),
                     assigned_teacher_id=row.get('assigned_teacher_id') if row.get('assigned_teacher_id') else None,
-                    status=0
+                    status=Student.ENROLLED
                 )
 
                 created_count += 1
@@ -463,6 +725,65 @@ def import_students_csv(request):
 
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search_view(request):
+    query = request.query_params.get('q', '').strip()
+    if len(query) < 2:
+        return Response({"error": "Search for at least 2 characters."}, status=status.HTTP_400_BAD_REQUEST)
+
+    kind = request.query_params.get('type')
+    if kind and kind not in person_search.KINDS:
+        return Response({"error": f"type must be one of: {', '.join(person_search.KINDS)}."},
+                        status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+    except ValueError:
+        return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+    matches = person_search.search(query, request.user, kinds=(kind,) if kind else person_search.KINDS, limit=limit)
+
+    serializers = {
+        person_search.STUDENT: (FastStudentSerializer(), student_queryset),
+        person_search.TEACHER: (FastTeacherSerializer(), teacher_queryset),
+    }
+    data = {}
+    for name, (fast, queryset) in serializers.items():
+        ids = [pk for match_kind, pk, _ in matches if match_kind == name]
+        if ids:
+            for item in fast.serialize(fast.values(queryset().filter(pk__in=ids))):
+                data[name, item['id']] = item
+
+    return Response({
+        "query": query,
+        "results": [
+            {"type": match_kind, "id": pk, "score": score, "data": data[match_kind, pk]}
+            for match_kind, pk, score in matches if (match_kind, pk) in data
+        ]
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsTeacher])
+def teacher_dashboard_view(request):
+    teacher = get_object_or_404(Teacher, user=request.user)
+    return Response(teacher_dashboard(teacher))
+
+
+def metrics_view(request):
+    # Scrapers send the configured token; otherwise only admins may look.
+    token = settings.PERF_METRICS_TOKEN
+    if not (token and constant_time_compare(request.headers.get('Authorization', ''), f"Bearer {token}")):
+        user = jwt_user(request) or request.user
+        if not (user.is_authenticated and user.role == 'admin'):
+            return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+
+    return HttpResponse(
+        metrics.registry.render_prometheus(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
 class CustomPasswordResetView(APIView):
     def post(self, request):
         email = request.data.get("email")
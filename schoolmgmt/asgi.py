@@ -3,6 +3,10 @@ ASGI config for schoolmgmt project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve the live submission streams (``core.events``) through this callable:
+under ASGI an open stream waits on the event loop instead of holding a
+worker thread.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -64,23 +64,90 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ),
     
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.ApproximateCountPagination',
     'PAGE_SIZE': 10,
 }
 
 MIDDLEWARE = [
+    'core.middleware.PerformanceMiddleware',
+    'core.middleware.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.TenantMiddleware',
+    'core.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'schoolmgmt.urls'
 
+# Per-request timing (Server-Timing header) and the Prometheus /metrics endpoint.
+PERF_METRICS_ENABLED = True
+# Scrapers read /metrics with "Authorization: Bearer <token>"; without a
+# token (or when it is unset) only admin users may read it.
+PERF_METRICS_TOKEN = os.environ.get('PERF_METRICS_TOKEN', '')
+
+# Queries slower than this (milliseconds) are written, with their EXPLAIN plan,
+# to SLOW_QUERY_LOG. Set to None to disable.
+SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_LOG = os.path.join(BASE_DIR, 'slow_queries.log')
+
+# cProfile a fraction of requests, or any admin request sending PROFILE_HEADER.
+PROFILE_SAMPLE_RATE = 0.0
+PROFILE_HEADER = 'X-Profile'
+PROFILE_DIR = os.path.join(BASE_DIR, 'profiles')
+
+# OMR answer-sheet uploads with at least this many rows are graded in a
+# process pool of OMR_WORKERS processes (None: one per CPU).
+OMR_PARALLEL_THRESHOLD = 5000
+OMR_WORKERS = None
+
+# Serve list endpoints from .values() rows instead of ModelSerializer instances.
+FAST_LIST_SERIALIZERS = True
+
+# Largest JSON array accepted by the bulk student create endpoints. Each
+# item's password is hashed on its own, and with the default PBKDF2 hasher
+# that is about half a second, so the cap keeps a full request (a class or
+# so) to well under a minute. Hashing happens before the insert transaction
+# opens; only the INSERTs hold it. Raise the cap together with
+# BULK_PASSWORD_HASHER, not on its own.
+BULK_CREATE_MAX_ITEMS = 50
+
+# Hasher the bulk endpoints use for new passwords. Leave it at 'default';
+# naming a cheaper one from PASSWORD_HASHERS is an explicit opt-in.
+BULK_PASSWORD_HASHER = 'default'
+
+# Responses smaller than this many bytes are never gzipped.
+GZIP_MIN_LENGTH = 1024
+
+# Seconds a teacher's dashboard is cached; submissions and roster changes
+# clear it sooner.
+TEACHER_DASHBOARD_TTL = 60
+
+# Seconds an admin list's total count is reused across pages before it is
+# counted again (see core.pagination).
+PAGINATION_COUNT_TTL = 30
+
+# Live submission streams (core.events): how often an idle stream re-reads
+# the database, how long one connection lasts before the client reconnects,
+# and the reconnect delay suggested to browsers.
+SSE_POLL_INTERVAL = 5
+SSE_MAX_DURATION = 300
+SSE_RETRY_MS = 3000
+
+# Request batching (core.batch): most sub-requests one POST /batch may carry,
+# and how many read-only ones run at once.
+BATCH_MAX_REQUESTS = 20
+BATCH_WORKERS = 4
+
 
 LOGGING = {
     'version': 1,
@@ -95,6 +162,10 @@ LOGGING = {
             'format': '{levelname} {message}',
             'style': '{',
         },
+        'raw': {
+            'format': '{message}',
+            'style': '{',
+        },
     },
 
     'handlers': {
@@ -108,6 +179,13 @@ LOGGING = {
             'filename': os.path.join(BASE_DIR, 'debug.log'),
             'formatter': 'verbose',
         },
+        'slow_queries': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': SLOW_QUERY_LOG,
+            'maxBytes': 5 * 1024 * 1024,
+            'backupCount': 5,
+            'formatter': 'raw',
+        },
     },
 
     'loggers': {
@@ -121,6 +199,11 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': True,
         },
+        'core.slowqueries': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
     }
 
     
@@ -164,6 +247,22 @@ DATABASES = {
     }
 }
 
+# One database per school. 'default' holds the shared user directory and any
+# user without a school; a user's ``school`` selects the shard for their data.
+# Migrate each shard with: python manage.py migrate --database=<alias>
+SCHOOL_SHARDS = {
+    'north': 'school_north',
+    'south': 'school_south',
+}
+
+for _school, _alias in SCHOOL_SHARDS.items():
+    DATABASES[_alias] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / f'{_alias}.sqlite3',
+    }
+
+DATABASE_ROUTERS = ['core.routers.SchoolShardRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators